@@ -0,0 +1,31 @@
+"""widen_two_factor_secret
+
+Revision ID: a2d6e9c4f173
+Revises: e4b8d1f7a326
+Create Date: 2026-10-17 19:00:00.000000
+
+Purpose:
+    users.two_factor_secret holds an encrypted TOTP secret, but VARCHAR(32)
+    is shorter than any Fernet token or v2 AES-GCM envelope. Widen it to
+    VARCHAR(255) so the PII re-encryption job (app/services/pii_rotation.py)
+    can rewrite it under a new key.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a2d6e9c4f173'
+down_revision = 'e4b8d1f7a326'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Widen users.two_factor_secret to VARCHAR(255)."""
+    op.alter_column('users', 'two_factor_secret', type_=sa.String(255), existing_type=sa.String(32), existing_nullable=True)
+
+
+def downgrade():
+    """Shrink users.two_factor_secret back to VARCHAR(32) (fails if longer values exist)."""
+    op.alter_column('users', 'two_factor_secret', type_=sa.String(32), existing_type=sa.String(255), existing_nullable=True)
@@ -0,0 +1,37 @@
+"""add_users_email_hash
+
+Revision ID: a7c4e1f92b3d
+Revises: e3f9a2b7c1d4
+Create Date: 2026-10-17 09:00:00.000000
+
+Purpose:
+    Add a blind index column (email_hash) to users so login and
+    registration can find an account with one indexed lookup instead of
+    decrypting every row's email (Decision #59).
+
+    The column is nullable so existing rows survive the migration.
+    Populate it afterwards with:
+
+        python scripts/backfill_email_hashes.py
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c4e1f92b3d'
+down_revision = 'e3f9a2b7c1d4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add users.email_hash with a unique index."""
+    op.add_column('users', sa.Column('email_hash', sa.String(64), nullable=True))
+    op.create_index('idx_users_email_hash', 'users', ['email_hash'], unique=True)
+
+
+def downgrade():
+    """Drop users.email_hash and its index."""
+    op.drop_index('idx_users_email_hash', table_name='users')
+    op.drop_column('users', 'email_hash')
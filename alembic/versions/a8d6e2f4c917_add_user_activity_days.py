@@ -0,0 +1,53 @@
+"""add_user_activity_days
+
+Revision ID: a8d6e2f4c917
+Revises: f5a3c8e1b642
+Create Date: 2026-10-17 15:00:00.000000
+
+Purpose:
+    Per-user activity calendar for dashboard streaks and study time
+    (Decision #13). One row per user per UTC day with a completed session,
+    maintained when sessions complete. Backfilled from completed sessions.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8d6e2f4c917'
+down_revision = 'f5a3c8e1b642'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create user_activity_days and backfill it from completed sessions."""
+    op.create_table(
+        'user_activity_days',
+        sa.Column('activity_day_id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('activity_date', sa.Date(), nullable=False),
+        sa.Column('sessions_completed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('study_seconds', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index(
+        'idx_user_activity_days_user_date',
+        'user_activity_days',
+        ['user_id', 'activity_date'],
+        unique=True
+    )
+
+    op.execute("""
+        INSERT INTO user_activity_days (activity_day_id, user_id, activity_date, sessions_completed, study_seconds)
+        SELECT gen_random_uuid()::text, user_id, (completed_at AT TIME ZONE 'UTC')::date,
+               COUNT(*), COALESCE(SUM(duration_seconds), 0)
+        FROM sessions
+        WHERE is_completed AND completed_at IS NOT NULL
+        GROUP BY user_id, (completed_at AT TIME ZONE 'UTC')::date
+    """)
+
+
+def downgrade():
+    """Drop user_activity_days."""
+    op.drop_index('idx_user_activity_days_user_date', table_name='user_activity_days')
+    op.drop_table('user_activity_days')
@@ -0,0 +1,52 @@
+"""add_user_course_summaries
+
+Revision ID: b3e9f1a6d284
+Revises: a8d6e2f4c917
+Create Date: 2026-10-17 16:00:00.000000
+
+Purpose:
+    Per-user, per-course learning totals for GET /v1/dashboard
+    (Decision #13): attempts, correct answers, completed sessions,
+    diagnostic status, last completion and study time. Maintained
+    incrementally by the submit and complete endpoints.
+
+    Existing data is backfilled with scripts/rebuild_learning_summaries.py.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3e9f1a6d284'
+down_revision = 'a8d6e2f4c917'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create user_course_summaries."""
+    op.create_table(
+        'user_course_summaries',
+        sa.Column('summary_id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('course_id', sa.String(36), sa.ForeignKey('courses.course_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('total_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('correct_attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('sessions_completed', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('diagnostic_completed', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('last_session_completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('study_seconds', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index(
+        'idx_user_course_summaries_user_course',
+        'user_course_summaries',
+        ['user_id', 'course_id'],
+        unique=True
+    )
+
+
+def downgrade():
+    """Drop user_course_summaries."""
+    op.drop_index('idx_user_course_summaries_user_course', table_name='user_course_summaries')
+    op.drop_table('user_course_summaries')
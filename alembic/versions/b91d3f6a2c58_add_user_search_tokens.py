@@ -0,0 +1,44 @@
+"""add_user_search_tokens
+
+Revision ID: b91d3f6a2c58
+Revises: a7c4e1f92b3d
+Create Date: 2026-10-17 11:00:00.000000
+
+Purpose:
+    Add user_search_tokens: keyed hashes of trigrams/prefixes of encrypted
+    email and names. Admin user search joins against this table instead of
+    decrypting every user (Decision #59).
+
+    Populate tokens for existing users afterwards with:
+
+        python scripts/backfill_email_hashes.py
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b91d3f6a2c58'
+down_revision = 'a7c4e1f92b3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create user_search_tokens and its lookup indexes."""
+    op.create_table(
+        'user_search_tokens',
+        sa.Column('token_id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('field', sa.String(20), nullable=False),
+        sa.Column('token_hash', sa.String(64), nullable=False),
+    )
+    op.create_index('idx_user_search_tokens_hash', 'user_search_tokens', ['token_hash', 'user_id'])
+    op.create_index('idx_user_search_tokens_user', 'user_search_tokens', ['user_id', 'field'])
+
+
+def downgrade():
+    """Drop user_search_tokens."""
+    op.drop_index('idx_user_search_tokens_user', table_name='user_search_tokens')
+    op.drop_index('idx_user_search_tokens_hash', table_name='user_search_tokens')
+    op.drop_table('user_search_tokens')
@@ -0,0 +1,45 @@
+"""add_session_questions
+
+Revision ID: c4e8a1d7f203
+Revises: b91d3f6a2c58
+Create Date: 2026-10-17 12:00:00.000000
+
+Purpose:
+    Persist the question set and order chosen for a diagnostic session
+    (Decision #32). /diagnostic/next-question and /diagnostic/progress read
+    this table instead of re-running question selection on every call.
+
+    Also index question_attempts by (session_id, question_id), which the
+    next-question anti-join and per-session attempt counts filter on.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e8a1d7f203'
+down_revision = 'b91d3f6a2c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create session_questions and the attempts session index."""
+    op.create_table(
+        'session_questions',
+        sa.Column('session_question_id', sa.String(36), primary_key=True),
+        sa.Column('session_id', sa.String(36), sa.ForeignKey('sessions.session_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('question_id', sa.String(36), sa.ForeignKey('questions.question_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('position', sa.Integer(), nullable=False),
+    )
+    op.create_index('idx_session_questions_position', 'session_questions', ['session_id', 'position'], unique=True)
+    op.create_index('idx_session_questions_question', 'session_questions', ['session_id', 'question_id'], unique=True)
+    op.create_index('idx_question_attempts_session', 'question_attempts', ['session_id', 'question_id'])
+
+
+def downgrade():
+    """Drop session_questions and the attempts session index."""
+    op.drop_index('idx_question_attempts_session', table_name='question_attempts')
+    op.drop_index('idx_session_questions_question', table_name='session_questions')
+    op.drop_index('idx_session_questions_position', table_name='session_questions')
+    op.drop_table('session_questions')
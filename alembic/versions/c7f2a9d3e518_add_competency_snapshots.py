@@ -0,0 +1,54 @@
+"""add_competency_snapshots
+
+Revision ID: c7f2a9d3e518
+Revises: b3e9f1a6d284
+Create Date: 2026-10-17 17:00:00.000000
+
+Purpose:
+    Daily per-user, per-KA competency series for the trends on
+    GET /v1/dashboard/competencies (Decision #13). Rows are upserted on
+    each competency update; trends are read with one range query.
+
+    History before this migration can't be reconstructed, so each existing
+    competency is seeded with a snapshot for the migration date.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7f2a9d3e518'
+down_revision = 'b3e9f1a6d284'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create competency_snapshots and seed today's scores."""
+    op.create_table(
+        'competency_snapshots',
+        sa.Column('snapshot_id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('ka_id', sa.String(36), sa.ForeignKey('knowledge_areas.ka_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('snapshot_date', sa.Date(), nullable=False),
+        sa.Column('competency_score', sa.DECIMAL(5, 2), nullable=False),
+        sa.Column('attempts_count', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.create_index(
+        'idx_competency_snapshots_user_date',
+        'competency_snapshots',
+        ['user_id', 'snapshot_date', 'ka_id'],
+        unique=True
+    )
+
+    op.execute("""
+        INSERT INTO competency_snapshots (snapshot_id, user_id, ka_id, snapshot_date, competency_score, attempts_count)
+        SELECT gen_random_uuid()::text, user_id, ka_id, (now() AT TIME ZONE 'UTC')::date, competency_score, 0
+        FROM user_competency
+    """)
+
+
+def downgrade():
+    """Drop competency_snapshots."""
+    op.drop_index('idx_competency_snapshots_user_date', table_name='competency_snapshots')
+    op.drop_table('competency_snapshots')
@@ -0,0 +1,34 @@
+"""add_sr_cards_due_index
+
+Revision ID: d2b7f4c9e815
+Revises: c4e8a1d7f203
+Create Date: 2026-10-17 13:00:00.000000
+
+Purpose:
+    Index spaced_repetition_cards on (user_id, next_review_at).
+    GET /v1/reviews/due now reads due cards as next_review_at <= now()
+    with a single range scan instead of first rewriting is_due on every
+    request (Decision #31).
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2b7f4c9e815'
+down_revision = 'c4e8a1d7f203'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create the due-queue index."""
+    op.create_index(
+        'idx_sr_cards_user_next_review',
+        'spaced_repetition_cards',
+        ['user_id', 'next_review_at']
+    )
+
+
+def downgrade():
+    """Drop the due-queue index."""
+    op.drop_index('idx_sr_cards_user_next_review', table_name='spaced_repetition_cards')
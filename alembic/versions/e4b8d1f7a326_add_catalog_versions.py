@@ -0,0 +1,38 @@
+"""add_catalog_versions
+
+Revision ID: e4b8d1f7a326
+Revises: c7f2a9d3e518
+Create Date: 2026-10-17 18:00:00.000000
+
+Purpose:
+    Per-course version counter for the in-process course catalog cache
+    (app/services/catalog.py). Admin changes to a course's KAs or status
+    bump the version in their transaction; every worker re-checks the
+    version of its cached copy and reloads when it moved.
+
+    No backfill: a course without a row is at version 0.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b8d1f7a326'
+down_revision = 'c7f2a9d3e518'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create catalog_versions."""
+    op.create_table(
+        'catalog_versions',
+        sa.Column('course_id', sa.String(36), sa.ForeignKey('courses.course_id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='1'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade():
+    """Drop catalog_versions."""
+    op.drop_table('catalog_versions')
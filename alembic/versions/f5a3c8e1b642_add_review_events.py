@@ -0,0 +1,65 @@
+"""add_review_events
+
+Revision ID: f5a3c8e1b642
+Revises: d2b7f4c9e815
+Create Date: 2026-10-17 14:00:00.000000
+
+Purpose:
+    Append-only log of spaced repetition reviews (Decision #31).
+    spaced_repetition_cards.last_reviewed_at is overwritten on every review,
+    so review streaks and per-day counts are computed from this table with a
+    single window query instead of one query per day.
+
+    Existing cards are backfilled with one event at their last_reviewed_at
+    (the only review timestamp kept so far), so current streaks survive the
+    switch. Cards without a stored quality get the service's default for
+    their last outcome (4 if still in a repetition run, else 2).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f5a3c8e1b642'
+down_revision = 'd2b7f4c9e815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create review_events and backfill the last review of each card."""
+    op.create_table(
+        'review_events',
+        sa.Column('review_event_id', sa.String(36), primary_key=True),
+        sa.Column('user_id', sa.String(36), sa.ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('card_id', sa.String(36), sa.ForeignKey('spaced_repetition_cards.card_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('question_id', sa.String(36), sa.ForeignKey('questions.question_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('quality_rating', sa.Integer(), nullable=False),
+        sa.Column('is_successful', sa.Boolean(), nullable=False),
+        sa.Column('interval_days', sa.Integer(), nullable=False),
+        sa.Column('reviewed_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('idx_review_events_user_reviewed', 'review_events', ['user_id', 'reviewed_at'])
+
+    op.execute("""
+        INSERT INTO review_events (
+            review_event_id, user_id, card_id, question_id,
+            quality_rating, is_successful, interval_days, reviewed_at
+        )
+        SELECT
+            gen_random_uuid()::text, user_id, card_id, question_id,
+            quality, quality >= 3, interval_days, last_reviewed_at
+        FROM (
+            SELECT
+                card_id, user_id, question_id, interval_days, last_reviewed_at,
+                COALESCE(last_quality_rating, CASE WHEN repetition_count > 0 THEN 4 ELSE 2 END) AS quality
+            FROM spaced_repetition_cards
+            WHERE last_reviewed_at IS NOT NULL
+        ) AS cards
+    """)
+
+
+def downgrade():
+    """Drop review_events."""
+    op.drop_index('idx_review_events_user_reviewed', table_name='review_events')
+    op.drop_table('review_events')
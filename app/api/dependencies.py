@@ -2,13 +2,21 @@
 FastAPI dependencies for authentication and authorization.
 
 Decision #53: JWT-based authentication with role-based access control.
+
+Learner endpoints depend on get_current_active_principal, which resolves the
+caller from a short-TTL principal cache (or the signed token claims with
+AUTH_TRUST_TOKEN_CLAIMS). Sensitive endpoints (admin, account management)
+depend on get_current_user / get_current_active_user, which always load the
+User row.
 """
 from typing import Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.models.database import get_db
 from app.models.user import User
+from app.services.auth import Principal, get_current_principal as get_principal_from_token
 from app.services.auth import get_current_user as get_user_from_token
 
 
@@ -38,6 +46,41 @@ def get_current_user(
     return get_user_from_token(db, token)
 
 
+def get_current_principal(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db)
+) -> Principal:
+    """
+    Get the authenticated caller without loading the User row.
+
+    Usage: user: Principal = Depends(get_current_principal)
+
+    Raises 401 if no credentials provided or invalid token.
+    """
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    return get_principal_from_token(db, credentials.credentials)
+
+
+def get_current_active_principal(current_user: Principal = Depends(get_current_principal)) -> Principal:
+    """
+    Get the authenticated, active caller of a learner endpoint.
+
+    Usage: user: Principal = Depends(get_current_active_principal)
+    """
+    if not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+    return current_user
+
+
 def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
     """
     Get current active user (additional check beyond authentication).
@@ -87,12 +130,19 @@ def require_role(required_role: str):
 def get_client_ip(request: Request) -> str:
     """
     Get client IP address from request.
-    
-    Handles proxied requests (X-Forwarded-For header).
+
+    Handles proxied requests (X-Forwarded-For header). The header is only
+    read behind TRUSTED_PROXY_COUNT proxies, each appending the address it
+    received the request from; the client is the right-most hop added by
+    them. Hops further left are client-supplied and never trusted, so
+    callers can't pick their own rate limit or login throttle bucket.
     """
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
+    if settings.TRUSTED_PROXY_COUNT > 0:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+            if hops:
+                return hops[max(len(hops) - settings.TRUSTED_PROXY_COUNT, 0)]
     return request.client.host if request.client else "unknown"
 
 
@@ -5,9 +5,9 @@ Admin Dashboard API endpoints.
 
 All endpoints require admin or super_admin role.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
 from typing import Optional
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
@@ -16,10 +16,19 @@ import math
 
 from app.api.dependencies import get_db, get_current_admin_user
 from app.models.user import User
-from app.models.course import Course, KnowledgeArea, Domain
+from app.models.course import Course, KnowledgeArea
 from app.models.question import Question, AnswerChoice
 from app.models.content import ContentChunk
 from app.models.financial import Subscription, SubscriptionPlan, Payment
+from app.services.user import user_search_subquery
+from app.services.question_bank import invalidate_question_bank
+from app.services.catalog import bump_catalog_version, get_course_catalog, invalidate_catalog
+from app.services.diagnostic_forms import rebuild_diagnostic_forms
+from app.core.rate_limit import rate_limiter_stats
+from app.services.audit_log import security_log_writer_stats
+from app.services.login_throttle import login_throttle_stats
+from app.utils.encryption import decryption_cache_stats
+from app.utils.security import password_hash_pool_stats
 from app.schemas.admin import (
     AdminUserListResponse,
     AdminUserListItem,
@@ -28,6 +37,12 @@ from app.schemas.admin import (
     MetricsRevenue,
     MetricsEngagement,
     MetricsCourses,
+    AdminRuntimeMetricsResponse,
+    PasswordHashingMetrics,
+    DecryptionCacheMetrics,
+    SecurityLogWriterMetrics,
+    RateLimiterMetrics,
+    LoginThrottleMetrics,
     AdminCourseListResponse,
     AdminCourseListItem,
     CreateCourseRequest,
@@ -64,47 +79,30 @@ def list_users(
     **Permissions:** admin or super_admin
 
     **Features:**
-    - Pagination
-    - Search by email or name
+    - Pagination (SQL OFFSET/LIMIT, only the returned page is decrypted, in one batch)
+    - Search by email or name (blind search tokens, substring match)
     - Filter by role and active status
     """
     # Build query
     query = db.query(User)
 
-    # Apply non-search filters first (can use database)
     if role:
         query = query.filter(User.role == role)
 
     if is_active is not None:
         query = query.filter(User.is_active == is_active)
 
-    # For search on encrypted fields, we need to fetch and filter in Python
+    # Search on encrypted fields goes through blind search tokens (Decision #59)
     if search:
-        # Fetch all matching users (by role/active filters)
-        all_users = query.order_by(User.created_at.desc()).all()
-
-        # Filter in Python after decryption
-        search_lower = search.lower()
-        filtered_users = [
-            user for user in all_users
-            if (search_lower in user.email.lower() or
-                search_lower in user.first_name.lower() or
-                search_lower in user.last_name.lower())
-        ]
-
-        # Calculate pagination
-        total = len(filtered_users)
-        total_pages = math.ceil(total / per_page)
-        offset = (page - 1) * per_page
-
-        # Apply pagination in Python
-        users = filtered_users[offset:offset + per_page]
-    else:
-        # No search - use database pagination
-        total = query.count()
-        total_pages = math.ceil(total / per_page)
-        offset = (page - 1) * per_page
-        users = query.order_by(User.created_at.desc()).offset(offset).limit(per_page).all()
+        matching_user_ids = user_search_subquery(db, search)
+        if matching_user_ids is not None:
+            query = query.filter(User.user_id.in_(select(matching_user_ids.c.user_id)))
+
+    # Database pagination - only the returned page is decrypted
+    total = query.count()
+    total_pages = math.ceil(total / per_page)
+    offset = (page - 1) * per_page
+    users = query.order_by(User.created_at.desc(), User.user_id).offset(offset).limit(per_page).all()
 
     return AdminUserListResponse(
         users=[AdminUserListItem.model_validate(user) for user in users],
@@ -218,6 +216,33 @@ def get_metrics_overview(
     )
 
 
+@router.get("/metrics/runtime", response_model=AdminRuntimeMetricsResponse)
+def get_runtime_metrics(
+    admin_user: User = Depends(get_current_admin_user)
+):
+    """
+    Get in-process load metrics of the worker serving the request.
+
+    **Permissions:** admin or super_admin
+
+    **Metrics:**
+    - Password hashing: queue depth, shed requests, hash latency per endpoint
+    - PII decryption cache: hits, misses and size (Decision #59)
+    - Security log writer: queue depth, batches and backpressure (Decision #41)
+    - Rate limiter: backend in use, allowed/blocked requests (Decision #52)
+    - Login throttle: accounts/IPs backing off or locked out (Decision #52)
+
+    Counters are per worker process and reset on restart.
+    """
+    return AdminRuntimeMetricsResponse(
+        password_hashing=PasswordHashingMetrics(**password_hash_pool_stats()),
+        pii_decryption_cache=DecryptionCacheMetrics(**decryption_cache_stats()),
+        security_log_writer=SecurityLogWriterMetrics(**security_log_writer_stats()),
+        rate_limiter=RateLimiterMetrics(**rate_limiter_stats()),
+        login_throttle=LoginThrottleMetrics(**login_throttle_stats())
+    )
+
+
 # ============================================================================
 # Course Management
 # ============================================================================
@@ -323,6 +348,7 @@ def create_course(
 def create_knowledge_areas(
     course_id: UUID,
     ka_data: CreateKnowledgeAreasRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user)
 ):
@@ -368,8 +394,14 @@ def create_knowledge_areas(
         db.add(new_ka)
         created_kas.append(new_ka)
 
+    bump_catalog_version(db, course_id)
     db.commit()
 
+    # Replaced KAs cascade-delete their questions
+    invalidate_catalog(course_id)
+    invalidate_question_bank(course_id)
+    background_tasks.add_task(rebuild_diagnostic_forms, course_id)
+
     # Refresh to get generated IDs
     for ka in created_kas:
         db.refresh(ka)
@@ -457,7 +489,9 @@ def publish_course(
     course.is_active = True
     course.updated_by = admin_user.user_id
 
+    bump_catalog_version(db, course_id)
     db.commit()
+    invalidate_catalog(course_id)
     db.refresh(course)
 
     return PublishCourseResponse(
@@ -481,6 +515,7 @@ def publish_course(
 def bulk_import_questions(
     course_id: UUID,
     import_data: BulkQuestionImportRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_current_admin_user)
 ):
@@ -502,14 +537,16 @@ def bulk_import_questions(
     if not course:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Course not found")
 
-    # Get all KAs for this course (for code lookup)
-    kas = db.query(KnowledgeArea).filter(KnowledgeArea.course_id == str(course_id)).all()
-    ka_map = {ka.ka_code: ka.ka_id for ka in kas}
-
-    # Get all domains for all KAs in this course (for code lookup)
-    ka_ids = [ka.ka_id for ka in kas]
-    domains = db.query(Domain).filter(Domain.ka_id.in_(ka_ids)).all() if ka_ids else []
-    domain_map = {domain.domain_code: domain.domain_id for domain in domains}
+    # KA and domain codes from a freshly loaded catalog: KAs/domains written
+    # without a version bump (seed scripts, SQL) must not be rejected here
+    invalidate_catalog(course_id)
+    catalog = get_course_catalog(db, course_id)
+    ka_map = {ka.ka_code: ka.ka_id for ka in catalog.knowledge_areas}
+    domain_map = {
+        domain.domain_code: domain.domain_id
+        for ka in catalog.knowledge_areas
+        for domain in ka.domains
+    }
 
     # Track import results
     imported = 0
@@ -579,6 +616,10 @@ def bulk_import_questions(
             detail=f"Failed to commit imports: {str(e)}"
         )
 
+    # New questions must be visible to adaptive/diagnostic selection
+    invalidate_question_bank(course_id)
+    background_tasks.add_task(rebuild_diagnostic_forms, course_id)
+
     # Build validation summary
     validation_summary = {
         "total_questions": len(import_data.questions),
@@ -7,6 +7,7 @@ Decision #53: JWT authentication with Argon2id password hashing.
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
 from app.models.database import get_db
 from app.models.user import User
 from app.schemas.auth import (
@@ -18,7 +19,8 @@ from app.services.auth import (
     authenticate_user, create_access_token, create_refresh_token,
     verify_token, change_password
 )
-from app.utils.security import get_password_hash
+from app.services.user import get_user_by_email
+from app.utils.security import hash_password_limited
 from app.api.dependencies import (
     get_current_active_user, get_client_ip, get_user_agent
 )
@@ -47,16 +49,8 @@ def register(
     4. Create user account
     5. Return user data (without password)
     """
-    # Check if user already exists (need to check all users and decrypt)
-    from app.utils.encryption import decrypt_field
-    existing_user = None
-    for u in db.query(User).all():
-        try:
-            if decrypt_field(u._email).lower() == user_data.email.lower():
-                existing_user = u
-                break
-        except Exception:
-            continue
+    # Check if user already exists (blind index lookup, Decision #59)
+    existing_user = get_user_by_email(db, user_data.email)
 
     if existing_user:
         raise HTTPException(
@@ -65,7 +59,7 @@ def register(
         )
     
     # Hash password
-    password_hash = get_password_hash(user_data.password)
+    password_hash = hash_password_limited(user_data.password, "register")
     
     # Create user (encryption happens automatically via hybrid properties)
     new_user = User(
@@ -79,7 +73,15 @@ def register(
     )
     
     db.add(new_user)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Concurrent registration with the same email hit the unique blind index
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     db.refresh(new_user)
     
     # Log security event
@@ -3,20 +3,25 @@ Dashboard API endpoints.
 
 Decision #13: Progress dashboard with competency tracking.
 User Flow #4: Dashboard showing overall progress and recommendations.
+
+Each payload is built from a DashboardContext, which loads the user's
+course, competencies and KA map at most once per request. The individual
+endpoints and GET /v1/dashboard/bundle share the same builders, so the
+bundle returns all sections from one set of queries.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
-from typing import List
-from datetime import datetime, timedelta, date, timezone
+from sqlalchemy import func
+from typing import Dict, List, Optional
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 from app.models.database import get_db
-from app.models.user import User
-from app.models.course import Course, KnowledgeArea
+from app.services.auth import Principal
+from app.models.course import Course
 from app.models.learning import Session as LearningSession, QuestionAttempt, UserCompetency
 from app.models.spaced_repetition import SpacedRepetitionCard
-from app.api.dependencies import get_current_active_user
+from app.api.dependencies import get_current_active_principal
 from app.schemas.dashboard import (
     DashboardOverviewResponse,
     CompetencyStatusResponse,
@@ -26,67 +31,136 @@ from app.schemas.dashboard import (
     RecentActivityResponse,
     RecentSessionSummary,
     FocusAreaRecommendation,
-    ExamReadinessResponse
+    ExamReadinessResponse,
+    DashboardBundleResponse
 )
 from app.services.competency import (
-    calculate_weighted_competency,
+    get_competency_trends,
     get_user_competencies,
-    determine_competency_status
+    determine_competency_status,
+    weighted_average_competency
 )
+from app.services.activity import get_activity_summary
+from app.services.learning_summary import get_learning_summary
+from app.services.catalog import CatalogKnowledgeArea, get_course_catalog, get_knowledge_areas
 
 router = APIRouter()
 
+# Supported /competencies trend windows (days)
+TREND_WINDOWS = (30, 90, 365)
 
-@router.get("", response_model=DashboardOverviewResponse)
-def get_dashboard_overview(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get main dashboard overview.
+# Sections available from /bundle, in response order
+BUNDLE_SECTIONS = ("overview", "competencies", "recent", "exam_readiness")
 
-    Decision #13: Comprehensive progress dashboard showing:
-    - Overall competency and exam readiness
-    - Per-KA competency status
-    - Performance metrics
-    - Spaced repetition reviews due
-    - Personalized recommendations
 
-    Returns complete snapshot of user's learning progress.
+class DashboardContext:
     """
-    # Get user's current course (assume first active course for now)
-    # In production, track user's selected course in user_profile
-    user_sessions = db.query(LearningSession).filter(
-        LearningSession.user_id == str(current_user.user_id)
-    ).first()
+    Per-request dashboard data, loaded lazily and at most once.
 
-    if not user_sessions:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No learning activity found. Complete diagnostic assessment first."
-        )
+    Raises the same 404/400 errors as the individual endpoints when the
+    user has no learning activity or no competency data.
+    """
 
-    course = db.query(Course).filter(
-        Course.course_id == user_sessions.course_id
-    ).first()
+    def __init__(self, db: Session, user: Principal):
+        self.db = db
+        self.user = user
+        self.user_id = str(user.user_id)
+        self._course: Optional[Course] = None
+        self._competencies: Optional[List[UserCompetency]] = None
+        self._ka_map: Optional[Dict[str, CatalogKnowledgeArea]] = None
+        self._overall_competency: Optional[Decimal] = None
+        self._activity: Optional[dict] = None
+
+    @property
+    def course(self) -> Course:
+        """User's current course (from their first session for now)."""
+        if self._course is None:
+            # In production, track user's selected course in user_profile
+            first_session = self.db.query(LearningSession.course_id).filter(
+                LearningSession.user_id == self.user_id
+            ).first()
+
+            if not first_session:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="No learning activity found. Complete diagnostic assessment first."
+                )
+
+            course = self.db.query(Course).filter(
+                Course.course_id == first_session.course_id
+            ).first()
+
+            if not course:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Course not found"
+                )
+            self._course = course
+        return self._course
+
+    @property
+    def competencies(self) -> List[UserCompetency]:
+        """User's competencies, weakest first."""
+        if self._competencies is None:
+            competencies = get_user_competencies(self.db, self.user_id)
+
+            if not competencies:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No competency data. Complete diagnostic assessment first."
+                )
+            self._competencies = sorted(competencies, key=lambda x: x.competency_score)
+        return self._competencies
+
+    @property
+    def ka_map(self) -> Dict[str, CatalogKnowledgeArea]:
+        """KAs of the user's competencies by ka_id (from the course catalogs)."""
+        if self._ka_map is None:
+            self._ka_map = get_knowledge_areas(self.db, [comp.ka_id for comp in self.competencies])
+        return self._ka_map
+
+    @property
+    def overall_competency(self) -> Decimal:
+        """Weighted competency across the course's KAs."""
+        if self._overall_competency is None:
+            catalog = get_course_catalog(self.db, self.course.course_id)
+            ka_weights = catalog.ka_weights if catalog else {}
+            self._overall_competency = weighted_average_competency(self.competencies, ka_weights)
+        return self._overall_competency
+
+    @property
+    def activity(self) -> dict:
+        """Streaks and study time from the activity calendar."""
+        if self._activity is None:
+            self._activity = get_activity_summary(self.db, self.user_id)
+        return self._activity
+
+    def competency_status(self, comp: UserCompetency, ka: CatalogKnowledgeArea) -> CompetencyStatusResponse:
+        """Build the per-KA status summary for a competency."""
+        accuracy_pct = (comp.correct_count / comp.attempts_count * 100) if comp.attempts_count > 0 else 0.0
 
-    if not course:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Course not found"
+        return CompetencyStatusResponse(
+            ka_id=comp.ka_id,
+            ka_code=ka.ka_code,
+            ka_name=ka.ka_name,
+            ka_weight_percentage=ka.weight_percentage,
+            competency_score=comp.competency_score,
+            status=determine_competency_status(comp.competency_score),
+            attempts_count=comp.attempts_count,
+            correct_count=comp.correct_count,
+            incorrect_count=comp.incorrect_count,
+            accuracy_percentage=accuracy_pct,
+            last_practiced_at=comp.last_updated_at
         )
 
-    # Get all competencies for user
-    competencies = get_user_competencies(db, current_user.user_id)
 
-    if not competencies:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No competency data. Complete diagnostic assessment first."
-        )
+def build_overview(ctx: DashboardContext) -> DashboardOverviewResponse:
+    """Build the main dashboard overview."""
+    db = ctx.db
+    course = ctx.course
+    competencies = ctx.competencies
 
-    # Calculate overall weighted competency
-    overall_competency = calculate_weighted_competency(db, current_user.user_id, course.course_id)
+    overall_competency = ctx.overall_competency
     overall_status = determine_competency_status(overall_competency)
 
     # Calculate exam readiness (% of KAs at target >= 0.80)
@@ -94,68 +168,34 @@ def get_dashboard_overview(
     total_kas = len(competencies)
     exam_readiness_pct = (kas_at_target / total_kas * 100) if total_kas > 0 else 0.0
 
-    # Get total questions attempted and accuracy
-    all_attempts = db.query(QuestionAttempt).filter(
-        QuestionAttempt.user_id == str(current_user.user_id)
-    ).all()
+    # Attempt and session totals from the incrementally maintained summary row
+    summary = get_learning_summary(db, ctx.user_id, course.course_id)
 
-    total_questions = len(all_attempts)
-    total_correct = sum(1 for a in all_attempts if a.is_correct)
+    total_questions = summary.total_attempts if summary else 0
+    total_correct = summary.correct_attempts if summary else 0
     overall_accuracy = (total_correct / total_questions * 100) if total_questions > 0 else 0.0
 
-    # Get session stats
-    all_sessions = db.query(LearningSession).filter(
-        LearningSession.user_id == str(current_user.user_id)
-    ).all()
+    total_sessions = summary.sessions_completed if summary else 0
+    diagnostic_completed = summary.diagnostic_completed if summary else False
 
-    total_sessions = sum(1 for s in all_sessions if s.is_completed)
-    diagnostic_completed = any(s.session_type == 'diagnostic' and s.is_completed for s in all_sessions)
+    last_completed_at = summary.last_session_completed_at if summary else None
+    last_practice_date = last_completed_at.date() if last_completed_at else None
 
-    # Get last practice date
-    last_practice = db.query(LearningSession).filter(
-        LearningSession.user_id == str(current_user.user_id),
-        LearningSession.is_completed == True
-    ).order_by(LearningSession.completed_at.desc()).first()
-
-    last_practice_date = last_practice.completed_at.date() if last_practice and last_practice.completed_at else None
-
-    # Get spaced repetition reviews due
-    today = datetime.now(timezone.utc)
-    reviews_due = db.query(SpacedRepetitionCard).filter(
-        SpacedRepetitionCard.user_id == str(current_user.user_id),
-        SpacedRepetitionCard.is_due == True,
-        SpacedRepetitionCard.next_review_at <= today
-    ).count()
-
-    reviews_overdue = db.query(SpacedRepetitionCard).filter(
-        SpacedRepetitionCard.user_id == str(current_user.user_id),
-        SpacedRepetitionCard.is_due == True,
-        SpacedRepetitionCard.next_review_at < today - timedelta(days=1)
-    ).count()
-
-    # Build per-KA competency summaries (sorted by competency - weakest first)
-    competency_summaries = []
-    for comp in sorted(competencies, key=lambda x: x.competency_score):
-        ka = db.query(KnowledgeArea).filter(
-            KnowledgeArea.ka_id == comp.ka_id
-        ).first()
-
-        if ka:
-            accuracy_pct = (comp.correct_count / comp.attempts_count * 100) if comp.attempts_count > 0 else 0.0
-
-            competency_summaries.append(CompetencyStatusResponse(
-                ka_id=comp.ka_id,
-                ka_code=ka.ka_code,
-                ka_name=ka.ka_name,
-                ka_weight_percentage=ka.weight_percentage,
-                competency_score=comp.competency_score,
-                status=determine_competency_status(comp.competency_score),
-                attempts_count=comp.attempts_count,
-                correct_count=comp.correct_count,
-                incorrect_count=comp.incorrect_count,
-                accuracy_percentage=accuracy_pct,
-                last_practiced_at=comp.last_updated_at
-            ))
+    # Get spaced repetition reviews due (one aggregate)
+    now = datetime.now(timezone.utc)
+    reviews_due, reviews_overdue = db.query(
+        func.count().filter(SpacedRepetitionCard.next_review_at <= now),
+        func.count().filter(SpacedRepetitionCard.next_review_at < now - timedelta(days=1))
+    ).filter(
+        SpacedRepetitionCard.user_id == ctx.user_id
+    ).one()
+
+    # Build per-KA competency summaries (weakest first)
+    competency_summaries = [
+        ctx.competency_status(comp, ctx.ka_map[str(comp.ka_id)])
+        for comp in competencies
+        if str(comp.ka_id) in ctx.ka_map
+    ]
 
     # Generate focus area recommendations (weakest 2-3 KAs)
     focus_areas = []
@@ -187,31 +227,16 @@ def get_dashboard_overview(
                 reason=reason
             ))
 
-    # Calculate streak (consecutive days with completed sessions)
-    # Simple implementation - can be enhanced with dedicated streak tracking
+    # Calculate streak (consecutive days with completed sessions, ending today)
+    today = now.date()
     streak_days = 0
-    if last_practice_date:
-        current_date = date.today()
-        if last_practice_date == current_date:
-            # Count backwards to find streak
-            check_date = current_date
-            while True:
-                sessions_on_date = db.query(LearningSession).filter(
-                    LearningSession.user_id == str(current_user.user_id),
-                    LearningSession.is_completed == True,
-                    func.date(LearningSession.completed_at) == check_date
-                ).count()
-
-                if sessions_on_date > 0:
-                    streak_days += 1
-                    check_date = check_date - timedelta(days=1)
-                else:
-                    break
-
-    daily_goal_met = last_practice_date == date.today() if last_practice_date else False
+    if ctx.activity['last_active_date'] == today:
+        streak_days = ctx.activity['current_streak_days']
+
+    daily_goal_met = last_practice_date == today if last_practice_date else False
 
     return DashboardOverviewResponse(
-        user_id=current_user.user_id,
+        user_id=ctx.user.user_id,
         course_id=course.course_id,
         course_name=course.course_name,
         overall_competency=overall_competency,
@@ -232,41 +257,14 @@ def get_dashboard_overview(
     )
 
 
-@router.get("/competencies", response_model=CompetenciesDetailResponse)
-def get_competencies_detail(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get detailed competency breakdown with trends.
+def build_competencies_detail(ctx: DashboardContext, trend_days: int = 30) -> CompetenciesDetailResponse:
+    """Build the detailed per-KA competency breakdown with trends."""
+    course_id = ctx.course.course_id
+    competencies = ctx.competencies
+    overall_competency = ctx.overall_competency
 
-    Shows historical competency data and practice recommendations per KA.
-    Includes 30-day trend data for visualizations.
-    """
-    # Get user's course
-    user_sessions = db.query(LearningSession).filter(
-        LearningSession.user_id == str(current_user.user_id)
-    ).first()
-
-    if not user_sessions:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No learning activity found"
-        )
-
-    course_id = user_sessions.course_id
-
-    # Get all competencies
-    competencies = get_user_competencies(db, current_user.user_id)
-
-    if not competencies:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No competency data available"
-        )
-
-    # Calculate overall competency
-    overall_competency = calculate_weighted_competency(db, current_user.user_id, course_id)
+    # Daily snapshots for every KA in one range query
+    trends = get_competency_trends(ctx.db, ctx.user_id, days=trend_days)
 
     # Build detailed competency data
     competency_details = []
@@ -274,11 +272,9 @@ def get_competencies_detail(
     kas_on_track = 0
     kas_above = 0
 
-    # Sort by competency score (weakest first)
-    for comp in sorted(competencies, key=lambda x: x.competency_score):
-        ka = db.query(KnowledgeArea).filter(
-            KnowledgeArea.ka_id == comp.ka_id
-        ).first()
+    # Weakest first
+    for comp in competencies:
+        ka = ctx.ka_map.get(str(comp.ka_id))
 
         if not ka:
             continue
@@ -295,32 +291,15 @@ def get_competencies_detail(
 
         accuracy_pct = (comp.correct_count / comp.attempts_count * 100) if comp.attempts_count > 0 else 0.0
 
-        # Generate trend data (last 30 days)
-        # For MVP, we'll create a simple trend based on current data
-        # In production, track daily snapshots of competency scores
-        trend_points = []
-        thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-
-        # Get attempts in last 30 days grouped by date
-        attempts_by_date = db.query(
-            func.date(QuestionAttempt.attempted_at).label('attempt_date'),
-            func.count(QuestionAttempt.attempt_id).label('count')
-        ).join(
-            LearningSession,
-            QuestionAttempt.session_id == LearningSession.session_id
-        ).filter(
-            QuestionAttempt.user_id == str(current_user.user_id),
-            QuestionAttempt.attempted_at >= thirty_days_ago
-        ).group_by(func.date(QuestionAttempt.attempted_at)).all()
-
-        # Simple trend: show current competency for dates with activity
-        # In production, calculate actual historical competency
-        for attempt_date, count in attempts_by_date:
-            trend_points.append(CompetencyTrendPoint(
-                date=attempt_date,
-                competency_score=comp.competency_score,  # Simplified - use current
-                attempts_count=count
-            ))
+        # Daily trend from competency snapshots
+        trend_points = [
+            CompetencyTrendPoint(
+                date=snapshot.snapshot_date,
+                competency_score=snapshot.competency_score,
+                attempts_count=snapshot.attempts_count
+            )
+            for snapshot in trends.get(str(comp.ka_id), [])
+        ]
 
         # Recommended difficulty range based on current competency
         current_comp_float = float(comp.competency_score)
@@ -359,7 +338,7 @@ def get_competencies_detail(
         trend_direction = "stable"
 
     return CompetenciesDetailResponse(
-        user_id=current_user.user_id,
+        user_id=ctx.user.user_id,
         course_id=course_id,
         overall_competency=overall_competency,
         competencies=competency_details,
@@ -367,26 +346,34 @@ def get_competencies_detail(
         kas_on_track=kas_on_track,
         kas_above_target=kas_above,
         overall_trend_direction=trend_direction,
+        trend_days=trend_days,
         last_updated_at=datetime.now(timezone.utc)
     )
 
 
-@router.get("/recent", response_model=RecentActivityResponse)
-def get_recent_activity(
-    limit: int = 10,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get recent user activity and engagement metrics.
+def build_recent_activity(ctx: DashboardContext, limit: int = 10) -> RecentActivityResponse:
+    """Build recent sessions, weekly/monthly metrics and streaks."""
+    db = ctx.db
 
-    Shows practice history, streaks, and activity patterns.
-    """
     # Get recent sessions (last N)
     recent_sessions_records = db.query(LearningSession).filter(
-        LearningSession.user_id == str(current_user.user_id)
+        LearningSession.user_id == ctx.user_id
     ).order_by(LearningSession.started_at.desc()).limit(limit).all()
 
+    # Attempt totals for all recent sessions in one grouped query
+    attempt_totals = {}
+    if recent_sessions_records:
+        attempt_totals = {
+            session_id: (answered, correct)
+            for session_id, answered, correct in db.query(
+                QuestionAttempt.session_id,
+                func.count(QuestionAttempt.attempt_id),
+                func.count(QuestionAttempt.attempt_id).filter(QuestionAttempt.is_correct == True)
+            ).filter(
+                QuestionAttempt.session_id.in_([s.session_id for s in recent_sessions_records])
+            ).group_by(QuestionAttempt.session_id).all()
+        }
+
     recent_sessions = []
     for session in recent_sessions_records:
         duration_minutes = None
@@ -395,12 +382,7 @@ def get_recent_activity(
             duration_minutes = duration_seconds // 60
 
         # Calculate accuracy
-        attempts = db.query(QuestionAttempt).filter(
-            QuestionAttempt.session_id == session.session_id
-        ).all()
-
-        questions_answered = len(attempts)
-        correct = sum(1 for a in attempts if a.is_correct)
+        questions_answered, correct = attempt_totals.get(session.session_id, (0, 0))
         accuracy = (correct / questions_answered * 100) if questions_answered > 0 else 0.0
 
         recent_sessions.append(RecentSessionSummary(
@@ -415,127 +397,58 @@ def get_recent_activity(
             is_completed=session.is_completed
         ))
 
-    # Calculate weekly metrics
-    week_ago = datetime.now(timezone.utc) - timedelta(days=7)
-    sessions_this_week = db.query(LearningSession).filter(
-        LearningSession.user_id == str(current_user.user_id),
-        LearningSession.started_at >= week_ago,
-        LearningSession.is_completed == True
-    ).all()
-
-    week_sessions_count = len(sessions_this_week)
-    week_questions = sum(s.total_questions for s in sessions_this_week)
-    week_correct = sum(s.correct_answers for s in sessions_this_week)
-    week_accuracy = (week_correct / week_questions * 100) if week_questions > 0 else 0.0
-
-    # Calculate monthly metrics
-    month_ago = datetime.now(timezone.utc) - timedelta(days=30)
-    sessions_this_month = db.query(LearningSession).filter(
-        LearningSession.user_id == str(current_user.user_id),
-        LearningSession.started_at >= month_ago,
+    # Weekly and monthly metrics from one session aggregate
+    now = datetime.now(timezone.utc)
+    this_week = LearningSession.started_at >= now - timedelta(days=7)
+    this_month = LearningSession.started_at >= now - timedelta(days=30)
+
+    totals = db.query(
+        func.count().filter(this_week).label('week_sessions'),
+        func.coalesce(func.sum(LearningSession.total_questions).filter(this_week), 0).label('week_questions'),
+        func.coalesce(func.sum(LearningSession.correct_answers).filter(this_week), 0).label('week_correct'),
+        func.count().filter(this_month).label('month_sessions'),
+        func.coalesce(func.sum(LearningSession.total_questions).filter(this_month), 0).label('month_questions'),
+        func.coalesce(func.sum(LearningSession.correct_answers).filter(this_month), 0).label('month_correct'),
+        func.max(LearningSession.completed_at).label('last_completed_at')
+    ).filter(
+        LearningSession.user_id == ctx.user_id,
         LearningSession.is_completed == True
-    ).all()
+    ).one()
 
-    month_sessions_count = len(sessions_this_month)
-    month_questions = sum(s.total_questions for s in sessions_this_month)
-    month_correct = sum(s.correct_answers for s in sessions_this_month)
-    month_accuracy = (month_correct / month_questions * 100) if month_questions > 0 else 0.0
+    week_questions = int(totals.week_questions)
+    week_accuracy = (int(totals.week_correct) / week_questions * 100) if week_questions > 0 else 0.0
 
-    # Calculate streaks
-    all_completed_sessions = db.query(LearningSession).filter(
-        LearningSession.user_id == str(current_user.user_id),
-        LearningSession.is_completed == True
-    ).order_by(LearningSession.completed_at.desc()).all()
-
-    current_streak = 0
-    longest_streak = 0
-
-    if all_completed_sessions:
-        # Current streak
-        today = date.today()
-        last_session_date = all_completed_sessions[0].completed_at.date() if all_completed_sessions[0].completed_at else None
-
-        if last_session_date:
-            if last_session_date == today or last_session_date == today - timedelta(days=1):
-                # Build streak backwards
-                check_date = last_session_date
-                for session in all_completed_sessions:
-                    if session.completed_at:
-                        session_date = session.completed_at.date()
-                        if session_date == check_date:
-                            current_streak += 1
-                            check_date = check_date - timedelta(days=1)
-                        elif session_date < check_date:
-                            break
-
-        # Longest streak (simplified - just use current for now)
-        longest_streak = max(current_streak, longest_streak)
-
-    # Calculate total study time
-    total_minutes = 0
-    for session in all_completed_sessions:
-        if session.duration_seconds:
-            total_minutes += session.duration_seconds // 60
+    month_questions = int(totals.month_questions)
+    month_accuracy = (int(totals.month_correct) / month_questions * 100) if month_questions > 0 else 0.0
 
     # Last activity
-    last_session = all_completed_sessions[0] if all_completed_sessions else None
-    last_session_date = last_session.completed_at if last_session else None
+    last_session_date = totals.last_completed_at
 
     days_since_last = None
     if last_session_date:
-        days_since_last = (datetime.now(timezone.utc) - last_session_date).days
+        days_since_last = (now - last_session_date).days
 
     return RecentActivityResponse(
-        user_id=current_user.user_id,
+        user_id=ctx.user.user_id,
         recent_sessions=recent_sessions,
-        sessions_this_week=week_sessions_count,
+        sessions_this_week=totals.week_sessions,
         questions_this_week=week_questions,
         accuracy_this_week=week_accuracy,
-        sessions_this_month=month_sessions_count,
+        sessions_this_month=totals.month_sessions,
         questions_this_month=month_questions,
         accuracy_this_month=month_accuracy,
-        current_streak_days=current_streak,
-        longest_streak_days=longest_streak,
-        total_study_minutes=total_minutes,
+        current_streak_days=ctx.activity['current_streak_days'],
+        longest_streak_days=ctx.activity['longest_streak_days'],
+        total_study_minutes=ctx.activity['total_study_minutes'],
         last_session_date=last_session_date,
         days_since_last_practice=days_since_last
     )
 
 
-@router.get("/exam-readiness", response_model=ExamReadinessResponse)
-def get_exam_readiness(
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Get detailed exam readiness assessment.
-
-    Decision #8: Competency-based success criteria.
-    Target: All KAs >= 0.80 for exam readiness.
-
-    Provides actionable recommendations for reaching exam readiness.
-    """
-    # Get user's course
-    user_sessions = db.query(LearningSession).filter(
-        LearningSession.user_id == str(current_user.user_id)
-    ).first()
-
-    if not user_sessions:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No learning activity found"
-        )
-
-    course_id = user_sessions.course_id
-
-    # Get all competencies
-    competencies = get_user_competencies(db, current_user.user_id)
-
-    if not competencies:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="No competency data available"
-        )
+def build_exam_readiness(ctx: DashboardContext) -> ExamReadinessResponse:
+    """Build the exam readiness assessment."""
+    course_id = ctx.course.course_id
+    competencies = ctx.competencies
 
     # Count KAs at target
     target_threshold = Decimal('0.80')
@@ -546,30 +459,11 @@ def get_exam_readiness(
     readiness_pct = (kas_ready / len(competencies) * 100) if competencies else 0.0
 
     # Get weakest 3 KAs
-    weakest_comps = sorted(competencies, key=lambda x: x.competency_score)[:3]
-    weakest_kas = []
-
-    for comp in weakest_comps:
-        ka = db.query(KnowledgeArea).filter(
-            KnowledgeArea.ka_id == comp.ka_id
-        ).first()
-
-        if ka:
-            accuracy = (comp.correct_count / comp.attempts_count * 100) if comp.attempts_count > 0 else 0.0
-
-            weakest_kas.append(CompetencyStatusResponse(
-                ka_id=comp.ka_id,
-                ka_code=ka.ka_code,
-                ka_name=ka.ka_name,
-                ka_weight_percentage=ka.weight_percentage,
-                competency_score=comp.competency_score,
-                status=determine_competency_status(comp.competency_score),
-                attempts_count=comp.attempts_count,
-                correct_count=comp.correct_count,
-                incorrect_count=comp.incorrect_count,
-                accuracy_percentage=accuracy,
-                last_practiced_at=comp.last_updated_at
-            ))
+    weakest_kas = [
+        ctx.competency_status(comp, ctx.ka_map[str(comp.ka_id)])
+        for comp in competencies[:3]
+        if str(comp.ka_id) in ctx.ka_map
+    ]
 
     # Estimate questions remaining
     # Simple heuristic: for each KA below target, estimate questions needed
@@ -612,7 +506,7 @@ def get_exam_readiness(
         next_steps.append("Schedule your certification exam")
 
     return ExamReadinessResponse(
-        user_id=current_user.user_id,
+        user_id=ctx.user.user_id,
         course_id=course_id,
         exam_ready=exam_ready,
         readiness_percentage=readiness_pct,
@@ -624,3 +518,125 @@ def get_exam_readiness(
         recommendation=recommendation,
         next_steps=next_steps
     )
+
+
+def _validate_trend_days(trend_days: int) -> None:
+    """Reject trend windows other than 30, 90 or 365 days."""
+    if trend_days not in TREND_WINDOWS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"trend_days must be one of {', '.join(str(d) for d in TREND_WINDOWS)}"
+        )
+
+
+@router.get("", response_model=DashboardOverviewResponse)
+def get_dashboard_overview(
+    current_user: Principal = Depends(get_current_active_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Get main dashboard overview.
+
+    Decision #13: Comprehensive progress dashboard showing:
+    - Overall competency and exam readiness
+    - Per-KA competency status
+    - Performance metrics
+    - Spaced repetition reviews due
+    - Personalized recommendations
+
+    Returns complete snapshot of user's learning progress.
+    """
+    return build_overview(DashboardContext(db, current_user))
+
+
+@router.get("/competencies", response_model=CompetenciesDetailResponse)
+def get_competencies_detail(
+    trend_days: int = Query(30, description="Trend window in days (30, 90 or 365)"),
+    current_user: Principal = Depends(get_current_active_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Get detailed competency breakdown with trends.
+
+    Shows historical competency data and practice recommendations per KA.
+    Trends are daily competency snapshots over the last 30, 90 or 365 days,
+    read with a single range query.
+    """
+    _validate_trend_days(trend_days)
+    return build_competencies_detail(DashboardContext(db, current_user), trend_days)
+
+
+@router.get("/recent", response_model=RecentActivityResponse)
+def get_recent_activity(
+    limit: int = 10,
+    current_user: Principal = Depends(get_current_active_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Get recent user activity and engagement metrics.
+
+    Shows practice history, streaks, and activity patterns.
+    """
+    return build_recent_activity(DashboardContext(db, current_user), limit)
+
+
+@router.get("/exam-readiness", response_model=ExamReadinessResponse)
+def get_exam_readiness(
+    current_user: Principal = Depends(get_current_active_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Get detailed exam readiness assessment.
+
+    Decision #8: Competency-based success criteria.
+    Target: All KAs >= 0.80 for exam readiness.
+
+    Provides actionable recommendations for reaching exam readiness.
+    """
+    return build_exam_readiness(DashboardContext(db, current_user))
+
+
+@router.get("/bundle", response_model=DashboardBundleResponse)
+def get_dashboard_bundle(
+    sections: Optional[str] = Query(
+        None,
+        description="Comma-separated sections: overview, competencies, recent, exam_readiness (default: all)"
+    ),
+    trend_days: int = Query(30, description="Competencies trend window in days (30, 90 or 365)"),
+    limit: int = Query(10, ge=1, description="Recent sessions to include"),
+    current_user: Principal = Depends(get_current_active_principal),
+    db: Session = Depends(get_db)
+):
+    """
+    Get several dashboard payloads in one request.
+
+    Returns the same payloads as /dashboard, /dashboard/competencies,
+    /dashboard/recent and /dashboard/exam-readiness, computed in one pass:
+    course, competencies, KA map and activity are loaded once and shared.
+    Sections that weren't requested are null.
+    """
+    requested = BUNDLE_SECTIONS
+    if sections:
+        requested = tuple(dict.fromkeys(s.strip() for s in sections.split(",") if s.strip()))
+        unknown = [s for s in requested if s not in BUNDLE_SECTIONS]
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid sections '{sections}'. Valid: {', '.join(BUNDLE_SECTIONS)}"
+            )
+
+    if "competencies" in requested:
+        _validate_trend_days(trend_days)
+
+    ctx = DashboardContext(db, current_user)
+    builders = {
+        "overview": lambda: build_overview(ctx),
+        "competencies": lambda: build_competencies_detail(ctx, trend_days),
+        "recent": lambda: build_recent_activity(ctx, limit),
+        "exam_readiness": lambda: build_exam_readiness(ctx),
+    }
+
+    return DashboardBundleResponse(
+        user_id=current_user.user_id,
+        **{section: builders[section]() for section in requested}
+    )
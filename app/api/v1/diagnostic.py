@@ -11,11 +11,11 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
 from app.models.database import get_db
-from app.models.user import User
-from app.models.course import Course, KnowledgeArea
+from app.services.auth import Principal
+from app.models.course import Course
 from app.models.learning import Session as LearningSession, QuestionAttempt
 from app.models.question import Question, AnswerChoice
-from app.api.dependencies import get_current_active_user
+from app.api.dependencies import get_current_active_principal
 from app.schemas.diagnostic import (
     DiagnosticStartRequest,
     DiagnosticStartResponse,
@@ -26,8 +26,12 @@ from app.schemas.diagnostic import (
     DiagnosticKAResult,
     DiagnosticProgressResponse
 )
-from app.services.question_selection import select_diagnostic_questions, get_already_attempted_question_ids
+from app.services.question_selection import assign_session_questions, get_next_session_question
+from app.services.diagnostic_forms import get_diagnostic_form
 from app.services.spaced_repetition import create_or_update_sr_card
+from app.services.activity import record_session_completed
+from app.services.learning_summary import record_attempt_summary, record_session_summary
+from app.services.catalog import get_course_catalog, get_knowledge_area, get_knowledge_areas
 from app.services.competency import (
     calculate_diagnostic_competencies,
     calculate_weighted_competency,
@@ -40,7 +44,7 @@ router = APIRouter()
 @router.post("/start", response_model=DiagnosticStartResponse, status_code=status.HTTP_201_CREATED)
 def start_diagnostic(
     request: DiagnosticStartRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -48,7 +52,8 @@ def start_diagnostic(
 
     Decision #32: 24 questions total (4 per KA), mixed difficulty.
 
-    Creates a new diagnostic session and pre-selects all questions.
+    Creates a new diagnostic session and assigns it the next pre-assembled
+    form from the course's diagnostic form pool.
     Returns session_id for tracking progress through the diagnostic.
     """
     # Verify course exists and is active
@@ -78,9 +83,8 @@ def start_diagnostic(
         )
 
     # Count KAs for this course
-    ka_count = db.query(KnowledgeArea).filter(
-        KnowledgeArea.course_id == str(request.course_id)
-    ).count()
+    catalog = get_course_catalog(db, request.course_id)
+    ka_count = len(catalog.knowledge_areas) if catalog else 0
 
     questions_per_ka = 4
     total_questions = ka_count * questions_per_ka
@@ -95,6 +99,11 @@ def start_diagnostic(
         is_completed=False
     )
     db.add(session)
+    db.flush()
+
+    # Fix the question set and order for the whole session
+    assign_session_questions(db, session.session_id, get_diagnostic_form(db, request.course_id))
+
     db.commit()
     db.refresh(session)
 
@@ -112,14 +121,14 @@ def start_diagnostic(
 @router.get("/next-question", response_model=DiagnosticQuestionResponse)
 def get_next_diagnostic_question(
     session_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
     Get the next question in the diagnostic assessment.
 
-    Returns questions in a deterministic order (mixed across all KAs).
-    Excludes already-answered questions.
+    Returns the first unanswered question of the set stored at
+    /diagnostic/start, in its stored order.
     """
     # Verify session exists and belongs to user
     session = db.query(LearningSession).filter(
@@ -141,31 +150,25 @@ def get_next_diagnostic_question(
             detail="Diagnostic already completed. Use /diagnostic/results to view results."
         )
 
-    # Get already attempted questions
-    attempted_ids = get_already_attempted_question_ids(db, current_user.user_id, session_id)
-
-    # Get all diagnostic questions for this course
-    all_questions = select_diagnostic_questions(db, session.course_id)
+    # First unanswered question of the stored set
+    next_question = get_next_session_question(db, session)
 
-    # Filter out already attempted
-    remaining_questions = [q for q in all_questions if str(q.question_id) not in attempted_ids]
-
-    if not remaining_questions:
+    if not next_question:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No more questions available. Use /diagnostic/results to complete the diagnostic."
         )
 
-    # Get first remaining question
-    next_question = remaining_questions[0]
+    # Count answered questions
+    questions_answered = db.query(QuestionAttempt).filter(
+        QuestionAttempt.session_id == session_id
+    ).count()
 
     # Get KA info
-    ka = db.query(KnowledgeArea).filter(
-        KnowledgeArea.ka_id == next_question.ka_id
-    ).first()
+    ka = get_knowledge_area(db, next_question.ka_id)
 
     # Calculate question number (1-indexed)
-    question_number = len(attempted_ids) + 1
+    question_number = questions_answered + 1
 
     # Format answer choices (without is_correct field)
     choices = []
@@ -191,7 +194,7 @@ def get_next_diagnostic_question(
 @router.post("/submit-answer", response_model=DiagnosticAnswerResponse)
 def submit_diagnostic_answer(
     submission: DiagnosticAnswerSubmit,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -270,23 +273,28 @@ def submit_diagnostic_answer(
         question_difficulty_at_attempt=question.difficulty
     )
     db.add(attempt)
+    record_attempt_summary(db, current_user.user_id, session.course_id, is_correct)
 
     # Update session stats
     if is_correct:
         session.correct_answers += 1
 
-    db.commit()
-    db.refresh(attempt)
-
-    # Create/update spaced repetition card (Decision #31)
+    # Create/update spaced repetition card (Decision #31), same transaction
     create_or_update_sr_card(
         db=db,
         user_id=current_user.user_id,
         question_id=question.question_id,
         is_correct=is_correct,
-        quality=None  # Will be inferred from is_correct (4 if correct, 2 if incorrect)
+        quality=None,  # Will be inferred from is_correct (4 if correct, 2 if incorrect)
+        commit=False
     )
 
+    # attempt_id/attempted_at were returned by the flush
+    attempt_id = attempt.attempt_id
+    attempted_at = attempt.attempted_at
+
+    db.commit()
+
     # Get correct choice for feedback
     correct_choice = db.query(AnswerChoice).filter(
         AnswerChoice.question_id == str(submission.question_id),
@@ -299,21 +307,21 @@ def submit_diagnostic_answer(
     ).count()
 
     return DiagnosticAnswerResponse(
-        attempt_id=attempt.attempt_id,
+        attempt_id=attempt_id,
         is_correct=is_correct,
         correct_choice_id=correct_choice.choice_id if correct_choice else None,
         explanation=selected_choice.explanation,
         question_number=questions_answered,
         total_questions=session.total_questions,
         questions_remaining=session.total_questions - questions_answered,
-        attempted_at=attempt.attempted_at
+        attempted_at=attempted_at
     )
 
 
 @router.get("/results", response_model=DiagnosticResultsResponse)
 def get_diagnostic_results(
     session_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -360,11 +368,10 @@ def get_diagnostic_results(
     competencies = calculate_diagnostic_competencies(db, current_user.user_id, session_id)
 
     # Build KA results
+    ka_map = get_knowledge_areas(db, [competency.ka_id for competency in competencies])
     ka_results = []
     for competency in competencies:
-        ka = db.query(KnowledgeArea).filter(
-            KnowledgeArea.ka_id == competency.ka_id
-        ).first()
+        ka = ka_map.get(str(competency.ka_id))
 
         if ka:
             accuracy = (competency.correct_count / competency.attempts_count * 100) if competency.attempts_count > 0 else 0
@@ -414,6 +421,8 @@ def get_diagnostic_results(
 
         # Calculate score percentage
         session.score_percentage = Decimal(str(overall_accuracy))
+        record_session_completed(db, session)
+        record_session_summary(db, session)
 
         db.commit()
         db.refresh(session)
@@ -445,7 +454,7 @@ def get_diagnostic_results(
 @router.get("/progress", response_model=DiagnosticProgressResponse)
 def get_diagnostic_progress(
     session_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
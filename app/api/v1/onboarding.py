@@ -7,14 +7,14 @@ Decision #10: Comprehensive onboarding flow.
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.models.database import get_db
-from app.models.user import User
+from app.services.auth import Principal
 from app.models.course import Course
 from app.schemas.user import (
     UserProfileCreate, UserProfileResponse, UserWithProfileResponse
 )
 from app.schemas.course import CourseResponse
 from app.services.user import create_user_profile, get_user_with_profile
-from app.api.dependencies import get_current_active_user
+from app.api.dependencies import get_current_active_principal
 from typing import List
 
 
@@ -23,7 +23,7 @@ router = APIRouter()
 
 @router.get("/courses", response_model=List[CourseResponse])
 def get_available_courses(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -43,7 +43,7 @@ def get_available_courses(
 @router.post("/profile", response_model=UserProfileResponse, status_code=status.HTTP_201_CREATED)
 def complete_onboarding(
     profile_data: UserProfileCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -75,7 +75,7 @@ def complete_onboarding(
 
 @router.get("/me", response_model=UserWithProfileResponse)
 def get_my_profile(
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
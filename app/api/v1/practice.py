@@ -7,16 +7,16 @@ User Flow #3: Practice sessions targeting weak areas.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Set
 from datetime import datetime, timezone
 from decimal import Decimal
 
 from app.models.database import get_db
-from app.models.user import User
-from app.models.course import Course, KnowledgeArea
+from app.services.auth import Principal
+from app.models.course import Course
 from app.models.learning import Session as LearningSession, QuestionAttempt, UserCompetency
-from app.models.question import Question, AnswerChoice
-from app.api.dependencies import get_current_active_user
+from app.models.question import Question
+from app.api.dependencies import get_current_active_principal
 from app.schemas.practice import (
     PracticeStartRequest,
     PracticeStartResponse,
@@ -29,6 +29,9 @@ from app.schemas.practice import (
     PracticeHistoryResponse
 )
 from app.services.spaced_repetition import create_or_update_sr_card
+from app.services.activity import record_session_completed
+from app.services.learning_summary import record_attempt_summary, record_session_summary
+from app.services.catalog import get_course_catalog, get_knowledge_area
 from app.services.question_selection import select_adaptive_question, get_already_attempted_question_ids
 from app.services.competency import update_competency_after_attempt, get_weakest_ka, get_user_competencies
 
@@ -38,7 +41,7 @@ router = APIRouter()
 @router.post("/start", response_model=PracticeStartResponse, status_code=status.HTTP_201_CREATED)
 def start_practice_session(
     request: PracticeStartRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -64,10 +67,7 @@ def start_practice_session(
     # Get target KA info if specified
     target_ka = None
     if request.knowledge_area_id:
-        target_ka = db.query(KnowledgeArea).filter(
-            KnowledgeArea.ka_id == str(request.knowledge_area_id),
-            KnowledgeArea.course_id == str(request.course_id)
-        ).first()
+        target_ka = get_course_catalog(db, course.course_id).ka(request.knowledge_area_id)
 
         if not target_ka:
             raise HTTPException(
@@ -103,7 +103,7 @@ def start_practice_session(
 @router.get("/next-question", response_model=PracticeQuestionResponse)
 def get_next_practice_question(
     session_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -147,32 +147,67 @@ def get_next_practice_question(
             detail=f"All {session.total_questions} questions answered. Use /practice/complete to finish session."
         )
 
+    next_question = _next_practice_question(db, session, current_user.user_id, questions_answered)
+
+    if not next_question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No more questions available for your competency level"
+        )
+
+    return next_question
+
+
+def _next_practice_question(
+    db: Session,
+    session: LearningSession,
+    user_id,
+    questions_answered: int,
+    known_competency: Optional[UserCompetency] = None,
+    attempted_ids: Optional[Set[str]] = None
+) -> Optional[PracticeQuestionResponse]:
+    """
+    Select the next adaptive question for a session and format it.
+
+    Shared by /next-question and the inline option of /submit-answer.
+
+    Args:
+        db: Database session
+        session: Practice session (already verified)
+        user_id: User ID
+        questions_answered: Attempts so far in this session
+        known_competency: Competency already loaded by the caller (skips a
+            lookup when the next question is in the same KA)
+        attempted_ids: Question IDs already answered, if the caller has them
+
+    Returns:
+        PracticeQuestionResponse, or None if no question is available
+    """
     # Get already attempted questions in this session
-    attempted_ids = get_already_attempted_question_ids(db, current_user.user_id, session_id)
+    if attempted_ids is None:
+        attempted_ids = get_already_attempted_question_ids(db, user_id, session.session_id)
 
     # Select next adaptive question
     next_question = select_adaptive_question(
         db=db,
-        user_id=current_user.user_id,
+        user_id=user_id,
         course_id=session.course_id,
         exclude_question_ids=attempted_ids
     )
 
     if not next_question:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No more questions available for your competency level"
-        )
+        return None
 
     # Get KA info and user's current competency
-    ka = db.query(KnowledgeArea).filter(
-        KnowledgeArea.ka_id == next_question.ka_id
-    ).first()
+    ka = get_knowledge_area(db, next_question.ka_id)
 
-    user_competency = db.query(UserCompetency).filter(
-        UserCompetency.user_id == str(current_user.user_id),
-        UserCompetency.ka_id == next_question.ka_id
-    ).first()
+    if known_competency is not None and known_competency.ka_id == next_question.ka_id:
+        user_competency = known_competency
+    else:
+        user_competency = db.query(UserCompetency).filter(
+            UserCompetency.user_id == str(user_id),
+            UserCompetency.ka_id == next_question.ka_id
+        ).first()
 
     current_competency = user_competency.competency_score if user_competency else Decimal('0.50')
 
@@ -205,7 +240,7 @@ def get_next_practice_question(
 @router.post("/submit-answer", response_model=PracticeSubmitResponse)
 def submit_practice_answer(
     submission: PracticeSubmitRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -213,7 +248,9 @@ def submit_practice_answer(
 
     Decision #3: Updates competency in real-time after each answer.
 
-    Returns immediate feedback and competency change.
+    Returns immediate feedback and competency change. With
+    include_next_question, the next adaptive question (selected against the
+    just-updated competency) is returned too, saving a /next-question call.
     """
     # Verify session
     session = db.query(LearningSession).filter(
@@ -245,24 +282,21 @@ def submit_practice_answer(
             detail="Question not found"
         )
 
-    # Check if already attempted
-    existing_attempt = db.query(QuestionAttempt).filter(
-        QuestionAttempt.user_id == str(current_user.user_id),
-        QuestionAttempt.question_id == str(submission.question_id),
-        QuestionAttempt.session_id == str(submission.session_id)
-    ).first()
+    # Questions already answered in this session (duplicate check + progress)
+    attempted_ids = get_already_attempted_question_ids(db, current_user.user_id, session.session_id)
 
-    if existing_attempt:
+    if str(submission.question_id) in attempted_ids:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Question already answered in this session"
         )
 
-    # Verify selected choice exists and belongs to this question
-    selected_choice = db.query(AnswerChoice).filter(
-        AnswerChoice.choice_id == str(submission.selected_choice_id),
-        AnswerChoice.question_id == str(submission.question_id)
-    ).first()
+    # Verify selected choice belongs to this question (choices loaded once,
+    # also used for the correct-answer feedback)
+    choices = question.answer_choices
+    selected_choice = next(
+        (c for c in choices if str(c.choice_id) == str(submission.selected_choice_id)), None
+    )
 
     if not selected_choice:
         raise HTTPException(
@@ -270,10 +304,10 @@ def submit_practice_answer(
             detail="Invalid answer choice"
         )
 
+    correct_choice = next((c for c in choices if c.is_correct), None)
+
     # Get KA info
-    ka = db.query(KnowledgeArea).filter(
-        KnowledgeArea.ka_id == question.ka_id
-    ).first()
+    ka = get_knowledge_area(db, question.ka_id)
 
     # Get previous competency
     prev_competency_record = db.query(UserCompetency).filter(
@@ -286,7 +320,8 @@ def submit_practice_answer(
     # Determine correctness
     is_correct = selected_choice.is_correct
 
-    # Create attempt record
+    # Single unit of work: attempt, session stats, competency and SR card
+    # are flushed into one transaction and committed once
     attempt = QuestionAttempt(
         user_id=str(current_user.user_id),
         question_id=str(submission.question_id),
@@ -298,71 +333,79 @@ def submit_practice_answer(
         question_difficulty_at_attempt=question.difficulty
     )
     db.add(attempt)
+    record_attempt_summary(db, current_user.user_id, session.course_id, is_correct)
 
     # Update session stats
     if is_correct:
         session.correct_answers += 1
 
-    db.commit()
-    db.refresh(attempt)
-
     # Update competency in real-time (Decision #3)
     updated_competency = update_competency_after_attempt(
         db=db,
         user_id=current_user.user_id,
         ka_id=question.ka_id,
         is_correct=is_correct,
-        question_difficulty=question.difficulty
+        question_difficulty=question.difficulty,
+        commit=False
     )
 
-    new_competency = updated_competency.competency_score
-    competency_change = new_competency - previous_competency
-
     # Create/update spaced repetition card (Decision #31)
     create_or_update_sr_card(
         db=db,
         user_id=current_user.user_id,
         question_id=question.question_id,
         is_correct=is_correct,
-        quality=None  # Will be inferred from is_correct (4 if correct, 2 if incorrect)
+        quality=None,  # Will be inferred from is_correct (4 if correct, 2 if incorrect)
+        commit=False
     )
 
-    # Get correct choice for feedback
-    correct_choice = db.query(AnswerChoice).filter(
-        AnswerChoice.question_id == str(submission.question_id),
-        AnswerChoice.is_correct == True
-    ).first()
+    # Values come from the flush (attempted_at via RETURNING); read them
+    # before commit expires the instances
+    questions_answered = len(attempted_ids) + 1
+    total_questions = session.total_questions
+    new_competency = updated_competency.competency_score
+    competency_change = new_competency - previous_competency
+    session_accuracy = session.correct_answers / questions_answered * 100
+    attempt_id = attempt.attempt_id
+    attempted_at = attempt.attempted_at
 
-    # Calculate progress
-    questions_answered = db.query(QuestionAttempt).filter(
-        QuestionAttempt.session_id == str(submission.session_id)
-    ).count()
+    db.commit()
 
-    # Calculate session accuracy
-    session_accuracy = (session.correct_answers / questions_answered * 100) if questions_answered > 0 else 0.0
+    next_question = None
+    if submission.include_next_question and questions_answered < total_questions:
+        attempted_ids.add(str(submission.question_id))
+        next_question = _next_practice_question(
+            db,
+            session,
+            current_user.user_id,
+            questions_answered,
+            known_competency=updated_competency,
+            attempted_ids=attempted_ids
+        )
 
     return PracticeSubmitResponse(
-        attempt_id=attempt.attempt_id,
+        attempt_id=attempt_id,
         is_correct=is_correct,
         correct_choice_id=correct_choice.choice_id if correct_choice else None,
         explanation=selected_choice.explanation,
         question_number=questions_answered,
-        total_questions=session.total_questions,
-        questions_remaining=session.total_questions - questions_answered,
+        total_questions=total_questions,
+        questions_remaining=total_questions - questions_answered,
         ka_id=question.ka_id,
         ka_name=ka.ka_name if ka else "Unknown",
         previous_competency=previous_competency,
         new_competency=new_competency,
         competency_change=competency_change,
         session_accuracy=session_accuracy,
-        attempted_at=attempt.attempted_at
+        attempted_at=attempted_at,
+        next_question=next_question
     )
 
 
 @router.get("/session/{session_id}", response_model=PracticeSessionResponse)
 def get_practice_session(
     session_id: str,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -432,7 +475,7 @@ def get_practice_session(
 @router.post("/complete", response_model=PracticeCompleteResponse)
 def complete_practice_session(
     request: PracticeCompleteRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -516,6 +559,8 @@ def complete_practice_session(
     session.completed_at = datetime.now(timezone.utc)
     session.duration_seconds = int((session.completed_at - session.started_at).total_seconds())
     session.score_percentage = Decimal(str(accuracy))
+    record_session_completed(db, session)
+    record_session_summary(db, session)
 
     db.commit()
     db.refresh(session)
@@ -539,7 +584,7 @@ def complete_practice_session(
 @router.get("/history", response_model=PracticeHistoryResponse)
 def get_practice_history(
     limit: int = 10,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
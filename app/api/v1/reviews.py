@@ -15,11 +15,11 @@ from typing import List
 from uuid import UUID
 from decimal import Decimal
 
-from app.api.dependencies import get_db, get_current_active_user
-from app.models.user import User
+from app.api.dependencies import get_db, get_current_active_principal
+from app.services.auth import Principal
 from app.models.spaced_repetition import SpacedRepetitionCard
 from app.models.question import Question
-from app.models.course import KnowledgeArea
+from app.services.catalog import get_knowledge_area
 from app.schemas.spaced_repetition import (
     DueCardsResponse,
     SpacedRepetitionCardResponse,
@@ -30,7 +30,7 @@ from app.schemas.spaced_repetition import (
 )
 from app.services.spaced_repetition import (
     get_due_cards,
-    update_card_sm2,
+    process_card_review,
     get_review_statistics,
     get_feedback_message
 )
@@ -42,7 +42,7 @@ router = APIRouter()
 def get_due_reviews(
     limit: int = Query(20, ge=1, le=50, description="Max cards to return"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Get spaced repetition cards due for review.
@@ -78,9 +78,7 @@ def get_due_reviews(
             continue
 
         # Get KA details
-        ka = db.query(KnowledgeArea).filter(
-            KnowledgeArea.ka_id == question.ka_id
-        ).first()
+        ka = get_knowledge_area(db, question.ka_id)
 
         # Calculate success rate
         success_rate = 0.0
@@ -98,7 +96,7 @@ def get_due_reviews(
             repetition_count=card.repetition_count,
             last_reviewed_at=card.last_reviewed_at,
             next_review_at=card.next_review_at,
-            is_due=card.is_due,
+            is_due=card.next_review_at <= now,
             total_reviews=card.total_reviews,
             successful_reviews=card.successful_reviews,
             success_rate=round(success_rate, 1)
@@ -117,7 +115,7 @@ def answer_review_card(
     card_id: UUID,
     answer_data: ReviewAnswerRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Answer a spaced repetition card with SM-2 quality rating.
@@ -152,9 +150,7 @@ def answer_review_card(
     previous_interval = card.interval_days
 
     # Update card using SM-2 algorithm
-    updated_card = update_card_sm2(card, answer_data.quality)
-    db.commit()
-    db.refresh(updated_card)
+    updated_card = process_card_review(db, card, answer_data.quality)
 
     # Determine if answer was "correct" (quality >= 3)
     is_correct = answer_data.quality >= 3
@@ -182,7 +178,7 @@ def answer_review_card(
 @router.get("/stats", response_model=ReviewStatsResponse)
 def get_user_review_stats(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: Principal = Depends(get_current_active_principal)
 ):
     """
     Get overall spaced repetition statistics for current user.
@@ -205,6 +201,7 @@ def get_user_review_stats(
         total_reviews_completed=stats['total_reviews_completed'],
         average_success_rate=stats['average_success_rate'],
         current_streak_days=stats['current_streak_days'],
+        longest_streak_days=stats['longest_streak_days'],
         daily_review_target=stats['daily_review_target'],
         estimated_daily_minutes=stats['estimated_daily_minutes']
     )
@@ -7,15 +7,17 @@ Decision #12: Daily practice sessions.
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.models.database import get_db
-from app.models.user import User
-from app.models.learning import Session as LearningSession, QuestionAttempt
-from app.models.question import Question, AnswerChoice
+from app.services.auth import Principal
+from app.models.learning import Session as LearningSession, QuestionAttempt, UserCompetency
+from app.models.question import Question
 from app.schemas.learning import SessionCreate, SessionResponse, SessionCompleteRequest
 from app.schemas.question import (
     QuestionPublicResponse, QuestionAttemptCreate, QuestionAttemptWithExplanationResponse
 )
 from app.services.competency import update_competency_after_attempt, get_weakest_ka
-from app.api.dependencies import get_current_active_user
+from app.services.activity import record_session_completed
+from app.services.learning_summary import record_attempt_summary, record_session_summary
+from app.api.dependencies import get_current_active_principal
 from typing import List
 from datetime import datetime, timezone
 import uuid as uuid_lib
@@ -27,7 +29,7 @@ router = APIRouter()
 @router.post("", response_model=SessionResponse, status_code=status.HTTP_201_CREATED)
 def create_session(
     session_data: SessionCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -64,7 +66,7 @@ def create_session(
 @router.get("/{session_id}", response_model=SessionResponse)
 def get_session(
     session_id: uuid_lib.UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -87,7 +89,7 @@ def get_session(
 @router.get("/{session_id}/next-question", response_model=QuestionPublicResponse)
 def get_next_question(
     session_id: uuid_lib.UUID,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -165,7 +167,7 @@ def get_next_question(
 def submit_answer(
     session_id: uuid_lib.UUID,
     attempt_data: QuestionAttemptCreate,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -179,6 +181,9 @@ def submit_answer(
     3. Update session stats
     4. Update user competency (IRT)
     5. Return result with explanation
+
+    Attempt, session stats and competency are written in one transaction
+    with a single commit.
     """
     # Verify session
     session = db.query(LearningSession).filter(
@@ -203,12 +208,13 @@ def submit_answer(
             detail="Question not found"
         )
 
-    # Get selected answer choice
-    selected_choice = db.query(AnswerChoice).filter(
-        AnswerChoice.choice_id == str(attempt_data.selected_choice_id)
-    ).first()
+    # Get selected answer choice (choices loaded once, reused for the explanation)
+    selected_choice = next(
+        (c for c in question.answer_choices if str(c.choice_id) == str(attempt_data.selected_choice_id)),
+        None
+    )
     
-    if not selected_choice or selected_choice.question_id != question.question_id:
+    if not selected_choice:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid answer choice"
@@ -218,9 +224,10 @@ def submit_answer(
     is_correct = selected_choice.is_correct
     
     # Get current competency before update
-    from app.services.competency import get_user_competencies
-    competencies = get_user_competencies(db, str(current_user.user_id))
-    user_competency = next((c for c in competencies if c.ka_id == question.ka_id), None)
+    user_competency = db.query(UserCompetency).filter(
+        UserCompetency.user_id == str(current_user.user_id),
+        UserCompetency.ka_id == question.ka_id
+    ).first()
     user_competency_score = user_competency.competency_score if user_competency else None
 
     # Create attempt record
@@ -236,32 +243,30 @@ def submit_answer(
     )
     
     db.add(attempt)
-    
+    record_attempt_summary(db, current_user.user_id, session.course_id, is_correct)
+
     # Update session stats
     session.total_questions += 1
     if is_correct:
         session.correct_answers += 1
     
-    # Update user competency
+    # Update user competency (flushed into the same transaction)
     update_competency_after_attempt(
         db=db,
         user_id=str(current_user.user_id),
         ka_id=question.ka_id,
         is_correct=is_correct,
-        question_difficulty=question.difficulty
+        question_difficulty=question.difficulty,
+        commit=False
     )
-    
-    db.commit()
-    db.refresh(attempt)
-    
-    # Get correct choice for explanation
-    correct_choice = db.query(AnswerChoice).filter(
-        AnswerChoice.question_id == question.question_id,
-        AnswerChoice.is_correct == True
-    ).first()
-    
-    # Build response with explanation
-    return QuestionAttemptWithExplanationResponse(
+
+    # Flush returns attempt_id/attempted_at via RETURNING; build the response
+    # before the single commit expires the instances
+    db.flush()
+
+    correct_choice = next(c for c in question.answer_choices if c.is_correct)
+
+    response = QuestionAttemptWithExplanationResponse(
         attempt_id=attempt.attempt_id,
         user_id=attempt.user_id,
         question_id=attempt.question_id,
@@ -278,12 +283,16 @@ def submit_answer(
         all_choices=question.answer_choices
     )
 
+    db.commit()
+
+    return response
+
 
 @router.post("/{session_id}/complete", response_model=SessionResponse)
 def complete_session(
     session_id: uuid_lib.UUID,
     complete_data: SessionCompleteRequest,
-    current_user: User = Depends(get_current_active_user),
+    current_user: Principal = Depends(get_current_active_principal),
     db: Session = Depends(get_db)
 ):
     """
@@ -300,12 +309,17 @@ def complete_session(
             detail="Session not found"
         )
     
+    was_completed = session.is_completed
     session.is_completed = True
     session.completed_at = datetime.now(timezone.utc)
 
     if complete_data.duration_minutes:
         session.duration_seconds = complete_data.duration_minutes * 60
 
+    if not was_completed:
+        record_session_completed(db, session)
+        record_session_summary(db, session)
+
     db.commit()
     db.refresh(session)
 
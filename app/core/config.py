@@ -28,6 +28,8 @@ class Settings(BaseSettings):
 
     # Encryption (for PII)
     ENCRYPTION_KEY: str
+    ENCRYPTION_OLD_KEYS: str = ""  # Comma-separated previous ENCRYPTION_KEYs, newest first (decrypt only, during rotation)
+    BLIND_INDEX_KEY: str = ""  # HMAC key for searchable PII lookups ("hex:..." for raw bytes; derived from ENCRYPTION_KEY if empty, required with ENCRYPTION_OLD_KEYS)
 
     # JWT Authentication
     SECRET_KEY: str
@@ -35,6 +37,40 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
 
+    # Password hashing admission control (Argon2id uses 64 MB per hash)
+    PASSWORD_HASH_MAX_CONCURRENT: int = 4  # Concurrent hashes per worker
+    PASSWORD_HASH_MAX_WAITING: int = 32  # Requests queued for a slot before shedding with 429
+    PASSWORD_HASH_WAIT_TIMEOUT_SECONDS: float = 5.0  # Max queue wait before shedding with 503
+
+    # Principal resolution for learner endpoints (admin and account endpoints always load the user)
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30  # Per-user role/is_active cache (0 disables); other workers see deactivation/role changes within this TTL
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False  # Trust JWT claims until expiry; deactivation applies on next login
+
+    # Security audit log writer (login events are buffered, admin actions written synchronously)
+    SECURITY_LOG_QUEUE_SIZE: int = 10000  # Buffered events per worker before callers write synchronously (0 disables buffering)
+    SECURITY_LOG_BATCH_SIZE: int = 200  # Rows per multi-row INSERT; a full batch triggers a flush
+    SECURITY_LOG_FLUSH_INTERVAL_SECONDS: float = 1.0  # Max time an event waits in the buffer
+
+    # Rate limiting (Decision #52): Redis sliding windows, in-process token buckets without Redis
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LEARNER_PER_MINUTE: int = 100  # Per user
+    RATE_LIMIT_ADMIN_PER_MINUTE: int = 500  # Per user
+    RATE_LIMIT_ANONYMOUS_PER_MINUTE: int = 10  # Per IP, unauthenticated requests
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 5  # Per IP, POST /v1/auth/login
+    RATE_LIMIT_REDIS_RETRY_SECONDS: int = 30  # How long to use the fallback after a Redis error
+    TRUSTED_PROXY_COUNT: int = 0  # Reverse proxies in front of the app that append X-Forwarded-For (0 = ignore the header)
+
+    # Failed-login backoff and lockout (per account and per IP, checked before Argon2)
+    LOGIN_ACCOUNT_FREE_ATTEMPTS: int = 3  # Failures before backoff starts
+    LOGIN_ACCOUNT_LOCKOUT_FAILURES: int = 10  # Failures that lock the account out
+    LOGIN_IP_FREE_ATTEMPTS: int = 20  # Higher for IPs: NAT and office networks share one
+    LOGIN_IP_LOCKOUT_FAILURES: int = 100
+    LOGIN_BACKOFF_BASE_SECONDS: float = 1.0  # Doubles with each further failure
+    LOGIN_BACKOFF_MAX_SECONDS: float = 60.0
+    LOGIN_LOCKOUT_SECONDS: int = 900
+    LOGIN_FAILURE_HALF_LIFE_SECONDS: float = 900.0  # Failure counts halve over this period
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000  # Tracked accounts + IPs per worker
+
     # OpenAI
     OPENAI_API_KEY: str
 
@@ -57,6 +93,16 @@ class Settings(BaseSettings):
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
 
+    # In-process caches
+    QUESTION_BANK_CACHE_TTL_SECONDS: int = 300  # Max staleness of the question bank index across workers
+    DIAGNOSTIC_FORM_POOL_SIZE: int = 20  # Pre-assembled diagnostic forms kept per course
+    REVIEW_STATS_CACHE_TTL_SECONDS: int = 30  # Per-user /reviews/stats cache (0 disables)
+    CATALOG_VERSION_CHECK_SECONDS: int = 5  # How often a worker re-checks a cached course catalog's version
+    CATALOG_MAX_AGE_SECONDS: int = 300  # Reload a cached catalog after this long even without a version bump (0 disables)
+    PII_ENCRYPTION_FORMAT: str = "aesgcm"  # New PII ciphertexts: 'aesgcm' (v2 envelope) or 'fernet' (legacy readers still deployed)
+    PII_DECRYPT_CACHE_SIZE: int = 10000  # Decrypted PII values kept per worker (0 disables)
+    PII_DECRYPT_CACHE_TTL_SECONDS: int = 300  # Max lifetime of a cached plaintext (0 disables)
+
     def get_cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string."""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
@@ -0,0 +1,415 @@
+"""
+Request rate limiting middleware.
+
+Decision #52, #56: Rate limiting to prevent abuse (100 req/min for
+authenticated learners).
+
+Counters live outside Postgres: per-user (authenticated) or per-IP
+(anonymous, login) sliding-window counters in Redis (REDIS_URL), shared by
+all workers. When Redis is unreachable each worker falls back to
+in-process token buckets and retries Redis after
+RATE_LIMIT_REDIS_RETRY_SECONDS.
+
+Only block events are written to rate_limit_entries, once per blocked
+identity and block period, so a client hammering a limit doesn't turn into
+a database write per request.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import redis
+import redis.asyncio as aioredis
+from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitPolicy:
+    """Request budget per identity."""
+
+    __slots__ = ("name", "limit", "window_seconds", "scope")
+
+    def __init__(self, name: str, limit: int, window_seconds: int = 60, scope: str = "principal"):
+        self.name = name
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.scope = scope  # 'principal' (user if authenticated, else IP) | 'ip'
+
+
+LEARNER_POLICY = RateLimitPolicy("learner", settings.RATE_LIMIT_LEARNER_PER_MINUTE)
+ADMIN_POLICY = RateLimitPolicy("admin", settings.RATE_LIMIT_ADMIN_PER_MINUTE)
+ANONYMOUS_POLICY = RateLimitPolicy("anonymous", settings.RATE_LIMIT_ANONYMOUS_PER_MINUTE)
+
+# (method, path) -> policy, checked before the role-based policies
+ROUTE_POLICIES: Dict[Tuple[str, str], RateLimitPolicy] = {
+    ("POST", "/v1/auth/login"): RateLimitPolicy("auth_login", settings.RATE_LIMIT_LOGIN_PER_MINUTE, scope="ip"),
+}
+
+EXEMPT_PATHS = frozenset({"/", "/health", "/docs", "/redoc", "/openapi.json"})
+
+ROLE_POLICIES = {
+    'learner': LEARNER_POLICY,
+    'admin': ADMIN_POLICY,
+    'super_admin': ADMIN_POLICY,
+}
+
+
+class RateLimitResult:
+    """Outcome of counting one request."""
+
+    __slots__ = ("allowed", "limit", "remaining", "reset_seconds", "count")
+
+    def __init__(self, allowed: bool, limit: int, remaining: int, reset_seconds: int, count: int):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_seconds = reset_seconds
+        self.count = count
+
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets keyed by identity (fallback without Redis).
+
+    Buckets hold `limit` tokens and refill at limit / window_seconds per
+    second. The least recently used buckets are dropped beyond max_keys.
+    """
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """Take one token for a request."""
+        rate = policy.limit / policy.window_seconds
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(policy.limit), now))
+            tokens = min(float(policy.limit), tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        reset_seconds = math.ceil((1 - tokens) / rate) if not allowed else math.ceil((policy.limit - tokens) / rate)
+        return RateLimitResult(
+            allowed=allowed,
+            limit=policy.limit,
+            remaining=int(tokens),
+            reset_seconds=max(reset_seconds, 1),
+            count=policy.limit - int(tokens)
+        )
+
+    def reset(self) -> None:
+        """Drop all buckets."""
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisSlidingWindowLimiter:
+    """
+    Sliding-window counters in Redis (one pipelined round trip per request).
+
+    Approximates a sliding window from the current and previous fixed
+    windows: count = previous * (unelapsed share of window) + current.
+    """
+
+    KEY_PREFIX = "learnr:ratelimit"
+
+    def __init__(self, url: str):
+        self.url = url
+        self._redis: Any = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # loop self._redis is bound to
+
+    async def _client(self):
+        """Client for the running event loop; a client of a previous loop is closed."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            stale = self._redis
+            self._redis = aioredis.from_url(self.url, socket_connect_timeout=0.05, socket_timeout=0.05)
+            self._loop = loop
+            if stale is not None:
+                await self._close(stale)
+        return self._redis
+
+    @staticmethod
+    async def _close(client) -> None:
+        """Close a client and disconnect its connection pool."""
+        try:
+            await client.aclose()
+        except Exception as e:
+            # Connections of an already closed loop can't be shut down cleanly
+            logger.debug(f"Failed to close Redis rate limit client: {e}")
+
+    async def aclose(self) -> None:
+        """Close the client (app shutdown)."""
+        client, self._redis, self._loop = self._redis, None, None
+        if client is not None:
+            await self._close(client)
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """Count a request; raises redis errors to the caller."""
+        now = time.time()
+        window = policy.window_seconds
+        window_index = int(now // window)
+        elapsed = now - window_index * window
+        base = f"{self.KEY_PREFIX}:{key}"
+
+        pipe = (await self._client()).pipeline(transaction=False)
+        pipe.incr(f"{base}:{window_index}")
+        pipe.expire(f"{base}:{window_index}", window * 2)
+        pipe.get(f"{base}:{window_index - 1}")
+        current, _, previous = await pipe.execute()
+
+        count = int(int(previous or 0) * (window - elapsed) / window + int(current))
+        return RateLimitResult(
+            allowed=count <= policy.limit,
+            limit=policy.limit,
+            remaining=max(policy.limit - count, 0),
+            reset_seconds=max(math.ceil(window - elapsed), 1),
+            count=count
+        )
+
+    def reset(self) -> None:
+        """Delete all rate limit keys (blocking client; not for the request path)."""
+        client = redis.Redis.from_url(self.url, socket_connect_timeout=0.05, socket_timeout=0.5)
+        try:
+            for redis_key in client.scan_iter(match=f"{self.KEY_PREFIX}:*"):
+                client.delete(redis_key)
+        finally:
+            client.close()
+
+
+class RateLimiter:
+    """Redis limiter with token-bucket fallback, plus block-event bookkeeping."""
+
+    def __init__(self, redis_url: Optional[str], redis_retry_seconds: int):
+        self.redis = RedisSlidingWindowLimiter(redis_url) if redis_url else None
+        self.memory = TokenBucketLimiter()
+        self.redis_retry_seconds = redis_retry_seconds
+        self._redis_down_until = 0.0
+        self._blocked_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._metrics = {'allowed': 0, 'blocked': 0, 'block_events': 0, 'redis_errors': 0}
+
+    @property
+    def backend(self) -> str:
+        """'redis' while Redis is in use, 'memory' while falling back."""
+        if self.redis is not None and time.monotonic() >= self._redis_down_until:
+            return 'redis'
+        return 'memory'
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """Count a request against a policy."""
+        result = None
+        if self.backend == 'redis':
+            try:
+                result = await self.redis.hit(key, policy)
+            except Exception as e:
+                logger.warning(f"Rate limiting falls back to in-process buckets: {e}")
+                with self._lock:
+                    self._metrics['redis_errors'] += 1
+                    self._redis_down_until = time.monotonic() + self.redis_retry_seconds
+        if result is None:
+            result = self.memory.hit(key, policy)
+
+        with self._lock:
+            self._metrics['allowed' if result.allowed else 'blocked'] += 1
+        return result
+
+    async def aclose(self) -> None:
+        """Close the Redis connection pool (app shutdown)."""
+        if self.redis is not None:
+            await self.redis.aclose()
+
+    def start_block(self, key: str, reset_seconds: int) -> bool:
+        """
+        Note that an identity is blocked.
+
+        Returns:
+            True if this starts a new block period (persist it), False if
+            the identity is already known to be blocked
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._blocked_until.get(key, 0) > now:
+                return False
+            if len(self._blocked_until) >= 10000:
+                self._blocked_until = {k: until for k, until in self._blocked_until.items() if until > now}
+            self._blocked_until[key] = now + reset_seconds
+            self._metrics['block_events'] += 1
+            return True
+
+    def reset(self) -> None:
+        """Clear all counters (tests, incident response)."""
+        self.memory.reset()
+        with self._lock:
+            self._blocked_until.clear()
+        if self.backend == 'redis':
+            try:
+                self.redis.reset()
+            except Exception as e:
+                logger.warning(f"Failed to clear Redis rate limit counters: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend in use and allow/block counters."""
+        with self._lock:
+            return {'backend': self.backend, **self._metrics}
+
+
+# Process-wide limiter instance
+rate_limiter = RateLimiter(settings.REDIS_URL, settings.RATE_LIMIT_REDIS_RETRY_SECONDS)
+
+
+def resolve_policy(method: str, path: str, authorization: Optional[str]) -> Tuple[RateLimitPolicy, Optional[str]]:
+    """
+    Pick the policy for a request and the authenticated user, if any.
+
+    The bearer token is only signature-checked here (no database lookup);
+    invalid tokens count as anonymous and are rejected by the endpoint.
+
+    Args:
+        method: HTTP method
+        path: Request path
+        authorization: Authorization header value
+
+    Returns:
+        (policy, user_id or None)
+    """
+    user_id = None
+    role = None
+    if authorization and authorization.lower().startswith("bearer "):
+        try:
+            payload = jwt.decode(authorization[7:], settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+            user_id = payload.get("sub")
+            role = payload.get("role") or 'learner'
+        except JWTError:
+            pass
+
+    route_policy = ROUTE_POLICIES.get((method, path))
+    if route_policy is not None:
+        return route_policy, user_id
+    if user_id is None:
+        return ANONYMOUS_POLICY, None
+    return ROLE_POLICIES.get(role, LEARNER_POLICY), user_id
+
+
+def record_block_event(
+    user_id: Optional[str],
+    ip_address: str,
+    endpoint: str,
+    result: RateLimitResult,
+    policy: RateLimitPolicy
+) -> None:
+    """Persist one rate_limit_entries row for a new block (runs in the threadpool)."""
+    from app.models.database import SessionLocal
+    from app.models.security import RateLimitEntry
+
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        db.add(RateLimitEntry(
+            user_id=user_id,
+            ip_address=None if user_id else ip_address,
+            endpoint=endpoint[:255],
+            request_count=result.count,
+            window_start=now - timedelta(seconds=policy.window_seconds),
+            window_end=now,
+            is_blocked=True,
+            blocked_until=now + timedelta(seconds=result.reset_seconds)
+        ))
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Failed to record rate limit block: {e}")
+    finally:
+        db.close()
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing RateLimitPolicy budgets.
+
+    Adds X-RateLimit-Limit / -Remaining / -Reset headers to responses and
+    answers 429 with Retry-After once a budget is spent.
+    """
+
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = None):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED or scope["path"] in EXEMPT_PATHS \
+                or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        from app.api.dependencies import get_client_ip
+
+        limiter = self.limiter or rate_limiter
+        request = Request(scope)
+        ip_address = get_client_ip(request)
+        policy, user_id = resolve_policy(scope["method"], scope["path"], request.headers.get("Authorization"))
+
+        identity = f"user:{user_id}" if user_id and policy.scope == "principal" else f"ip:{ip_address}"
+        key = f"{policy.name}:{identity}"
+        result = await limiter.hit(key, policy)
+
+        headers = [
+            (b"x-ratelimit-limit", str(result.limit).encode()),
+            (b"x-ratelimit-remaining", str(result.remaining).encode()),
+            (b"x-ratelimit-reset", str(int(time.time()) + result.reset_seconds).encode()),
+        ]
+
+        if not result.allowed:
+            if limiter.start_block(key, result.reset_seconds):
+                await run_in_threadpool(
+                    record_block_event, user_id, ip_address, f"{scope['method']} {scope['path']}", result, policy
+                )
+            body = json.dumps({
+                "detail": f"Too many requests. Retry after {result.reset_seconds} seconds."
+            }).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": headers + [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(result.reset_seconds).encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def reset_rate_limits() -> None:
+    """Clear all rate limit counters and block state."""
+    rate_limiter.reset()
+
+
+def rate_limiter_stats() -> Dict[str, Any]:
+    """Get the limiter backend in use and allow/block counters."""
+    return rate_limiter.stats()
@@ -7,6 +7,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware
 from app.models.database import init_db
 import logging
 
@@ -52,6 +53,14 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}")
 
+    # Write buffered security log events
+    from app.services.audit_log import security_log_writer
+    security_log_writer.close()
+
+    # Close the rate limiter's Redis connection pool
+    from app.core.rate_limit import rate_limiter
+    await rate_limiter.aclose()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -63,6 +72,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Rate limiting (registered before CORS so 429s still carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -9,12 +9,21 @@ This is crucial for Alembic to discover all tables during migrations.
 from app.models.database import Base, get_db, init_db
 
 # Import all models (order matters for foreign key relationships)
-from app.models.user import User, UserProfile
-from app.models.course import Course, KnowledgeArea, Domain
+from app.models.user import User, UserProfile, UserSearchToken
+from app.models.course import Course, KnowledgeArea, Domain, CatalogVersion
 from app.models.question import Question, AnswerChoice
 from app.models.content import ContentChunk, ContentFeedback, ContentEfficacy
-from app.models.learning import Session, QuestionAttempt, UserCompetency, ReadingConsumed
-from app.models.spaced_repetition import SpacedRepetitionCard
+from app.models.learning import (
+    Session,
+    SessionQuestion,
+    QuestionAttempt,
+    UserCompetency,
+    CompetencySnapshot,
+    ReadingConsumed,
+    UserActivityDay,
+    UserCourseSummary
+)
+from app.models.spaced_repetition import SpacedRepetitionCard, ReviewEvent
 from app.models.financial import (
     SubscriptionPlan,
     Subscription,
@@ -37,11 +46,13 @@ __all__ = [
     # User models
     "User",
     "UserProfile",
+    "UserSearchToken",
 
     # Course models
     "Course",
     "KnowledgeArea",
     "Domain",
+    "CatalogVersion",
 
     # Question models
     "Question",
@@ -54,12 +65,17 @@ __all__ = [
 
     # Learning models
     "Session",
+    "SessionQuestion",
     "QuestionAttempt",
     "UserCompetency",
+    "CompetencySnapshot",
     "ReadingConsumed",
+    "UserActivityDay",
+    "UserCourseSummary",
 
     # Spaced Repetition
     "SpacedRepetitionCard",
+    "ReviewEvent",
 
     # Financial models
     "SubscriptionPlan",
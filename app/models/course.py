@@ -1,9 +1,9 @@
 """
-Course models: Course, KnowledgeArea, Domain.
+Course models: Course, KnowledgeArea, Domain, CatalogVersion.
 
 Multi-course platform design (Decision #63, #65).
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Text, DECIMAL, CheckConstraint
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, BigInteger, ForeignKey, Text, DECIMAL, CheckConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
@@ -145,3 +145,21 @@ class Domain(Base):
 
     def __repr__(self):
         return f"<Domain {self.domain_code} - {self.domain_name}>"
+
+
+class CatalogVersion(Base):
+    """
+    Version counter of a course's catalog (course, KAs, domains).
+
+    Bumped in the transaction of every admin change to the catalog; worker
+    processes compare it with their cached copy (app/services/catalog.py).
+    A course without a row is at version 0.
+    """
+    __tablename__ = "catalog_versions"
+
+    course_id = Column(String(36), ForeignKey('courses.course_id', ondelete='CASCADE'), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CatalogVersion {self.course_id} v{self.version}>"
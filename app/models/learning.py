@@ -1,9 +1,10 @@
 """
-Learning models: Session, QuestionAttempt, UserCompetency, ReadingConsumed.
+Learning models: Session, SessionQuestion, QuestionAttempt, UserCompetency, ReadingConsumed,
+UserActivityDay, UserCourseSummary, CompetencySnapshot.
 
 Core models for adaptive learning and progress tracking.
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Text, DECIMAL, CheckConstraint, JSON
+from sqlalchemy import Column, String, Boolean, Date, DateTime, Integer, ForeignKey, Text, DECIMAL, CheckConstraint, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
@@ -49,6 +50,12 @@ class Session(Base):
     user = relationship("User", back_populates="sessions")
     course = relationship("Course")
     question_attempts = relationship("QuestionAttempt", back_populates="session", cascade="all, delete-orphan")
+    session_questions = relationship(
+        "SessionQuestion",
+        back_populates="session",
+        cascade="all, delete-orphan",
+        order_by="SessionQuestion.position"
+    )
 
     # Check Constraints
     __table_args__ = (
@@ -73,6 +80,38 @@ class Session(Base):
         return f"<Session {self.session_id} - {self.session_type} - User {self.user_id}>"
 
 
+class SessionQuestion(Base):
+    """
+    Questions selected for a session, in presentation order.
+
+    Decision #32: The diagnostic set is drawn once at /diagnostic/start and
+    stays fixed for the whole session.
+    """
+    __tablename__ = "session_questions"
+
+    # Primary Key
+    session_question_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    # Foreign Keys
+    session_id = Column(String(36), ForeignKey('sessions.session_id', ondelete='CASCADE'), nullable=False)
+    question_id = Column(String(36), ForeignKey('questions.question_id', ondelete='CASCADE'), nullable=False)
+
+    # Order within the session (1-indexed)
+    position = Column(Integer, nullable=False)
+
+    # Relationships
+    session = relationship("Session", back_populates="session_questions")
+    question = relationship("Question")
+
+    __table_args__ = (
+        Index('idx_session_questions_position', 'session_id', 'position', unique=True),
+        Index('idx_session_questions_question', 'session_id', 'question_id', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<SessionQuestion {self.session_id} #{self.position}>"
+
+
 class QuestionAttempt(Base):
     """
     User attempts at answering questions.
@@ -108,6 +147,13 @@ class QuestionAttempt(Base):
     session = relationship("Session", back_populates="question_attempts")
     selected_choice = relationship("AnswerChoice")
 
+    __table_args__ = (
+        Index('idx_question_attempts_session', 'session_id', 'question_id'),
+    )
+
+    # Fetch attempted_at via INSERT ... RETURNING at flush (no refresh round trip)
+    __mapper_args__ = {"eager_defaults": True}
+
     @property
     def competency_at_attempt(self):
         """Alias for user_competency_at_attempt for schema compatibility."""
@@ -161,6 +207,38 @@ class UserCompetency(Base):
         return f"<UserCompetency {self.competency_id} - Score: {self.competency_score}>"
 
 
+class CompetencySnapshot(Base):
+    """
+    Daily competency score per user and KA.
+
+    Upserted on every competency update, so each row holds the day's
+    closing score and the number of attempts that day. Dashboard trends
+    (30/90/365 days) are read from this series.
+    Decision #13: Progress dashboard with competency tracking
+    """
+    __tablename__ = "competency_snapshots"
+
+    # Primary Key
+    snapshot_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    # Foreign Keys
+    user_id = Column(String(36), ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+    ka_id = Column(String(36), ForeignKey('knowledge_areas.ka_id', ondelete='CASCADE'), nullable=False)
+
+    # Snapshot (UTC calendar day)
+    snapshot_date = Column(Date, nullable=False)
+    competency_score = Column(DECIMAL(5, 2), nullable=False)
+    attempts_count = Column(Integer, nullable=False, default=0)  # Attempts in this KA that day
+
+    __table_args__ = (
+        # Trend range scan and upsert conflict target
+        Index('idx_competency_snapshots_user_date', 'user_id', 'snapshot_date', 'ka_id', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<CompetencySnapshot {self.ka_id} - {self.snapshot_date}: {self.competency_score}>"
+
+
 class ReadingConsumed(Base):
     """
     Tracks which content chunks users have read.
@@ -196,3 +274,74 @@ class ReadingConsumed(Base):
 
     def __repr__(self):
         return f"<ReadingConsumed {self.reading_id} - User {self.user_id}>"
+
+
+class UserActivityDay(Base):
+    """
+    Per-user activity calendar: one row per day with a completed session.
+
+    Updated when sessions complete. Dashboard streaks and study time are
+    read from these rows instead of scanning sessions.
+    Decision #13: Progress dashboard with competency tracking
+    """
+    __tablename__ = "user_activity_days"
+
+    # Primary Key
+    activity_day_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    # Foreign Keys
+    user_id = Column(String(36), ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+
+    # Activity (UTC calendar day)
+    activity_date = Column(Date, nullable=False)
+    sessions_completed = Column(Integer, nullable=False, default=0)
+    study_seconds = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        # One row per user per day; also the upsert conflict target
+        Index('idx_user_activity_days_user_date', 'user_id', 'activity_date', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<UserActivityDay {self.user_id} - {self.activity_date}>"
+
+
+class UserCourseSummary(Base):
+    """
+    Per-user, per-course learning totals for the dashboard.
+
+    Maintained incrementally by the answer-submit and session-complete
+    paths so GET /v1/dashboard reads one row instead of every attempt and
+    session. Rebuilt from sessions and attempts by
+    scripts/rebuild_learning_summaries.py.
+    Decision #13: Progress dashboard with competency tracking
+    """
+    __tablename__ = "user_course_summaries"
+
+    # Primary Key
+    summary_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    # Foreign Keys
+    user_id = Column(String(36), ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+    course_id = Column(String(36), ForeignKey('courses.course_id', ondelete='CASCADE'), nullable=False)
+
+    # Question Attempts
+    total_attempts = Column(Integer, nullable=False, default=0)
+    correct_attempts = Column(Integer, nullable=False, default=0)
+
+    # Completed Sessions
+    sessions_completed = Column(Integer, nullable=False, default=0)
+    diagnostic_completed = Column(Boolean, nullable=False, default=False)
+    last_session_completed_at = Column(DateTime(timezone=True), nullable=True)
+    study_seconds = Column(Integer, nullable=False, default=0)
+
+    # Timestamps
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        # One row per user per course; also the upsert conflict target
+        Index('idx_user_course_summaries_user_course', 'user_id', 'course_id', unique=True),
+    )
+
+    def __repr__(self):
+        return f"<UserCourseSummary {self.user_id} - Course {self.course_id}>"
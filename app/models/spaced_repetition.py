@@ -1,9 +1,9 @@
 """
-Spaced Repetition model: SpacedRepetitionCard.
+Spaced Repetition models: SpacedRepetitionCard, ReviewEvent.
 
 Implements SM-2 algorithm for optimal retention (Decision #31, #32).
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, DECIMAL
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, DECIMAL, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.models.database import Base
@@ -35,7 +35,7 @@ class SpacedRepetitionCard(Base):
     # Review Scheduling
     last_reviewed_at = Column(DateTime(timezone=True), nullable=True)
     next_review_at = Column(DateTime(timezone=True), nullable=False)  # When card is due for review
-    is_due = Column(Boolean, nullable=False, default=True)  # Computed: next_review_at <= now()
+    is_due = Column(Boolean, nullable=False, default=True)  # Legacy flag - queries use next_review_at <= now()
 
     # Performance History
     total_reviews = Column(Integer, nullable=False, default=0)  # Total times reviewed
@@ -50,5 +50,45 @@ class SpacedRepetitionCard(Base):
     user = relationship("User", back_populates="sr_cards")
     question = relationship("Question", back_populates="sr_cards")
 
+    __table_args__ = (
+        # Due queue: WHERE user_id = ? AND next_review_at <= now() ORDER BY next_review_at
+        Index('idx_sr_cards_user_next_review', 'user_id', 'next_review_at'),
+    )
+
     def __repr__(self):
         return f"<SpacedRepetitionCard {self.card_id} - Next review: {self.next_review_at}>"
+
+
+class ReviewEvent(Base):
+    """
+    Append-only log of spaced repetition reviews.
+
+    One row per SM-2 review. Cards only keep last_reviewed_at, so review
+    history (streaks, per-day counts) is read from this table.
+    Decision #31: SR is essential for MVP, not deferred
+    """
+    __tablename__ = "review_events"
+
+    # Primary Key
+    review_event_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    # Foreign Keys
+    user_id = Column(String(36), ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+    card_id = Column(String(36), ForeignKey('spaced_repetition_cards.card_id', ondelete='CASCADE'), nullable=False)
+    question_id = Column(String(36), ForeignKey('questions.question_id', ondelete='CASCADE'), nullable=False)
+
+    # Review Outcome
+    quality_rating = Column(Integer, nullable=False)  # SM-2 quality (0-5)
+    is_successful = Column(Boolean, nullable=False)  # quality >= 3
+    interval_days = Column(Integer, nullable=False)  # Interval scheduled by this review
+
+    # Timestamp
+    reviewed_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        # History queries: WHERE user_id = ? ORDER BY reviewed_at
+        Index('idx_review_events_user_reviewed', 'user_id', 'reviewed_at'),
+    )
+
+    def __repr__(self):
+        return f"<ReviewEvent {self.card_id} - Quality: {self.quality_rating}>"
@@ -3,12 +3,12 @@ User models: User and UserProfile.
 
 Includes field-level encryption for PII (Decision #59).
 """
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Text, DECIMAL, Date
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, ForeignKey, Text, DECIMAL, Date, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.ext.hybrid import hybrid_property
 from app.models.database import Base
-from app.utils.encryption import encrypt_field, decrypt_field
+from app.utils.encryption import encrypt_field, decrypt_field_cached, blind_index, search_token_hashes
 import uuid
 from typing import Optional
 
@@ -26,6 +26,7 @@ class User(Base):
 
     # Authentication (encrypted)
     _email = Column("email", String(255), unique=True, nullable=False)
+    email_hash = Column(String(64), nullable=True)  # Blind index: HMAC-SHA256 of normalized email
     password_hash = Column(String(255), nullable=False)  # Argon2id
 
     # Personal Information (encrypted)
@@ -41,7 +42,7 @@ class User(Base):
 
     # Two-Factor Authentication (Decision #50)
     two_factor_enabled = Column(Boolean, nullable=False, default=False)
-    two_factor_secret = Column(String(32), nullable=True)  # TOTP secret (encrypted)
+    two_factor_secret = Column(String(255), nullable=True)  # TOTP secret (encrypted)
 
     # Bootstrap Security (Decision #79)
     must_change_password = Column(Boolean, nullable=False, default=False)
@@ -65,43 +66,62 @@ class User(Base):
     security_logs = relationship("SecurityLog", foreign_keys="SecurityLog.user_id", back_populates="user")
     admin_security_logs = relationship("SecurityLog", foreign_keys="SecurityLog.admin_user_id", back_populates="admin_user")
     reading_consumed = relationship("ReadingConsumed", back_populates="user", cascade="all, delete-orphan")
+    search_tokens = relationship("UserSearchToken", back_populates="user", cascade="all, delete-orphan")
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_users_email_hash', 'email_hash', unique=True),
+    )
 
     # Hybrid Properties for Encryption (Decision #59)
     @hybrid_property
     def email(self) -> str:
         """Decrypt email when accessed"""
         if isinstance(self._email, str):
-            return decrypt_field(self._email)
+            return decrypt_field_cached(self._email)
         return self._email  # Return column during class-level access
 
     @email.setter
     def email(self, value: str):
-        """Encrypt email when set"""
+        """Encrypt email when set and keep the blind index in sync"""
         self._email = encrypt_field(value)
+        self.email_hash = blind_index(value)
+        self._set_search_tokens('email', value)
 
     @hybrid_property
     def first_name(self) -> str:
         """Decrypt first_name when accessed"""
         if isinstance(self._first_name, str):
-            return decrypt_field(self._first_name)
+            return decrypt_field_cached(self._first_name)
         return self._first_name  # Return column during class-level access
 
     @first_name.setter
     def first_name(self, value: str):
         """Encrypt first_name when set"""
         self._first_name = encrypt_field(value)
+        self._set_search_tokens('first_name', value)
 
     @hybrid_property
     def last_name(self) -> str:
         """Decrypt last_name when accessed"""
         if isinstance(self._last_name, str):
-            return decrypt_field(self._last_name)
+            return decrypt_field_cached(self._last_name)
         return self._last_name  # Return column during class-level access
 
     @last_name.setter
     def last_name(self, value: str):
         """Encrypt last_name when set"""
         self._last_name = encrypt_field(value)
+        self._set_search_tokens('last_name', value)
+
+    def _set_search_tokens(self, field: str, value: str):
+        """Replace the blind search tokens for one PII field (admin user search)"""
+        tokens = [token for token in self.search_tokens if token.field != field]
+        tokens.extend(
+            UserSearchToken(field=field, token_hash=token_hash)
+            for token_hash in search_token_hashes(field, value)
+        )
+        self.search_tokens = tokens
 
     @property
     def full_name(self) -> str:
@@ -112,6 +132,39 @@ class User(Base):
         return f"<User {self.user_id} - {self.email}>"
 
 
+class UserSearchToken(Base):
+    """
+    Blind search tokens for encrypted user PII.
+
+    Keyed hashes of trigrams/prefixes of email, first_name and last_name,
+    written by the User hybrid-property setters. Lets admin search run as an
+    indexed SQL join without decrypting (Decision #59).
+    """
+    __tablename__ = "user_search_tokens"
+
+    # Primary Key
+    token_id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+
+    # Foreign Key
+    user_id = Column(String(36), ForeignKey('users.user_id', ondelete='CASCADE'), nullable=False)
+
+    # Token
+    field = Column(String(20), nullable=False)  # 'email' | 'first_name' | 'last_name'
+    token_hash = Column(String(64), nullable=False)  # HMAC-SHA256 of field-namespaced gram
+
+    # Relationships
+    user = relationship("User", back_populates="search_tokens")
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_user_search_tokens_hash', 'token_hash', 'user_id'),
+        Index('idx_user_search_tokens_user', 'user_id', 'field'),
+    )
+
+    def __repr__(self):
+        return f"<UserSearchToken {self.token_id} - User {self.user_id} - {self.field}>"
+
+
 class UserProfile(Base):
     """
     Extended user information from onboarding.
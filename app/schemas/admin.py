@@ -79,6 +79,75 @@ class AdminMetricsOverviewResponse(BaseModel):
     courses: MetricsCourses
 
 
+class PasswordHashOperationMetrics(BaseModel):
+    """Hash latency of one auth endpoint."""
+    count: int
+    avg_wait_ms: float = Field(description="Average time queued for a hashing slot")
+    avg_hash_ms: float
+    max_hash_ms: float
+
+
+class PasswordHashingMetrics(BaseModel):
+    """Password hash pool load for this worker."""
+    max_concurrent: int
+    in_flight: int
+    waiting: int = Field(description="Requests currently queued for a slot")
+    rejected: int = Field(description="Requests shed with 429 (queue full)")
+    timed_out: int = Field(description="Requests shed with 503 (queue wait timed out)")
+    operations: Dict[str, PasswordHashOperationMetrics]
+
+
+class DecryptionCacheMetrics(BaseModel):
+    """PII decryption cache counters for this worker."""
+    hits: int
+    misses: int
+    hit_rate: float
+    size: int
+    max_entries: int
+
+
+class SecurityLogWriterMetrics(BaseModel):
+    """Buffered security audit log writer load for this worker."""
+    queue_depth: int
+    max_queue_size: int
+    max_queue_depth: int = Field(description="Highest queue depth seen")
+    enqueued: int
+    written: int
+    batches: int
+    sync_writes: int = Field(description="Events committed by their caller (admin actions, overflow)")
+    overflow_sync_writes: int = Field(description="Events written synchronously because the queue was full")
+    dropped: int = Field(description="Buffered events lost to failed flushes")
+    flush_failures: int
+    last_flush_ms: float
+
+
+class RateLimiterMetrics(BaseModel):
+    """Request rate limiter state for this worker."""
+    backend: str = Field(description="'redis' or 'memory' (in-process fallback)")
+    allowed: int
+    blocked: int = Field(description="Requests answered with 429")
+    block_events: int = Field(description="Block periods recorded in rate_limit_entries")
+    redis_errors: int = Field(description="Redis failures that switched to the fallback")
+
+
+class LoginThrottleMetrics(BaseModel):
+    """Failed-login backoff/lockout state for this worker."""
+    tracked_sources: int = Field(description="Accounts and IPs with recent failures")
+    blocked_sources: int = Field(description="Accounts and IPs currently backing off or locked out")
+    failures: int
+    throttled: int = Field(description="Login attempts refused before password verification")
+    lockouts: int
+
+
+class AdminRuntimeMetricsResponse(BaseModel):
+    """Response for GET /v1/admin/metrics/runtime."""
+    password_hashing: PasswordHashingMetrics
+    pii_decryption_cache: DecryptionCacheMetrics
+    security_log_writer: SecurityLogWriterMetrics
+    rate_limiter: RateLimiterMetrics
+    login_throttle: LoginThrottleMetrics
+
+
 # ============================================================================
 # Course Management Schemas
 # ============================================================================
@@ -61,6 +61,7 @@ class TokenData(BaseModel):
     role: str
     exp: Optional[int] = None  # Expiration timestamp
     iat: Optional[int] = None  # Issued at timestamp
+    token_type: Optional[str] = None  # "refresh" for refresh tokens, None for access tokens
 
 
 class RefreshTokenRequest(BaseModel):
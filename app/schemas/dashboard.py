@@ -55,7 +55,7 @@ class CompetencyDetailResponse(BaseModel):
     incorrect_count: int
     accuracy_percentage: float
 
-    # Trend data (last 30 days)
+    # Daily trend data (last trend_days days)
     trend: List[CompetencyTrendPoint]
 
     # Practice recommendations
@@ -153,6 +153,7 @@ class CompetenciesDetailResponse(BaseModel):
 
     # Overall trend
     overall_trend_direction: str  # 'improving', 'stable', 'declining'
+    trend_days: int = 30  # Trend window: 30, 90 or 365 days
     last_updated_at: datetime
 
 
@@ -214,3 +215,18 @@ class ExamReadinessResponse(BaseModel):
     # Recommendations
     recommendation: str
     next_steps: List[str]  # Action items for user
+
+
+class DashboardBundleResponse(BaseModel):
+    """
+    Several dashboard payloads computed in one request.
+
+    Each section matches the response of its own endpoint; sections that
+    weren't requested are null.
+    """
+    user_id: UUID
+
+    overview: Optional[DashboardOverviewResponse] = None
+    competencies: Optional[CompetenciesDetailResponse] = None
+    recent: Optional[RecentActivityResponse] = None
+    exam_readiness: Optional[ExamReadinessResponse] = None
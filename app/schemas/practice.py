@@ -63,6 +63,7 @@ class PracticeSubmitRequest(BaseModel):
     question_id: UUID
     selected_choice_id: UUID
     time_spent_seconds: Optional[int] = Field(None, ge=0)
+    include_next_question: bool = False  # Return the next adaptive question in the response
 
 
 class PracticeSubmitResponse(BaseSchema):
@@ -92,6 +93,9 @@ class PracticeSubmitResponse(BaseSchema):
     session_accuracy: float  # Current session accuracy (0-100)
     attempted_at: datetime
 
+    # Next question (only when include_next_question was requested and questions remain)
+    next_question: Optional[PracticeQuestionResponse] = None
+
 
 class PracticeSessionResponse(BaseSchema):
     """
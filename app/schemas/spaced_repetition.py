@@ -118,6 +118,7 @@ class ReviewStatsResponse(BaseSchema):
     total_reviews_completed: int
     average_success_rate: float  # 0-100
     current_streak_days: int  # Consecutive days with reviews
+    longest_streak_days: int = 0
 
     # Recommendations
     daily_review_target: int  # Recommended reviews per day
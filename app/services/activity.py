@@ -0,0 +1,107 @@
+"""
+Activity calendar service.
+
+Decision #13: Progress dashboard with competency tracking.
+
+Keeps one user_activity_days row per user per UTC day with a completed
+session. Completion paths call record_session_completed in the same
+transaction that marks the session complete; dashboard streaks and study
+time are then derived from the user's active days only (O(days-active)),
+never from per-day queries or a scan of every session.
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Optional
+import uuid
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.learning import Session as LearningSession, UserActivityDay
+
+
+def record_session_completed(db: Session, session: LearningSession) -> None:
+    """
+    Add a completed session to the user's activity calendar.
+
+    Upserts the row for the session's completion day (UTC), incrementing
+    the session count and study time. Does not commit: call it in the
+    transaction that marks the session complete, once per completion.
+
+    Args:
+        db: Database session
+        session: Session that was just marked complete
+    """
+    completed_at = session.completed_at or datetime.now(timezone.utc)
+    study_seconds = session.duration_seconds or 0
+
+    stmt = insert(UserActivityDay).values(
+        activity_day_id=str(uuid.uuid4()),
+        user_id=str(session.user_id),
+        activity_date=completed_at.astimezone(timezone.utc).date(),
+        sessions_completed=1,
+        study_seconds=study_seconds
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserActivityDay.user_id, UserActivityDay.activity_date],
+        set_={
+            'sessions_completed': UserActivityDay.sessions_completed + 1,
+            'study_seconds': UserActivityDay.study_seconds + stmt.excluded.study_seconds
+        }
+    )
+    db.execute(stmt)
+
+
+def get_activity_summary(db: Session, user_id: uuid.UUID, today: Optional[date] = None) -> Dict:
+    """
+    Get streaks and study time from the user's activity calendar.
+
+    Reads the user's active days (newest first) in one query and walks them
+    once. The current streak is the run of consecutive days ending at the
+    last active day, and counts only if that day is today or yesterday.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        today: Current UTC date (defaults to now)
+
+    Returns:
+        Dict with current_streak_days, longest_streak_days,
+        total_study_minutes and last_active_date
+    """
+    today = today or datetime.now(timezone.utc).date()
+
+    rows = db.query(
+        UserActivityDay.activity_date,
+        UserActivityDay.study_seconds
+    ).filter(
+        UserActivityDay.user_id == str(user_id)
+    ).order_by(UserActivityDay.activity_date.desc()).all()
+
+    latest_run = None  # Run ending at the last active day
+    longest_run = 0
+    run = 0
+    previous_day = None
+    total_seconds = 0
+
+    for activity_date, study_seconds in rows:
+        total_seconds += study_seconds
+        if previous_day is not None and previous_day - activity_date != timedelta(days=1):
+            if latest_run is None:
+                latest_run = run
+            run = 0
+        run += 1
+        longest_run = max(longest_run, run)
+        previous_day = activity_date
+
+    if latest_run is None:
+        latest_run = run
+
+    last_active_date = rows[0].activity_date if rows else None
+    is_current = last_active_date is not None and today - last_active_date <= timedelta(days=1)
+
+    return {
+        'current_streak_days': latest_run if is_current else 0,
+        'longest_streak_days': longest_run,
+        'total_study_minutes': total_seconds // 60,
+        'last_active_date': last_active_date
+    }
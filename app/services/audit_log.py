@@ -0,0 +1,281 @@
+"""
+Buffered security audit log writer.
+
+Decision #41: Immutable security audit log.
+
+High-volume authentication events (logins, failed logins, registrations)
+are queued in a bounded in-process buffer and written by a background
+thread with multi-row INSERTs, flushed when SECURITY_LOG_BATCH_SIZE rows
+are waiting or every SECURITY_LOG_FLUSH_INTERVAL_SECONDS. A login then
+costs no extra transaction, and a credential-stuffing burst becomes a few
+batched inserts instead of one commit per attempt.
+
+Admin actions are written synchronously in the caller's transaction
+(durable before the response). When the buffer is full, events fall back
+to a synchronous write too, so overload slows callers down instead of
+losing audit rows.
+
+A batch INSERT that fails is retried in halves, so a bad row (e.g. an FK
+violation) only drops itself; dropped rows are logged and counted.
+Buffered rows are lost if the process dies before a flush; the app
+flushes on shutdown.
+"""
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+import logging
+import queue
+import threading
+import time
+import uuid
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.security import SecurityLog
+
+logger = logging.getLogger(__name__)
+
+
+class SecurityLogWriter:
+    """Bounded queue of security_logs rows with a background batch flusher."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        max_queue_size: int,
+        batch_size: int,
+        flush_interval_seconds: float
+    ):
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self._session_factory = session_factory
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max(max_queue_size, 1))
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'sync_writes': 0,
+            'overflow_sync_writes': 0,
+            'dropped': 0,
+            'flush_failures': 0,
+            'max_queue_depth': 0,
+            'last_flush_ms': 0.0
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Whether events are buffered at all (queue size non-zero)."""
+        return self.max_queue_size > 0
+
+    def enqueue(self, row: Dict[str, Any]) -> bool:
+        """
+        Queue a row for the next batch.
+
+        Args:
+            row: Column values for security_logs
+
+        Returns:
+            True if queued, False if the buffer is full (caller must write it)
+        """
+        if not self.enabled:
+            return False
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self._metrics['overflow_sync_writes'] += 1
+            return False
+
+        depth = self._queue.qsize()
+        with self._lock:
+            self._metrics['enqueued'] += 1
+            self._metrics['max_queue_depth'] = max(self._metrics['max_queue_depth'], depth)
+        if depth >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def record_sync_write(self) -> None:
+        """Count an event written synchronously by its caller."""
+        with self._lock:
+            self._metrics['sync_writes'] += 1
+
+    def flush(self) -> int:
+        """
+        Write all queued rows now, batch_size rows per INSERT.
+
+        Returns:
+            Number of rows written
+        """
+        with self._flush_lock:
+            rows: List[Dict[str, Any]] = []
+            while True:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not rows:
+                return 0
+
+            started = time.monotonic()
+            written = 0
+            db = self._session_factory()
+            try:
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start:start + self.batch_size]
+                    try:
+                        self._insert(db, batch)
+                        written += len(batch)
+                    except Exception as exc:
+                        db.rollback()
+                        logger.warning(
+                            "Failed to write %d buffered security log rows, retrying in halves: %s", len(batch), exc
+                        )
+                        with self._lock:
+                            self._metrics['flush_failures'] += 1
+                        written += self._write_bisected(db, batch, exc)
+            finally:
+                db.close()
+
+            with self._lock:
+                self._metrics['written'] += written
+                self._metrics['last_flush_ms'] = round((time.monotonic() - started) * 1000, 2)
+            return written
+
+    def _insert(self, db: Session, rows: List[Dict[str, Any]]) -> None:
+        """Write rows with one multi-row INSERT and commit."""
+        db.execute(insert(SecurityLog).values(rows))
+        db.commit()
+        with self._lock:
+            self._metrics['batches'] += 1
+
+    def _write_bisected(self, db: Session, rows: List[Dict[str, Any]], error: Exception) -> int:
+        """
+        Retry failed rows in halves until only rows that can't be inserted are left.
+
+        Args:
+            db: Database session (rolled back)
+            rows: Rows whose INSERT failed
+            error: Error of that INSERT (logged when a single row is dropped)
+
+        Returns:
+            Number of rows written
+        """
+        if len(rows) == 1:
+            row = rows[0]
+            logger.error(
+                "Dropped security log row %s (%s, user %s): %s",
+                row.get('log_id'), row.get('event_type'), row.get('user_id'), error
+            )
+            with self._lock:
+                self._metrics['dropped'] += 1
+            return 0
+
+        written = 0
+        middle = len(rows) // 2
+        for half in (rows[:middle], rows[middle:]):
+            try:
+                self._insert(db, half)
+                written += len(half)
+            except Exception as exc:
+                db.rollback()
+                written += self._write_bisected(db, half, exc)
+        return written
+
+    def close(self) -> None:
+        """Stop the flusher thread after writing everything still queued."""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is not None:
+            self._stop.set()
+            self._wakeup.set()
+            thread.join(timeout=max(self.flush_interval_seconds * 5, 5))
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, throughput and backpressure counters."""
+        with self._lock:
+            return {
+                **self._metrics,
+                'queue_depth': self._queue.qsize(),
+                'max_queue_size': self.max_queue_size
+            }
+
+    def _ensure_started(self) -> None:
+        """Start the flusher thread on first use (again after close)."""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="security-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Flush on the size trigger (wakeup) or the time trigger, until closed."""
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            self.flush()
+
+
+# Process-wide writer instance
+security_log_writer = SecurityLogWriter(
+    session_factory=SessionLocal,
+    max_queue_size=settings.SECURITY_LOG_QUEUE_SIZE,
+    batch_size=settings.SECURITY_LOG_BATCH_SIZE,
+    flush_interval_seconds=settings.SECURITY_LOG_FLUSH_INTERVAL_SECONDS
+)
+
+
+def write_security_log(db: Session, values: Dict[str, Any], sync: bool = False) -> Optional[SecurityLog]:
+    """
+    Record a security_logs row, buffered or synchronously.
+
+    The event time is taken now, not at flush time.
+
+    Args:
+        db: Caller's database session (used for synchronous writes)
+        values: SecurityLog column values
+        sync: Commit the row in the caller's session before returning
+
+    Returns:
+        The committed SecurityLog for synchronous writes, None when buffered
+    """
+    row = {
+        'log_id': str(uuid.uuid4()),
+        'occurred_at': datetime.now(timezone.utc),
+        **values
+    }
+
+    if not sync and security_log_writer.enqueue(row):
+        return None
+
+    log_entry = SecurityLog(**row)
+    db.add(log_entry)
+    db.commit()
+    db.refresh(log_entry)
+    security_log_writer.record_sync_write()
+    return log_entry
+
+
+def flush_security_logs() -> int:
+    """Write buffered security log rows now (shutdown, tests)."""
+    return security_log_writer.flush()
+
+
+def security_log_writer_stats() -> Dict[str, Any]:
+    """Get queue depth, throughput and backpressure counters of the writer."""
+    return security_log_writer.stats()
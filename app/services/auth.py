@@ -5,15 +5,21 @@ Handles user authentication, JWT tokens, password management.
 Decision #53: Argon2id password hashing, JWT authentication.
 """
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 from fastapi import HTTPException, status
 from app.models.user import User
 from app.models.security import SecurityLog
 from app.schemas.auth import TokenData
 from app.core.config import settings
-from app.utils.security import verify_password, get_password_hash
+from app.utils.security import hash_password_limited, verify_password_limited
+from app.services.user import get_user_by_email
+from app.services.audit_log import write_security_log
+from app.services.login_throttle import login_account_key, login_throttle
+import threading
+import time
 import uuid
 
 
@@ -22,10 +28,10 @@ def authenticate_user(db: Session, email: str, password: str, ip_address: Option
     Authenticate user with email and password.
 
     Decision #53: Argon2id password verification.
-
-    NOTE: Due to non-deterministic Fernet encryption, we cannot directly query
-    by encrypted email. Instead, we query all users and decrypt to find match.
-    For production, consider using deterministic encryption or email hash for lookup.
+    Decision #59: Email is looked up through its blind index (email_hash),
+    so no PII is decrypted to find the account.
+    Decision #52: Accounts and IPs with repeated failures are refused with
+    429 before the user lookup and Argon2 verification (login_throttle).
 
     Args:
         db: Database session
@@ -35,25 +41,30 @@ def authenticate_user(db: Session, email: str, password: str, ip_address: Option
 
     Returns:
         User if authentication successful, None otherwise
+
+    Raises:
+        HTTPException: 429 if the account or IP is backing off / locked out
     """
-    from app.utils.encryption import decrypt_field
-
-    # Query all users and decrypt emails to find match
-    # NOTE: This is inefficient but necessary with non-deterministic Fernet encryption
-    all_users = db.query(User).all()
-
-    user = None
-    for u in all_users:
-        try:
-            decrypted_email = decrypt_field(u._email)
-            if decrypted_email.lower() == email.lower():
-                user = u
-                break
-        except Exception:
-            # Skip users with decryption errors
-            continue
+    account_key = login_account_key(email)
+    retry_after = login_throttle.retry_after(account_key, ip_address)
+    if retry_after:
+        log_security_event(
+            db=db,
+            event_type="failed_login",
+            success=False,
+            failure_reason="Throttled",
+            ip_address=ip_address
+        )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many failed login attempts. Try again in {retry_after} seconds.",
+            headers={"Retry-After": str(retry_after)}
+        )
+
+    user = get_user_by_email(db, email)
 
     if not user:
+        login_throttle.record_failure(account_key, ip_address)
         # Log failed login attempt
         log_security_event(
             db=db,
@@ -65,7 +76,8 @@ def authenticate_user(db: Session, email: str, password: str, ip_address: Option
         return None
     
     # Verify password
-    if not verify_password(password, user.password_hash):
+    if not verify_password_limited(password, user.password_hash, "login"):
+        login_throttle.record_failure(account_key, ip_address)
         # Log failed login attempt
         log_security_event(
             db=db,
@@ -93,6 +105,8 @@ def authenticate_user(db: Session, email: str, password: str, ip_address: Option
             detail="Account is inactive. Please contact support."
         )
     
+    login_throttle.record_success(account_key)
+
     # Log successful login
     log_security_event(
         db=db,
@@ -220,7 +234,8 @@ def verify_token(token: str) -> TokenData:
             email=email,
             role=role if role else "learner",
             exp=payload.get("exp"),
-            iat=payload.get("iat")
+            iat=payload.get("iat"),
+            token_type=payload.get("type")
         )
         return token_data
 
@@ -260,6 +275,177 @@ def get_current_user(db: Session, token: str) -> User:
     return user
 
 
+class Principal:
+    """
+    Authenticated caller of a learner endpoint.
+
+    Holds only what authorization needs, so resolving it doesn't load the
+    full (encrypted) User row.
+    """
+
+    __slots__ = ("user_id", "role", "is_active", "must_change_password")
+
+    def __init__(self, user_id: str, role: str, is_active: bool, must_change_password: bool):
+        self.user_id = user_id
+        self.role = role
+        self.is_active = is_active
+        self.must_change_password = must_change_password
+
+
+class PrincipalCache:
+    """
+    Thread-safe, short-TTL cache of principals keyed by user_id.
+
+    Invalidation is per worker: the worker committing a role, status or
+    password change drops its entry at once, other workers keep serving
+    theirs until it expires, so revocation elsewhere is bounded by
+    PRINCIPAL_CACHE_TTL_SECONDS rather than immediate. A TTL of 0 disables
+    caching. Expired entries are pruned once the cache
+    grows past max_entries.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Principal]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id) -> Optional[Principal]:
+        """Get a cached principal, or None if missing or expired."""
+        if self.ttl_seconds <= 0:
+            return None
+        entry = self._entries.get(str(user_id))
+        if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+            return None
+        return entry[1]
+
+    def set(self, principal: Principal) -> None:
+        """Store a principal."""
+        if self.ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {
+                    key: entry for key, entry in self._entries.items()
+                    if now - entry[0] < self.ttl_seconds
+                }
+            self._entries[principal.user_id] = (now, principal)
+
+    def invalidate(self, user_id=None) -> None:
+        """
+        Drop cached principals.
+
+        Args:
+            user_id: User to invalidate, or None for all users
+        """
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(user_id), None)
+
+
+# Process-wide principal cache
+principal_cache = PrincipalCache(ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
+
+def invalidate_principal(user_id=None) -> None:
+    """
+    Invalidate cached principals after a user's role, status or password changes.
+
+    Changes made through the User model are invalidated automatically when
+    their transaction commits; call this after raw SQL updates. Only this
+    worker's cache is cleared; other workers pick up the change when their
+    entry expires (PRINCIPAL_CACHE_TTL_SECONDS).
+
+    Args:
+        user_id: User that changed, or None for all users
+    """
+    principal_cache.invalidate(user_id)
+
+
+def get_current_principal(db: Session, token: str) -> Principal:
+    """
+    Get the caller of a learner endpoint from a JWT token.
+
+    With AUTH_TRUST_TOKEN_CLAIMS the signed claims of an access token are
+    trusted until it expires and no database lookup happens; refresh tokens
+    live for days, so they never skip the lookup. Otherwise the user's role
+    and status come from the principal cache, loaded with a single-row
+    column query on a miss.
+
+    Args:
+        db: Database session
+        token: JWT access token
+
+    Returns:
+        Principal
+
+    Raises:
+        HTTPException: If token invalid, user not found or inactive
+    """
+    token_data = verify_token(token)
+    user_id = str(token_data.user_id)
+
+    if settings.AUTH_TRUST_TOKEN_CLAIMS and token_data.token_type != "refresh":
+        # Access tokens are only issued to active users that don't have to
+        # change their password (login checks both)
+        return Principal(user_id, token_data.role, True, False)
+
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        row = db.query(
+            User.role, User.is_active, User.must_change_password
+        ).filter(User.user_id == user_id).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found"
+            )
+        principal = Principal(user_id, row.role, row.is_active, row.must_change_password)
+        principal_cache.set(principal)
+
+    if not principal.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Inactive user"
+        )
+
+    return principal
+
+
+_PRINCIPALS_CHANGED = "changed_principal_user_ids"
+
+
+def _mark_principal_changed(target: User) -> None:
+    """Remember a user whose principal must be dropped when the transaction commits."""
+    session = object_session(target)
+    if session is not None and target.user_id is not None:
+        session.info.setdefault(_PRINCIPALS_CHANGED, set()).add(str(target.user_id))
+
+
+for _attribute in (User.role, User.is_active, User.must_change_password, User.password_hash):
+    event.listen(
+        _attribute, "set",
+        lambda target, value, oldvalue, initiator: _mark_principal_changed(target)
+    )
+event.listen(User, "after_delete", lambda mapper, connection, target: _mark_principal_changed(target))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session: Session) -> None:
+    """Drop cached principals of users changed in the committed transaction."""
+    for user_id in session.info.pop(_PRINCIPALS_CHANGED, ()):
+        principal_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_principals(session: Session) -> None:
+    """Changes were rolled back, so cached principals are still valid."""
+    session.info.pop(_PRINCIPALS_CHANGED, None)
+
+
 def log_security_event(
     db: Session,
     event_type: str,
@@ -269,12 +455,17 @@ def log_security_event(
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
     failure_reason: Optional[str] = None,
-    event_metadata: Optional[Dict[str, Any]] = None
-) -> SecurityLog:
+    event_metadata: Optional[Dict[str, Any]] = None,
+    sync: bool = False
+) -> Optional[SecurityLog]:
     """
     Log security event to audit trail.
     
     Decision #41: Immutable security audit log.
+
+    Events are buffered and written in batches (app/services/audit_log.py)
+    unless sync is set or an admin performed the action; those are
+    committed before this returns.
     
     Args:
         db: Database session
@@ -286,27 +477,26 @@ def log_security_event(
         user_agent: Client user agent
         failure_reason: Reason for failure (if applicable)
         event_metadata: Additional event data
+        sync: Write durably before returning (admin actions always are)
         
     Returns:
-        Created SecurityLog entry
+        Created SecurityLog entry, or None if the event was buffered
     """
-    log_entry = SecurityLog(
-        user_id=user_id,
-        admin_user_id=admin_user_id,
-        event_type=event_type,
-        event_category='authentication',
-        ip_address=ip_address,
-        user_agent=user_agent,
-        success=success,
-        failure_reason=failure_reason,
-        event_metadata=event_metadata
+    return write_security_log(
+        db,
+        {
+            'user_id': str(user_id) if user_id is not None else None,
+            'admin_user_id': str(admin_user_id) if admin_user_id is not None else None,
+            'event_type': event_type,
+            'event_category': 'authentication',
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'success': success,
+            'failure_reason': failure_reason,
+            'event_metadata': event_metadata
+        },
+        sync=sync or admin_user_id is not None
     )
-    
-    db.add(log_entry)
-    db.commit()
-    db.refresh(log_entry)
-    
-    return log_entry
 
 
 def change_password(db: Session, user: User, current_password: str, new_password: str) -> bool:
@@ -328,14 +518,14 @@ def change_password(db: Session, user: User, current_password: str, new_password
         HTTPException: If current password is incorrect
     """
     # Verify current password
-    if not verify_password(current_password, user.password_hash):
+    if not verify_password_limited(current_password, user.password_hash, "change_password"):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Hash new password
-    user.password_hash = get_password_hash(new_password)
+    user.password_hash = hash_password_limited(new_password, "change_password")
     
     # Clear must_change_password flag if set
     if user.must_change_password:
@@ -348,7 +538,8 @@ def change_password(db: Session, user: User, current_password: str, new_password
         db=db,
         event_type="password_changed",
         success=True,
-        user_id=str(user.user_id)
+        user_id=str(user.user_id),
+        sync=True
     )
     
     return True
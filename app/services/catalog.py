@@ -0,0 +1,390 @@
+"""
+Course catalog cache.
+
+Process-local, versioned snapshots of each course's catalog: the course,
+its knowledge areas (codes, names, weights; Decision #63) and their
+domains. Request paths that only need KA names, codes or weights read the
+snapshot instead of querying knowledge_areas once per competency, card or
+question.
+
+Admin changes to a course's KAs or status bump the course's row in
+catalog_versions in the same transaction (bump_catalog_version) and drop
+the local copy after commit (invalidate_catalog). Other workers re-check the
+version of a cached course at most every CATALOG_VERSION_CHECK_SECONDS with
+a primary-key lookup and reload when it moved.
+
+Snapshots hold plain values, never ORM instances, so they can be shared
+across sessions and threads.
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.models.course import CatalogVersion, Course, Domain, KnowledgeArea
+
+
+class CatalogDomain:
+    """Domain within a knowledge area."""
+
+    __slots__ = ("domain_id", "ka_id", "domain_code", "domain_name", "domain_number")
+
+    def __init__(self, domain_id: str, ka_id: str, domain_code: str, domain_name: str, domain_number: int):
+        self.domain_id = domain_id
+        self.ka_id = ka_id
+        self.domain_code = domain_code
+        self.domain_name = domain_name
+        self.domain_number = domain_number
+
+
+class CatalogKnowledgeArea:
+    """Knowledge area with its domains (attribute-compatible with KnowledgeArea)."""
+
+    __slots__ = (
+        "ka_id", "course_id", "ka_code", "ka_name", "ka_number",
+        "description", "weight_percentage", "domains"
+    )
+
+    def __init__(
+        self,
+        ka_id: str,
+        course_id: str,
+        ka_code: str,
+        ka_name: str,
+        ka_number: int,
+        description: Optional[str],
+        weight_percentage: Decimal,
+        domains: Tuple[CatalogDomain, ...]
+    ):
+        self.ka_id = ka_id
+        self.course_id = course_id
+        self.ka_code = ka_code
+        self.ka_name = ka_name
+        self.ka_number = ka_number
+        self.description = description
+        self.weight_percentage = weight_percentage
+        self.domains = domains
+
+
+class CourseCatalog:
+    """Snapshot of one course's catalog at a catalog version."""
+
+    __slots__ = (
+        "course_id", "course_code", "course_name", "status", "passing_score_percentage",
+        "knowledge_areas", "ka_weights", "version", "checked_at", "loaded_at",
+        "_by_id", "_by_code", "_domains_by_code"
+    )
+
+    def __init__(
+        self,
+        course_id: str,
+        course_code: str,
+        course_name: str,
+        status: str,
+        passing_score_percentage: int,
+        knowledge_areas: Tuple[CatalogKnowledgeArea, ...],
+        version: int,
+        checked_at: float
+    ):
+        self.course_id = course_id
+        self.course_code = course_code
+        self.course_name = course_name
+        self.status = status
+        self.passing_score_percentage = passing_score_percentage
+        self.knowledge_areas = knowledge_areas
+        self.version = version
+        self.checked_at = checked_at
+        self.loaded_at = checked_at
+
+        self._by_id = {ka.ka_id: ka for ka in knowledge_areas}
+        self._by_code = {ka.ka_code: ka for ka in knowledge_areas}
+        self._domains_by_code = {
+            domain.domain_code: domain for ka in knowledge_areas for domain in ka.domains
+        }
+        self.ka_weights: Dict[str, Decimal] = {ka.ka_id: ka.weight_percentage for ka in knowledge_areas}
+
+    @property
+    def ka_ids(self) -> Tuple[str, ...]:
+        """KA IDs in display order."""
+        return tuple(ka.ka_id for ka in self.knowledge_areas)
+
+    def ka(self, ka_id) -> Optional[CatalogKnowledgeArea]:
+        """Get a KA of this course by ID."""
+        return self._by_id.get(str(ka_id))
+
+    def ka_by_code(self, ka_code: str) -> Optional[CatalogKnowledgeArea]:
+        """Get a KA of this course by code."""
+        return self._by_code.get(ka_code)
+
+    def domain_by_code(self, domain_code: str) -> Optional[CatalogDomain]:
+        """Get a domain of this course by code."""
+        return self._domains_by_code.get(domain_code)
+
+
+class CatalogCache:
+    """
+    Thread-safe cache of CourseCatalog snapshots keyed by course_id.
+
+    Snapshots are reloaded when the course's catalog version moves, and in
+    any case after max_age_seconds, so writers that don't bump the version
+    (seed scripts, manual SQL) are picked up eventually.
+    """
+
+    def __init__(self, check_seconds: int, max_age_seconds: int = 0):
+        self.check_seconds = check_seconds
+        self.max_age_seconds = max_age_seconds
+        self._courses: Dict[str, CourseCatalog] = {}
+        self._ka_courses: Dict[str, str] = {}  # ka_id -> course_id of loaded catalogs
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, course_id) -> Optional[CourseCatalog]:
+        """
+        Get a course's catalog, loading it on first use, after a version bump
+        or once it is older than max_age_seconds.
+
+        Args:
+            db: Database session
+            course_id: Course ID
+
+        Returns:
+            CourseCatalog snapshot, or None if the course doesn't exist
+        """
+        course_id = str(course_id)
+        catalog = self._courses.get(course_id)
+        now = time.monotonic()
+
+        if catalog is not None and self.max_age_seconds and now - catalog.loaded_at >= self.max_age_seconds:
+            catalog = None  # max-age backstop
+
+        if catalog is not None:
+            if now - catalog.checked_at < self.check_seconds:
+                return catalog
+            if current_catalog_version(db, course_id) == catalog.version:
+                catalog.checked_at = now
+                return catalog
+
+        catalog = self._load(db, course_id)
+        with self._lock:
+            self._drop(course_id)
+            if catalog is not None:
+                self._courses[course_id] = catalog
+                for ka_id in catalog._by_id:
+                    self._ka_courses[ka_id] = course_id
+        return catalog
+
+    def course_of(self, db: Session, ka_ids: Iterable[str]) -> Dict[str, str]:
+        """
+        Map KA IDs to their course IDs.
+
+        KAs of loaded catalogs are resolved in memory; the rest with one query.
+
+        Args:
+            db: Database session
+            ka_ids: KA IDs
+
+        Returns:
+            Dict of ka_id to course_id (unknown KAs are omitted)
+        """
+        courses = {}
+        missing = []
+        for ka_id in {str(ka_id) for ka_id in ka_ids}:
+            course_id = self._ka_courses.get(ka_id)
+            if course_id is None:
+                missing.append(ka_id)
+            else:
+                courses[ka_id] = course_id
+
+        if missing:
+            rows = db.query(KnowledgeArea.ka_id, KnowledgeArea.course_id).filter(
+                KnowledgeArea.ka_id.in_(missing)
+            ).all()
+            courses.update({str(ka_id): str(course_id) for ka_id, course_id in rows})
+        return courses
+
+    def invalidate(self, course_id=None) -> None:
+        """
+        Drop cached catalogs so they are reloaded on next access.
+
+        Args:
+            course_id: Course to invalidate, or None for all courses
+        """
+        with self._lock:
+            if course_id is None:
+                self._courses.clear()
+                self._ka_courses.clear()
+            else:
+                self._drop(str(course_id))
+
+    def _drop(self, course_id: str) -> None:
+        """Remove a course and its KA index entries (caller holds the lock)."""
+        catalog = self._courses.pop(course_id, None)
+        if catalog is not None:
+            for ka_id in catalog._by_id:
+                self._ka_courses.pop(ka_id, None)
+
+    @staticmethod
+    def _load(db: Session, course_id: str) -> Optional[CourseCatalog]:
+        """
+        Build a snapshot with one query each for version, course, KAs and domains.
+
+        The version is read first: a bump that commits mid-load leaves the
+        snapshot tagged with the older version, so it is reloaded on the
+        next check instead of being kept.
+        """
+        version = current_catalog_version(db, course_id)
+
+        course = db.query(
+            Course.course_code, Course.course_name, Course.status, Course.passing_score_percentage
+        ).filter(Course.course_id == course_id).first()
+        if course is None:
+            return None
+
+        ka_rows = db.query(
+            KnowledgeArea.ka_id, KnowledgeArea.ka_code, KnowledgeArea.ka_name, KnowledgeArea.ka_number,
+            KnowledgeArea.description, KnowledgeArea.weight_percentage
+        ).filter(
+            KnowledgeArea.course_id == course_id
+        ).order_by(KnowledgeArea.ka_number.asc()).all()
+
+        domains: Dict[str, list] = {}
+        if ka_rows:
+            domain_rows = db.query(
+                Domain.domain_id, Domain.ka_id, Domain.domain_code, Domain.domain_name, Domain.domain_number
+            ).filter(
+                Domain.ka_id.in_([row.ka_id for row in ka_rows])
+            ).order_by(Domain.ka_id, Domain.domain_number.asc()).all()
+            for row in domain_rows:
+                domains.setdefault(str(row.ka_id), []).append(CatalogDomain(
+                    str(row.domain_id), str(row.ka_id), row.domain_code, row.domain_name, row.domain_number
+                ))
+
+        knowledge_areas = tuple(
+            CatalogKnowledgeArea(
+                ka_id=str(row.ka_id),
+                course_id=course_id,
+                ka_code=row.ka_code,
+                ka_name=row.ka_name,
+                ka_number=row.ka_number,
+                description=row.description,
+                weight_percentage=row.weight_percentage,
+                domains=tuple(domains.get(str(row.ka_id), ()))
+            )
+            for row in ka_rows
+        )
+
+        return CourseCatalog(
+            course_id=course_id,
+            course_code=course.course_code,
+            course_name=course.course_name,
+            status=course.status,
+            passing_score_percentage=course.passing_score_percentage,
+            knowledge_areas=knowledge_areas,
+            version=version,
+            checked_at=time.monotonic()
+        )
+
+
+def current_catalog_version(db: Session, course_id) -> int:
+    """
+    Get a course's catalog version from the database.
+
+    Args:
+        db: Database session
+        course_id: Course ID
+
+    Returns:
+        Version number (0 if the course's catalog was never changed by admin)
+    """
+    version = db.execute(
+        select(CatalogVersion.version).where(CatalogVersion.course_id == str(course_id))
+    ).scalar()
+    return version or 0
+
+
+def bump_catalog_version(db: Session, course_id) -> None:
+    """
+    Increment a course's catalog version for all workers.
+
+    Does not commit: call it in the transaction that changes the course's
+    KAs, domains or status, then invalidate_catalog after commit.
+
+    Args:
+        db: Database session
+        course_id: Course whose catalog changed
+    """
+    stmt = insert(CatalogVersion).values(course_id=str(course_id), version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CatalogVersion.course_id],
+        set_={'version': CatalogVersion.version + 1, 'updated_at': func.now()}
+    )
+    db.execute(stmt)
+
+
+# Process-wide cache instance
+catalog_cache = CatalogCache(
+    check_seconds=settings.CATALOG_VERSION_CHECK_SECONDS,
+    max_age_seconds=settings.CATALOG_MAX_AGE_SECONDS
+)
+
+
+def get_course_catalog(db: Session, course_id) -> Optional[CourseCatalog]:
+    """Get the cached catalog for a course (None if the course doesn't exist)."""
+    return catalog_cache.get(db, course_id)
+
+
+def get_knowledge_area(db: Session, ka_id) -> Optional[CatalogKnowledgeArea]:
+    """
+    Get a KA from its course's cached catalog.
+
+    Args:
+        db: Database session
+        ka_id: KA ID
+
+    Returns:
+        CatalogKnowledgeArea, or None if the KA doesn't exist
+    """
+    return get_knowledge_areas(db, [ka_id]).get(str(ka_id))
+
+
+def get_knowledge_areas(db: Session, ka_ids: Iterable) -> Dict[str, CatalogKnowledgeArea]:
+    """
+    Get KAs from their courses' cached catalogs.
+
+    KAs may belong to different courses; each course's catalog is loaded
+    once.
+
+    Args:
+        db: Database session
+        ka_ids: KA IDs
+
+    Returns:
+        Dict of ka_id to CatalogKnowledgeArea (unknown KAs are omitted)
+    """
+    catalogs = {}
+    kas = {}
+    for ka_id, course_id in catalog_cache.course_of(db, ka_ids).items():
+        if course_id not in catalogs:
+            catalogs[course_id] = catalog_cache.get(db, course_id)
+        catalog = catalogs[course_id]
+        ka = catalog.ka(ka_id) if catalog is not None else None
+        if ka is not None:
+            kas[ka_id] = ka
+    return kas
+
+
+def invalidate_catalog(course_id=None) -> None:
+    """
+    Drop this worker's cached catalog after an admin change.
+
+    Other workers notice through the catalog version (bump_catalog_version).
+
+    Args:
+        course_id: Course whose catalog changed, or None for all courses
+    """
+    catalog_cache.invalidate(course_id)
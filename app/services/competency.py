@@ -6,11 +6,15 @@ Decision #3: Adaptive learning with IRT.
 Decision #18: Competency estimation.
 Decision #22: Simplified IRT approach for MVP (correct/total per KA).
 """
-from typing import List, Dict
+from typing import Dict, List
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from app.models.learning import UserCompetency, QuestionAttempt
-from app.models.course import KnowledgeArea
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from app.models.learning import UserCompetency, QuestionAttempt, CompetencySnapshot
+from app.services.catalog import get_course_catalog
+from app.models.question import Question
 import uuid
 
 
@@ -33,9 +37,8 @@ def initialize_user_competencies(
         List of created UserCompetency records
     """
     # Get all KAs for the course
-    knowledge_areas = db.query(KnowledgeArea).filter(
-        KnowledgeArea.course_id == course_id
-    ).all()
+    catalog = get_course_catalog(db, course_id)
+    knowledge_areas = catalog.knowledge_areas if catalog else ()
     
     competencies = []
     for ka in knowledge_areas:
@@ -100,12 +103,17 @@ def get_weakest_ka(
     ).order_by(UserCompetency.competency_score.asc()).first()
 
 
+# How much one attempt moves the competency score toward the question difficulty
+COMPETENCY_LEARNING_RATE = Decimal('0.1')
+
+
 def update_competency_after_attempt(
     db: Session,
     user_id: uuid.UUID,
     ka_id: uuid.UUID,
     is_correct: bool,
-    question_difficulty: Decimal
+    question_difficulty: Decimal,
+    commit: bool = True
 ) -> UserCompetency:
     """
     Update user competency after question attempt.
@@ -114,6 +122,10 @@ def update_competency_after_attempt(
     Future: Full 1PL IRT implementation with maximum likelihood estimation.
     
     Current implementation: Simple weighted average based on difficulty.
+
+    The counters and score are updated by a single UPDATE ... RETURNING
+    with the formula in SQL, so concurrent answers in the same KA can't
+    lose updates and no SELECT/refresh round trips are needed.
     
     Args:
         db: Database session
@@ -121,61 +133,133 @@ def update_competency_after_attempt(
         ka_id: KA ID
         is_correct: Whether answer was correct
         question_difficulty: Question difficulty (0-1)
+        commit: Commit and refresh (False: only flush, caller commits the unit of work)
         
     Returns:
-        Updated UserCompetency
+        Updated UserCompetency (populated from RETURNING)
     """
-    competency = db.query(UserCompetency).filter(
-        UserCompetency.user_id == user_id,
-        UserCompetency.ka_id == ka_id
-    ).first()
-    
-    if not competency:
-        # Create if doesn't exist
+    question_difficulty = Decimal(str(question_difficulty))
+    score = UserCompetency.competency_score
+
+    # Correct answers move the score up toward harder questions, incorrect
+    # answers move it down toward easier ones: both are
+    # score + (difficulty - score) * learning_rate, clamped to [0, 1]
+    new_score = func.greatest(
+        Decimal('0.00'),
+        func.least(Decimal('1.00'), score + (question_difficulty - score) * COMPETENCY_LEARNING_RATE)
+    )
+
+    competency = db.execute(
+        update(UserCompetency)
+        .where(
+            UserCompetency.user_id == str(user_id),
+            UserCompetency.ka_id == str(ka_id)
+        )
+        .values(
+            attempts_count=UserCompetency.attempts_count + 1,
+            correct_count=UserCompetency.correct_count + (1 if is_correct else 0),
+            incorrect_count=UserCompetency.incorrect_count + (0 if is_correct else 1),
+            competency_score=new_score
+        )
+        .returning(UserCompetency)
+        .execution_options(populate_existing=True)
+    ).scalars().first()
+
+    if competency is None:
+        # First attempt in this KA - create from the neutral starting score
+        start_score = Decimal('0.50')
         competency = UserCompetency(
-            user_id=user_id,
-            ka_id=ka_id,
-            competency_score=Decimal('0.50'),
-            attempts_count=0,
-            correct_count=0,
-            incorrect_count=0
+            user_id=str(user_id),
+            ka_id=str(ka_id),
+            competency_score=max(
+                Decimal('0.00'),
+                min(Decimal('1.00'), start_score + (question_difficulty - start_score) * COMPETENCY_LEARNING_RATE)
+            ),
+            attempts_count=1,
+            correct_count=1 if is_correct else 0,
+            incorrect_count=0 if is_correct else 1
         )
         db.add(competency)
+        db.flush()
 
-    # Update attempt counts
-    competency.attempts_count += 1
-    if is_correct:
-        competency.correct_count += 1
-    else:
-        competency.incorrect_count += 1
-    
-    # Simple competency update (MVP version)
-    # If correct: increase score slightly, weighted by difficulty
-    # If incorrect: decrease score slightly, weighted by difficulty
-    learning_rate = Decimal('0.1')  # How much to adjust per question
-    
-    if is_correct:
-        # Correct answer: move competency toward question difficulty
-        # If question was harder than competency, increase more
-        adjustment = (question_difficulty - competency.competency_score) * learning_rate
-        competency.competency_score += adjustment
-    else:
-        # Incorrect answer: move competency downward
-        # If question was easier than competency, decrease more
-        adjustment = (competency.competency_score - question_difficulty) * learning_rate
-        competency.competency_score -= adjustment
-    
-    # Clamp competency score to [0, 1]
-    competency.competency_score = max(Decimal('0.00'), min(Decimal('1.00'), competency.competency_score))
-    
-    # Note: last_updated_at is automatically updated by onupdate=func.now()
+    record_competency_snapshot(db, user_id, ka_id, competency.competency_score, attempts=1)
 
-    db.commit()
-    db.refresh(competency)
+    if commit:
+        db.commit()
+        db.refresh(competency)
 
     return competency
 
 
+def record_competency_snapshot(
+    db: Session,
+    user_id: uuid.UUID,
+    ka_id: uuid.UUID,
+    competency_score: Decimal,
+    attempts: int = 0
+) -> None:
+    """
+    Upsert today's (UTC) competency snapshot for a KA.
+
+    The snapshot keeps the latest score of the day and accumulates the
+    day's attempts. Does not commit.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        ka_id: KA ID
+        competency_score: Score after the update
+        attempts: Attempts to add to the day's count
+    """
+    stmt = insert(CompetencySnapshot).values(
+        snapshot_id=str(uuid.uuid4()),
+        user_id=str(user_id),
+        ka_id=str(ka_id),
+        snapshot_date=datetime.now(timezone.utc).date(),
+        competency_score=competency_score,
+        attempts_count=attempts
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CompetencySnapshot.user_id, CompetencySnapshot.snapshot_date, CompetencySnapshot.ka_id],
+        set_={
+            'competency_score': stmt.excluded.competency_score,
+            'attempts_count': CompetencySnapshot.attempts_count + stmt.excluded.attempts_count
+        }
+    )
+    db.execute(stmt)
+
+
+def get_competency_trends(
+    db: Session,
+    user_id: uuid.UUID,
+    days: int = 30
+) -> Dict[str, List[CompetencySnapshot]]:
+    """
+    Get daily competency snapshots for the last `days` days, per KA.
+
+    One range query on idx_competency_snapshots_user_date.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        days: Trend window in days
+
+    Returns:
+        Dict of ka_id to snapshots in date order (only days with a snapshot)
+    """
+    start_date = datetime.now(timezone.utc).date() - timedelta(days=days)
+
+    snapshots = db.query(CompetencySnapshot).filter(
+        CompetencySnapshot.user_id == str(user_id),
+        CompetencySnapshot.snapshot_date > start_date
+    ).order_by(CompetencySnapshot.snapshot_date.asc()).all()
+
+    trends: Dict[str, List[CompetencySnapshot]] = {}
+    for snapshot in snapshots:
+        trends.setdefault(str(snapshot.ka_id), []).append(snapshot)
+    return trends
+
+
 def calculate_diagnostic_competencies(
     db: Session,
     user_id: uuid.UUID,
@@ -195,60 +279,49 @@ def calculate_diagnostic_competencies(
     Returns:
         List of updated UserCompetency records
     """
-    # Get all question attempts from this diagnostic session
-    attempts = db.query(QuestionAttempt).filter(
-        QuestionAttempt.user_id == user_id,
-        QuestionAttempt.session_id == session_id
-    ).all()
-
-    # Group attempts by KA
-    ka_stats: Dict[str, Dict] = {}
-    for attempt in attempts:
-        # Get question to find KA
-        ka_id = str(attempt.question.ka_id)
-
-        if ka_id not in ka_stats:
-            ka_stats[ka_id] = {
-                'total': 0,
-                'correct': 0,
-                'incorrect': 0
-            }
-
-        ka_stats[ka_id]['total'] += 1
-        if attempt.is_correct:
-            ka_stats[ka_id]['correct'] += 1
-        else:
-            ka_stats[ka_id]['incorrect'] += 1
+    # Per-KA totals in one aggregate query
+    ka_stats = db.query(
+        Question.ka_id,
+        func.count(QuestionAttempt.attempt_id),
+        func.count(QuestionAttempt.attempt_id).filter(QuestionAttempt.is_correct == True)
+    ).join(
+        Question, Question.question_id == QuestionAttempt.question_id
+    ).filter(
+        QuestionAttempt.user_id == str(user_id),
+        QuestionAttempt.session_id == str(session_id)
+    ).group_by(Question.ka_id).all()
 
     # Update or create competency records
     updated_competencies = []
-    for ka_id_str, stats in ka_stats.items():
+    for ka_id_str, total, correct in ka_stats:
         # Calculate competency score (simple ratio)
         # Decision #22: competency = correct / total
-        competency_score = Decimal(stats['correct']) / Decimal(stats['total'])
-
-        # Get or create competency record
-        competency = db.query(UserCompetency).filter(
-            UserCompetency.user_id == user_id,
-            UserCompetency.ka_id == ka_id_str
-        ).first()
-
-        if not competency:
-            competency = UserCompetency(
-                user_id=user_id,
-                ka_id=ka_id_str,
-                competency_score=competency_score,
-                attempts_count=stats['total'],
-                correct_count=stats['correct'],
-                incorrect_count=stats['incorrect']
+        competency_score = Decimal(correct) / Decimal(total)
+        values = {
+            'competency_score': competency_score,
+            'attempts_count': total,
+            'correct_count': correct,
+            'incorrect_count': total - correct
+        }
+
+        # Single UPDATE ... RETURNING; create the record if missing
+        competency = db.execute(
+            update(UserCompetency)
+            .where(
+                UserCompetency.user_id == str(user_id),
+                UserCompetency.ka_id == ka_id_str
             )
+            .values(**values)
+            .returning(UserCompetency)
+            .execution_options(populate_existing=True)
+        ).scalars().first()
+
+        if competency is None:
+            competency = UserCompetency(user_id=str(user_id), ka_id=ka_id_str, **values)
             db.add(competency)
-        else:
-            competency.competency_score = competency_score
-            competency.attempts_count = stats['total']
-            competency.correct_count = stats['correct']
-            competency.incorrect_count = stats['incorrect']
 
+        # Score only: results can be re-read, which must not recount attempts
+        record_competency_snapshot(db, user_id, ka_id_str, competency_score)
         updated_competencies.append(competency)
 
     db.commit()
@@ -286,18 +359,35 @@ def calculate_weighted_competency(
     if not competencies:
         return Decimal('0.00')
 
-    # Calculate weighted average
+    catalog = get_course_catalog(db, course_id)
+    ka_weights = catalog.ka_weights if catalog else {}
+
+    return weighted_average_competency(competencies, ka_weights)
+
+
+def weighted_average_competency(
+    competencies: List[UserCompetency],
+    ka_weights: Dict[str, Decimal]
+) -> Decimal:
+    """
+    Weighted average of competency scores by KA weight percentage.
+
+    Competencies in KAs missing from ka_weights (other courses) are skipped.
+
+    Args:
+        competencies: User's competency records
+        ka_weights: Weight percentage per ka_id for the course
+
+    Returns:
+        Weighted average competency (0.00-1.00)
+    """
     weighted_sum = Decimal('0.00')
     total_weight = Decimal('0.00')
 
     for comp in competencies:
-        ka = db.query(KnowledgeArea).filter(
-            KnowledgeArea.ka_id == comp.ka_id,
-            KnowledgeArea.course_id == course_id
-        ).first()
-
-        if ka:
-            weight = ka.weight_percentage / Decimal('100.0')
+        weight_percentage = ka_weights.get(str(comp.ka_id))
+        if weight_percentage is not None:
+            weight = weight_percentage / Decimal('100.0')
             weighted_sum += comp.competency_score * weight
             total_weight += weight
 
@@ -0,0 +1,185 @@
+"""
+Diagnostic form pool service.
+
+Decision #32: Diagnostic assessment with 4 questions per KA
+(1 easy, 2 medium, 1 hard).
+
+Instead of solving the blueprint per /diagnostic/start, each course keeps a
+pool of pre-assembled forms built from the question bank index. Forms are
+handed out in rotation, and generation favours the least-exposed questions
+so item exposure is spread across the bank.
+
+A pool belongs to one question bank snapshot: when the bank is invalidated
+or expires, the pool is regenerated on next use. Admin endpoints that
+change questions or KAs schedule rebuild_diagnostic_forms as a background
+task so learners don't pay for regeneration.
+"""
+from collections import Counter
+from itertools import count
+from typing import Dict, List, Sequence, Set, Tuple
+import random
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.database import SessionLocal
+from app.models.question import Question
+from app.services.question_bank import (
+    CourseQuestionBank,
+    get_question_bank,
+    invalidate_question_bank,
+    load_active_questions,
+)
+
+
+# (lower, upper, upper_inclusive, count) per KA
+DIAGNOSTIC_BLUEPRINT = (
+    (0.0, 0.4, False, 1),  # easy
+    (0.4, 0.7, False, 2),  # medium
+    (0.7, 1.0, True, 1),   # hard
+)
+QUESTIONS_PER_KA = 4
+
+
+class DiagnosticFormPool:
+    """Pre-assembled diagnostic forms for one question bank snapshot."""
+
+    __slots__ = ("bank", "forms", "_counter")
+
+    def __init__(self, bank: CourseQuestionBank, forms: List[Tuple[str, ...]]):
+        self.bank = bank
+        self.forms = forms
+        self._counter = count()
+
+    def next_form(self) -> Tuple[str, ...]:
+        """Get the next form in rotation (O(1))."""
+        if not self.forms:
+            return ()
+        return self.forms[next(self._counter) % len(self.forms)]
+
+
+_pools: Dict[str, DiagnosticFormPool] = {}
+_lock = threading.Lock()
+
+
+def _least_exposed(
+    candidates: Sequence[str],
+    needed: int,
+    exposure: Counter,
+    exclude: Set[str]
+) -> List[str]:
+    """Pick up to `needed` IDs with the lowest exposure, ties broken randomly."""
+    available = [qid for qid in candidates if qid not in exclude]
+    random.shuffle(available)
+    available.sort(key=lambda qid: exposure[qid])
+    return available[:needed]
+
+
+def generate_forms(
+    bank: CourseQuestionBank,
+    pool_size: int,
+    questions_per_ka: int = QUESTIONS_PER_KA
+) -> List[Tuple[str, ...]]:
+    """
+    Assemble blueprint-balanced diagnostic forms from a question bank.
+
+    Each form follows DIAGNOSTIC_BLUEPRINT per KA (KAs in ka_number order),
+    filling short bands with other questions from the same KA. Questions
+    used by fewer earlier forms are preferred.
+
+    Args:
+        bank: Course question bank snapshot
+        pool_size: Number of forms to build
+        questions_per_ka: Questions per KA (default 4)
+
+    Returns:
+        List of forms, each a tuple of question IDs in presentation order
+    """
+    exposure: Counter = Counter()
+    forms = []
+
+    for _ in range(pool_size):
+        form: List[str] = []
+
+        for ka_id in bank.ka_ids:
+            ka_bank = bank.ka(ka_id)
+            picked: List[str] = []
+
+            for lower, upper, upper_inclusive, needed in DIAGNOSTIC_BLUEPRINT:
+                band = ka_bank.ids_in_range(lower, upper, upper_inclusive=upper_inclusive)
+                picked.extend(_least_exposed(band, needed, exposure, set(picked)))
+
+            remaining = questions_per_ka - len(picked)
+            if remaining > 0:
+                picked.extend(_least_exposed(ka_bank.question_ids, remaining, exposure, set(picked)))
+
+            form.extend(picked)
+
+        exposure.update(form)
+        forms.append(tuple(form))
+
+    return forms
+
+
+def get_form_pool(db: Session, course_id) -> DiagnosticFormPool:
+    """
+    Get the form pool for a course, regenerating it if the bank changed.
+
+    Args:
+        db: Database session
+        course_id: Course ID
+
+    Returns:
+        DiagnosticFormPool for the current question bank snapshot
+    """
+    course_id = str(course_id)
+    bank = get_question_bank(db, course_id)
+
+    pool = _pools.get(course_id)
+    if pool is not None and pool.bank is bank:
+        return pool
+
+    pool = DiagnosticFormPool(bank, generate_forms(bank, settings.DIAGNOSTIC_FORM_POOL_SIZE))
+    with _lock:
+        _pools[course_id] = pool
+    return pool
+
+
+def get_diagnostic_form(db: Session, course_id, _retried: bool = False) -> List[Question]:
+    """
+    Hand out the next pre-assembled diagnostic form for a course.
+
+    Args:
+        db: Database session
+        course_id: Course ID
+
+    Returns:
+        List of Question objects in presentation order
+    """
+    form = get_form_pool(db, course_id).next_form()
+    questions = load_active_questions(db, form)
+
+    if len(questions) < len(form) and not _retried:
+        # A question was deactivated or deleted since the pool was built
+        invalidate_question_bank(course_id)
+        return get_diagnostic_form(db, course_id, _retried=True)
+
+    return questions
+
+
+def rebuild_diagnostic_forms(course_id) -> None:
+    """
+    Rebuild a course's question bank and form pool in a fresh DB session.
+
+    Scheduled as a background task after admin changes to questions or KAs.
+
+    Args:
+        course_id: Course ID
+    """
+    invalidate_question_bank(course_id)
+    db = SessionLocal()
+    try:
+        get_form_pool(db, course_id)
+    finally:
+        db.close()
@@ -0,0 +1,191 @@
+"""
+Learning summary service.
+
+Decision #13: Progress dashboard with competency tracking.
+
+Maintains one user_course_summaries row per user and course: attempt and
+correct counts, completed sessions, diagnostic status, last completion
+and study time. The answer-submit and session-complete paths upsert it in
+their own transaction, so the dashboard overview reads a single row no
+matter how much history a learner has.
+
+rebuild_learning_summaries recomputes rows from sessions and attempts
+(backfill, or repair after manual data changes).
+"""
+from typing import Optional
+import uuid
+
+from sqlalchemy import Integer, and_, cast, delete, func, insert as sa_insert, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.learning import Session as LearningSession, QuestionAttempt, UserCourseSummary
+
+
+def _upsert(db: Session, user_id, course_id, values: dict, increments: dict) -> None:
+    """Insert the summary row with `values`, or apply `increments` to the existing row."""
+    stmt = insert(UserCourseSummary).values(
+        summary_id=str(uuid.uuid4()),
+        user_id=str(user_id),
+        course_id=str(course_id),
+        **values
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserCourseSummary.user_id, UserCourseSummary.course_id],
+        set_={**increments, 'updated_at': func.now()}
+    )
+    db.execute(stmt)
+
+
+def record_attempt_summary(db: Session, user_id, course_id, is_correct: bool) -> None:
+    """
+    Count a submitted answer in the user's course summary.
+
+    Does not commit: call it in the transaction that stores the attempt.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        course_id: Course of the attempt's session
+        is_correct: Whether the answer was correct
+    """
+    correct = 1 if is_correct else 0
+    _upsert(
+        db, user_id, course_id,
+        values={'total_attempts': 1, 'correct_attempts': correct},
+        increments={
+            'total_attempts': UserCourseSummary.total_attempts + 1,
+            'correct_attempts': UserCourseSummary.correct_attempts + correct
+        }
+    )
+
+
+def record_session_summary(db: Session, session: LearningSession) -> None:
+    """
+    Count a completed session in the user's course summary.
+
+    Does not commit: call it once per completion, in the transaction that
+    marks the session complete.
+
+    Args:
+        db: Database session
+        session: Session that was just marked complete
+    """
+    is_diagnostic = session.session_type == 'diagnostic'
+    study_seconds = session.duration_seconds or 0
+
+    _upsert(
+        db, session.user_id, session.course_id,
+        values={
+            'sessions_completed': 1,
+            'diagnostic_completed': is_diagnostic,
+            'last_session_completed_at': session.completed_at,
+            'study_seconds': study_seconds
+        },
+        increments={
+            'sessions_completed': UserCourseSummary.sessions_completed + 1,
+            'diagnostic_completed': UserCourseSummary.diagnostic_completed | is_diagnostic,
+            'last_session_completed_at': func.greatest(
+                UserCourseSummary.last_session_completed_at, session.completed_at
+            ),
+            'study_seconds': UserCourseSummary.study_seconds + study_seconds
+        }
+    )
+
+
+def get_learning_summary(db: Session, user_id, course_id) -> Optional[UserCourseSummary]:
+    """
+    Get a user's summary row for a course.
+
+    Args:
+        db: Database session
+        user_id: User ID
+        course_id: Course ID
+
+    Returns:
+        UserCourseSummary, or None if the user has no activity in the course
+    """
+    return db.query(UserCourseSummary).filter(
+        UserCourseSummary.user_id == str(user_id),
+        UserCourseSummary.course_id == str(course_id)
+    ).first()
+
+
+def rebuild_learning_summaries(db: Session, user_id=None) -> int:
+    """
+    Recompute summary rows from sessions and question attempts.
+
+    Replaces the rows for one user (or everyone) with set-based aggregates
+    in a single transaction.
+
+    Args:
+        db: Database session
+        user_id: User to rebuild, or None for all users
+
+    Returns:
+        Number of summary rows written
+    """
+    completed = LearningSession.is_completed == True
+
+    session_totals = select(
+        LearningSession.user_id,
+        LearningSession.course_id,
+        func.count().filter(completed).label('sessions_completed'),
+        func.coalesce(
+            func.bool_or(and_(completed, LearningSession.session_type == 'diagnostic')), False
+        ).label('diagnostic_completed'),
+        func.max(LearningSession.completed_at).filter(completed).label('last_session_completed_at'),
+        func.coalesce(
+            func.sum(LearningSession.duration_seconds).filter(completed), 0
+        ).label('study_seconds')
+    ).group_by(LearningSession.user_id, LearningSession.course_id)
+
+    attempt_totals = select(
+        LearningSession.user_id,
+        LearningSession.course_id,
+        func.count(QuestionAttempt.attempt_id).label('total_attempts'),
+        func.count(QuestionAttempt.attempt_id).filter(QuestionAttempt.is_correct == True).label('correct_attempts')
+    ).join(
+        QuestionAttempt, QuestionAttempt.session_id == LearningSession.session_id
+    ).group_by(LearningSession.user_id, LearningSession.course_id)
+
+    delete_stmt = delete(UserCourseSummary)
+    if user_id is not None:
+        session_totals = session_totals.where(LearningSession.user_id == str(user_id))
+        attempt_totals = attempt_totals.where(LearningSession.user_id == str(user_id))
+        delete_stmt = delete_stmt.where(UserCourseSummary.user_id == str(user_id))
+
+    sessions_sq = session_totals.subquery()
+    attempts_sq = attempt_totals.subquery()
+
+    rows = select(
+        cast(func.gen_random_uuid(), UserCourseSummary.summary_id.type),
+        sessions_sq.c.user_id,
+        sessions_sq.c.course_id,
+        func.coalesce(attempts_sq.c.total_attempts, 0),
+        func.coalesce(attempts_sq.c.correct_attempts, 0),
+        cast(sessions_sq.c.sessions_completed, Integer),
+        sessions_sq.c.diagnostic_completed,
+        sessions_sq.c.last_session_completed_at,
+        cast(sessions_sq.c.study_seconds, Integer)
+    ).select_from(sessions_sq).outerjoin(
+        attempts_sq,
+        and_(
+            attempts_sq.c.user_id == sessions_sq.c.user_id,
+            attempts_sq.c.course_id == sessions_sq.c.course_id
+        )
+    )
+
+    db.execute(delete_stmt)
+    result = db.execute(
+        sa_insert(UserCourseSummary).from_select(
+            [
+                'summary_id', 'user_id', 'course_id', 'total_attempts', 'correct_attempts',
+                'sessions_completed', 'diagnostic_completed', 'last_session_completed_at',
+                'study_seconds'
+            ],
+            rows
+        )
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,170 @@
+"""
+Failed-login backoff and lockout.
+
+Decision #52: Rate limiting and brute force protection.
+
+Failures are counted per account (email blind index, so no plaintext email
+is held) and per client IP in bounded in-process tables of decaying
+counters. Once a source has used its free attempts, each failure blocks
+it for an exponentially growing backoff; reaching the lockout threshold
+blocks it for LOGIN_LOCKOUT_SECONDS. Counts halve every
+LOGIN_FAILURE_HALF_LIFE_SECONDS.
+
+The throttle check is a dictionary lookup made before the user query and
+the Argon2 verification, so throttled sources cost no hashing CPU and
+brute-force detection needs no security_logs scan. Counters are per
+worker process and reset on restart.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional
+import math
+import threading
+import time
+
+from app.core.config import settings
+from app.utils.encryption import blind_index
+
+
+class FailurePolicy:
+    """Backoff and lockout thresholds for one counter scope."""
+
+    __slots__ = ("name", "free_attempts", "lockout_failures")
+
+    def __init__(self, name: str, free_attempts: int, lockout_failures: int):
+        self.name = name
+        self.free_attempts = free_attempts
+        self.lockout_failures = lockout_failures
+
+
+class LoginThrottle:
+    """
+    Decaying failure counters with a block deadline per source.
+
+    Entries are [score, updated_at, blocked_until] (monotonic seconds);
+    the least recently failed sources are dropped beyond max_keys.
+    """
+
+    def __init__(
+        self,
+        account_policy: FailurePolicy,
+        ip_policy: FailurePolicy,
+        half_life_seconds: float,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float,
+        lockout_seconds: float,
+        max_keys: int
+    ):
+        self.policies = {'account': account_policy, 'ip': ip_policy}
+        self.half_life_seconds = half_life_seconds
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.lockout_seconds = lockout_seconds
+        self.max_keys = max_keys
+        self._entries: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._metrics = {'throttled': 0, 'failures': 0, 'lockouts': 0}
+
+    def retry_after(self, account_key: Optional[str], ip_address: Optional[str]) -> int:
+        """
+        Check whether a login attempt may proceed.
+
+        Args:
+            account_key: Account identifier (email blind index)
+            ip_address: Client IP
+
+        Returns:
+            Seconds until the attempt is allowed (0 = allowed now)
+        """
+        now = time.monotonic()
+        wait = 0.0
+        with self._lock:
+            for key in self._keys(account_key, ip_address):
+                entry = self._entries.get(key)
+                if entry is not None and entry[2] > now:
+                    wait = max(wait, entry[2] - now)
+            if wait:
+                self._metrics['throttled'] += 1
+        return math.ceil(wait)
+
+    def record_failure(self, account_key: Optional[str], ip_address: Optional[str]) -> None:
+        """Count a failed attempt and extend the block of each source past its free attempts."""
+        now = time.monotonic()
+        with self._lock:
+            self._metrics['failures'] += 1
+            for key in self._keys(account_key, ip_address):
+                policy = self.policies[key.split(":", 1)[0]]
+                entry = self._entries.pop(key, None) or [0.0, now, 0.0]
+                score = entry[0] * 0.5 ** ((now - entry[1]) / self.half_life_seconds) + 1
+                failures = round(score)
+
+                blocked_until = entry[2]
+                if failures >= policy.lockout_failures:
+                    if blocked_until < now + self.lockout_seconds:
+                        self._metrics['lockouts'] += 1
+                    blocked_until = max(blocked_until, now + self.lockout_seconds)
+                elif failures >= policy.free_attempts:
+                    backoff = self.backoff_base_seconds * 2 ** (failures - policy.free_attempts)
+                    blocked_until = max(blocked_until, now + min(backoff, self.backoff_max_seconds))
+
+                self._entries[key] = [score, now, blocked_until]
+            while len(self._entries) > self.max_keys:
+                self._entries.popitem(last=False)
+
+    def record_success(self, account_key: Optional[str]) -> None:
+        """Clear an account's failures after a correct password (the IP count keeps decaying)."""
+        if account_key is None:
+            return
+        with self._lock:
+            self._entries.pop(f"account:{account_key}", None)
+
+    def reset(self) -> None:
+        """Drop all counters."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Tracked sources and throttle counters."""
+        now = time.monotonic()
+        with self._lock:
+            blocked = sum(1 for entry in self._entries.values() if entry[2] > now)
+            return {**self._metrics, 'tracked_sources': len(self._entries), 'blocked_sources': blocked}
+
+    @staticmethod
+    def _keys(account_key: Optional[str], ip_address: Optional[str]) -> List[str]:
+        keys = []
+        if account_key:
+            keys.append(f"account:{account_key}")
+        if ip_address:
+            keys.append(f"ip:{ip_address}")
+        return keys
+
+
+# Process-wide throttle instance
+login_throttle = LoginThrottle(
+    account_policy=FailurePolicy(
+        'account', settings.LOGIN_ACCOUNT_FREE_ATTEMPTS, settings.LOGIN_ACCOUNT_LOCKOUT_FAILURES
+    ),
+    ip_policy=FailurePolicy(
+        'ip', settings.LOGIN_IP_FREE_ATTEMPTS, settings.LOGIN_IP_LOCKOUT_FAILURES
+    ),
+    half_life_seconds=settings.LOGIN_FAILURE_HALF_LIFE_SECONDS,
+    backoff_base_seconds=settings.LOGIN_BACKOFF_BASE_SECONDS,
+    backoff_max_seconds=settings.LOGIN_BACKOFF_MAX_SECONDS,
+    lockout_seconds=settings.LOGIN_LOCKOUT_SECONDS,
+    max_keys=settings.LOGIN_THROTTLE_MAX_KEYS
+)
+
+
+def login_account_key(email: str) -> Optional[str]:
+    """Throttle key for an email (its blind index)."""
+    return blind_index(email)
+
+
+def reset_login_throttle() -> None:
+    """Clear all failed-login counters (tests, support unlocks)."""
+    login_throttle.reset()
+
+
+def login_throttle_stats() -> Dict[str, int]:
+    """Get tracked/blocked sources and throttle counters."""
+    return login_throttle.stats()
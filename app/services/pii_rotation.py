@@ -0,0 +1,323 @@
+"""
+PII re-encryption job for encryption key rotation.
+
+Decision #59: All PII fields are encrypted at rest.
+
+After a rotation (new key in ENCRYPTION_KEY, previous keys in
+ENCRYPTION_OLD_KEYS) every stored value still decrypts, but stays under
+its old key until rewritten. This job rewrites users.email, first_name,
+last_name and two_factor_secret under the primary key (and the current
+ciphertext format) while the API keeps serving:
+
+- Users are walked in user_id order in keyset segments (user_id > last
+  checkpoint), each read through a server-side cursor in batch_size
+  partitions, so no read transaction spans the whole table.
+- Each batch is decrypted and re-encrypted by a thread pool, then written
+  with one UPDATE ... FROM (VALUES ...). Each column is only replaced
+  while it still holds the ciphertext that was read; rows the app changed
+  meanwhile are re-read and retried before the checkpoint moves on.
+- After each batch the last user_id and counters are checkpointed to a
+  JSON file; a restarted job resumes there.
+- max_rows_per_second throttles the job to spare the primary.
+- A final read-only pass counts users still holding a value that the
+  primary key can't decrypt (progress.stale); an old key may only be
+  retired when it is 0.
+
+Blind indexes and search tokens are untouched: during a rotation their key
+is the pinned BLIND_INDEX_KEY, not the encryption key.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import json
+import logging
+import os
+import time
+
+from sqlalchemy import String, and_, case, column, func, select, update, values
+from sqlalchemy.engine import Engine
+
+from app.models.user import User
+from app.utils.encryption import reencrypt_field, wipe_decryption_cache
+
+logger = logging.getLogger(__name__)
+
+ENCRYPTED_USER_COLUMNS = ('email', 'first_name', 'last_name', 'two_factor_secret')
+
+# Re-reads of rows the app changed between our read and write, per batch
+CONFLICT_RETRIES = 3
+
+
+class ReencryptionProgress:
+    """Position and counters of a re-encryption run (checkpointed after each batch)."""
+
+    __slots__ = (
+        "last_user_id", "scanned", "reencrypted", "conflicts", "failed", "total", "elapsed_seconds", "stale"
+    )
+
+    def __init__(
+        self,
+        last_user_id: str = "",
+        scanned: int = 0,
+        reencrypted: int = 0,
+        conflicts: int = 0,
+        failed: int = 0,
+        total: int = 0,
+        elapsed_seconds: float = 0.0,
+        stale: Optional[int] = None
+    ):
+        self.last_user_id = last_user_id
+        self.scanned = scanned
+        self.reencrypted = reencrypted
+        self.conflicts = conflicts
+        self.failed = failed
+        self.total = total
+        self.elapsed_seconds = elapsed_seconds
+        self.stale = stale  # set by the final verification pass
+
+    @property
+    def rows_per_second(self) -> float:
+        """Scan rate over all runs."""
+        return self.scanned / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated time to finish at the current rate."""
+        if not self.rows_per_second:
+            return None
+        return max(self.total - self.scanned, 0) / self.rows_per_second
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ReencryptionProgress":
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+
+def load_checkpoint(path: Optional[str]) -> Optional[ReencryptionProgress]:
+    """Read a checkpoint file, or None if there is none."""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return ReencryptionProgress.from_dict(json.load(f))
+
+
+def save_checkpoint(path: Optional[str], progress: ReencryptionProgress) -> None:
+    """Write a checkpoint atomically (a crash never leaves a partial file)."""
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(progress.to_dict(), f)
+    os.replace(tmp_path, path)
+
+
+def _reencrypt_rows(rows: List[Any]) -> Tuple[List[Dict[str, Optional[str]]], int]:
+    """
+    Re-encrypt the encrypted columns of some user rows (runs in the pool).
+
+    Returns:
+        (update parameters for rows with at least one rewritten value, undecryptable row count)
+    """
+    updates = []
+    failed = 0
+    for row in rows:
+        params = {'user_id': row.user_id}
+        changed = False
+        try:
+            for name in ENCRYPTED_USER_COLUMNS:
+                old = getattr(row, name)
+                new = reencrypt_field(old)
+                params[f'old_{name}'] = old
+                params[f'new_{name}'] = old if new is None else new
+                changed = changed or new is not None
+        except ValueError:
+            logger.warning(f"User {row.user_id} has PII no configured key decrypts; left as is")
+            failed += 1
+            continue
+        if changed:
+            updates.append(params)
+    return updates, failed
+
+
+def _write_batch(engine: Engine, updates: List[Dict[str, Optional[str]]]) -> List[str]:
+    """
+    Apply re-encrypted values in one UPDATE ... FROM (VALUES ...) statement.
+
+    Each column is only replaced while it still holds the ciphertext that
+    was read (CASE WHEN col IS NOT DISTINCT FROM old); a column the app
+    changed meanwhile keeps the app's value and the other columns are still
+    rewritten.
+
+    Returns:
+        user_ids with at least one column left as the app changed it (re-read and retry)
+    """
+    if not updates:
+        return []
+
+    names = ['user_id'] + [f'{prefix}_{name}' for name in ENCRYPTED_USER_COLUMNS for prefix in ('old', 'new')]
+    batch = values(*[column(name, String) for name in names], name='batch').data(
+        [tuple(params[name] for name in names) for params in updates]
+    )
+    users = User.__table__
+    stmt = update(users).where(
+        users.c.user_id == batch.c.user_id
+    ).values({
+        name: case(
+            (users.c[name].is_not_distinct_from(batch.c[f'old_{name}']), batch.c[f'new_{name}']),
+            else_=users.c[name]
+        )
+        for name in ENCRYPTED_USER_COLUMNS
+    }).returning(
+        users.c.user_id,
+        # RETURNING sees the updated row: a column differs from the intended value only if it was skipped
+        and_(*[users.c[name].is_not_distinct_from(batch.c[f'new_{name}']) for name in ENCRYPTED_USER_COLUMNS])
+    )
+
+    with engine.begin() as conn:
+        return [user_id for user_id, applied in conn.execute(stmt) if not applied]
+
+
+def _select_encrypted_columns():
+    users = User.__table__
+    return select(users.c.user_id, *[users.c[name] for name in ENCRYPTED_USER_COLUMNS])
+
+
+def _reencrypt_batch(
+    engine: Engine,
+    pool: ThreadPoolExecutor,
+    workers: int,
+    rows: List[Any],
+    progress: ReencryptionProgress
+) -> None:
+    """Re-encrypt and write one batch, retrying rows the app changed in between."""
+    users = User.__table__
+    for attempt in range(CONFLICT_RETRIES + 1):
+        chunk = max(len(rows) // workers, 1)
+        updates: List[Dict[str, Optional[str]]] = []
+        for chunk_updates, chunk_failed in pool.map(
+            _reencrypt_rows, [rows[i:i + chunk] for i in range(0, len(rows), chunk)]
+        ):
+            updates.extend(chunk_updates)
+            if attempt == 0:
+                progress.failed += chunk_failed
+
+        conflicted = _write_batch(engine, updates)
+        progress.reencrypted += len(updates) - len(conflicted)
+        if not conflicted:
+            return
+        if attempt == CONFLICT_RETRIES:
+            progress.conflicts += len(conflicted)
+            return
+
+        with engine.connect() as conn:
+            rows = conn.execute(_select_encrypted_columns().where(users.c.user_id.in_(conflicted))).all()
+
+
+def count_stale_user_pii(engine: Engine, batch_size: int = 500) -> int:
+    """
+    Count users with any encrypted value not (decryptably) under the primary key.
+
+    Read-only verification pass: it must return 0 before an old key is
+    removed from ENCRYPTION_OLD_KEYS.
+
+    Args:
+        engine: Database engine
+        batch_size: Users per cursor partition
+
+    Returns:
+        Number of users still needing re-encryption (including undecryptable ones)
+    """
+    stale = 0
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+            _select_encrypted_columns().order_by(User.__table__.c.user_id)
+        )
+        for rows in result.partitions():
+            for row in rows:
+                try:
+                    if any(reencrypt_field(getattr(row, name)) is not None for name in ENCRYPTED_USER_COLUMNS):
+                        stale += 1
+                except ValueError:
+                    stale += 1
+    return stale
+
+
+def reencrypt_user_pii(
+    engine: Engine,
+    batch_size: int = 500,
+    workers: int = 4,
+    max_rows_per_second: float = 0,
+    checkpoint_path: Optional[str] = None,
+    segment_size: int = 50000,
+    progress_callback: Optional[Callable[[ReencryptionProgress], None]] = None
+) -> ReencryptionProgress:
+    """
+    Rewrite all users' encrypted columns under the primary key.
+
+    Resumable: starts after the checkpoint's last_user_id if the checkpoint
+    file exists, and removes it once the table has been walked.
+
+    Args:
+        engine: Database engine
+        batch_size: Users per cursor partition, re-encryption batch and UPDATE
+        workers: Re-encryption threads
+        max_rows_per_second: Throttle (0 = unthrottled)
+        checkpoint_path: JSON checkpoint file (None = not resumable)
+        segment_size: Users per keyset segment (one server-side cursor each)
+        progress_callback: Called with the progress after each batch
+
+    Returns:
+        Final progress counters (progress.stale must be 0 before retiring an old key)
+    """
+    progress = load_checkpoint(checkpoint_path) or ReencryptionProgress()
+    users = User.__table__
+    with engine.connect() as conn:
+        remaining = conn.execute(
+            select(func.count()).select_from(users).where(users.c.user_id > progress.last_user_id)
+        ).scalar()
+    progress.total = progress.scanned + remaining
+
+    run_started = time.monotonic()
+    run_scanned = 0
+    elapsed_before = progress.elapsed_seconds
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pii-reencrypt") as pool:
+        while True:
+            segment_rows = 0
+            with engine.connect() as conn:
+                result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(
+                    _select_encrypted_columns()
+                    .where(users.c.user_id > progress.last_user_id)
+                    .order_by(users.c.user_id)
+                    .limit(segment_size)
+                )
+                for rows in result.partitions():
+                    _reencrypt_batch(engine, pool, workers, rows, progress)
+                    progress.scanned += len(rows)
+                    progress.last_user_id = rows[-1].user_id
+                    segment_rows += len(rows)
+                    run_scanned += len(rows)
+
+                    if max_rows_per_second:
+                        ahead = run_scanned / max_rows_per_second - (time.monotonic() - run_started)
+                        if ahead > 0:
+                            time.sleep(ahead)
+
+                    progress.elapsed_seconds = elapsed_before + time.monotonic() - run_started
+                    save_checkpoint(checkpoint_path, progress)
+                    if progress_callback:
+                        progress_callback(progress)
+
+            if segment_rows < segment_size:
+                break
+
+    # Final pass: confirm nothing is left under an old key before reporting success
+    progress.stale = count_stale_user_pii(engine, batch_size)
+
+    # Old-key ciphertexts are gone from the table; drop their plaintext too
+    wipe_decryption_cache()
+    # The walk is complete: a rerun (e.g. for stale users) starts from the beginning
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return progress
@@ -0,0 +1,224 @@
+"""
+Question bank index service.
+
+Process-local, per-course index of active questions used by adaptive and
+diagnostic selection (Decision #3, #32).
+
+Each course's active questions are grouped by KA and kept sorted by
+difficulty in compact arrays. Difficulty-band picks, exclusions and
+fallbacks then run in memory (bisect + random sample) instead of
+ORDER BY random() queries; only the chosen questions are loaded from the
+database, by primary key.
+
+Entries are rebuilt when the admin API changes a course's questions
+(invalidate_question_bank) and expire after QUESTION_BANK_CACHE_TTL_SECONDS
+so other worker processes pick up changes too.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import random
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.course import KnowledgeArea
+from app.models.question import Question
+
+
+class KAQuestionBank:
+    """Active questions of one KA, sorted by difficulty."""
+
+    __slots__ = ("difficulties", "question_ids")
+
+    def __init__(self, difficulties: array, question_ids: Tuple[str, ...]):
+        self.difficulties = difficulties
+        self.question_ids = question_ids
+
+    def ids_in_range(
+        self,
+        lower: float,
+        upper: float,
+        upper_inclusive: bool = True
+    ) -> Tuple[str, ...]:
+        """
+        Get question IDs with lower <= difficulty <= upper (or < upper).
+
+        Args:
+            lower: Inclusive lower difficulty bound
+            upper: Upper difficulty bound
+            upper_inclusive: Whether questions at exactly `upper` are included
+
+        Returns:
+            Tuple of question IDs, sorted by difficulty
+        """
+        start = bisect_left(self.difficulties, lower)
+        end = bisect_right(self.difficulties, upper) if upper_inclusive else bisect_left(self.difficulties, upper)
+        return self.question_ids[start:end]
+
+
+_EMPTY_KA = KAQuestionBank(array("d"), ())
+
+
+class CourseQuestionBank:
+    """Snapshot of a course's active questions, grouped by KA."""
+
+    __slots__ = ("course_id", "ka_ids", "all_question_ids", "loaded_at", "_by_ka")
+
+    def __init__(
+        self,
+        course_id: str,
+        ka_ids: Tuple[str, ...],
+        by_ka: Dict[str, KAQuestionBank],
+        loaded_at: float
+    ):
+        self.course_id = course_id
+        self.ka_ids = ka_ids
+        self._by_ka = by_ka
+        self.all_question_ids = tuple(qid for ka_bank in by_ka.values() for qid in ka_bank.question_ids)
+        self.loaded_at = loaded_at
+
+    def ka(self, ka_id) -> KAQuestionBank:
+        """Get the bank for a KA (empty if the KA has no active questions)."""
+        return self._by_ka.get(str(ka_id), _EMPTY_KA)
+
+
+class QuestionBankIndex:
+    """Thread-safe cache of CourseQuestionBank snapshots keyed by course_id."""
+
+    def __init__(self, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._courses: Dict[str, CourseQuestionBank] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, course_id) -> CourseQuestionBank:
+        """
+        Get the question bank for a course, loading it on first use or expiry.
+
+        Args:
+            db: Database session
+            course_id: Course ID
+
+        Returns:
+            CourseQuestionBank snapshot
+        """
+        course_id = str(course_id)
+        bank = self._courses.get(course_id)
+        if bank is not None and time.monotonic() - bank.loaded_at < self.ttl_seconds:
+            return bank
+
+        bank = self._load(db, course_id)
+        with self._lock:
+            self._courses[course_id] = bank
+        return bank
+
+    def invalidate(self, course_id=None) -> None:
+        """
+        Drop cached banks so they are rebuilt on next access.
+
+        Args:
+            course_id: Course to invalidate, or None for all courses
+        """
+        with self._lock:
+            if course_id is None:
+                self._courses.clear()
+            else:
+                self._courses.pop(str(course_id), None)
+
+    @staticmethod
+    def _load(db: Session, course_id: str) -> CourseQuestionBank:
+        """Build a snapshot with one query for KAs and one for questions."""
+        ka_ids = tuple(
+            row.ka_id for row in db.query(KnowledgeArea.ka_id).filter(
+                KnowledgeArea.course_id == course_id
+            ).order_by(KnowledgeArea.ka_number.asc()).all()
+        )
+
+        rows = db.query(Question.question_id, Question.ka_id, Question.difficulty).filter(
+            Question.course_id == course_id,
+            Question.is_active == True
+        ).order_by(Question.ka_id, Question.difficulty, Question.question_id).all()
+
+        grouped: Dict[str, Tuple[array, List[str]]] = {}
+        for question_id, ka_id, difficulty in rows:
+            difficulties, question_ids = grouped.setdefault(str(ka_id), (array("d"), []))
+            difficulties.append(float(difficulty))
+            question_ids.append(str(question_id))
+
+        by_ka = {
+            ka_id: KAQuestionBank(difficulties, tuple(question_ids))
+            for ka_id, (difficulties, question_ids) in grouped.items()
+        }
+        return CourseQuestionBank(course_id, ka_ids, by_ka, time.monotonic())
+
+
+# Process-wide index instance
+question_bank = QuestionBankIndex(ttl_seconds=settings.QUESTION_BANK_CACHE_TTL_SECONDS)
+
+
+def get_question_bank(db: Session, course_id) -> CourseQuestionBank:
+    """Get the cached question bank for a course."""
+    return question_bank.get(db, course_id)
+
+
+def invalidate_question_bank(course_id=None) -> None:
+    """
+    Invalidate the question bank after questions change.
+
+    Call after bulk import, edit or deactivation of a course's questions.
+
+    Args:
+        course_id: Course whose questions changed, or None for all courses
+    """
+    question_bank.invalidate(course_id)
+
+
+def sample_question_ids(
+    candidates: Sequence[str],
+    exclude: Optional[Set[str]] = None,
+    count: int = 1
+) -> List[str]:
+    """
+    Randomly pick up to `count` question IDs from candidates, skipping excluded IDs.
+
+    Args:
+        candidates: Candidate question IDs
+        exclude: Question IDs that must not be picked
+        count: Number of IDs to pick
+
+    Returns:
+        List of picked IDs (shorter than count if not enough candidates)
+    """
+    available = [qid for qid in candidates if qid not in exclude] if exclude else list(candidates)
+    if len(available) <= count:
+        random.shuffle(available)
+        return available
+    return random.sample(available, count)
+
+
+def load_active_questions(db: Session, question_ids: Iterable[str]) -> List[Question]:
+    """
+    Load active questions by ID, preserving the given order.
+
+    IDs that no longer refer to an active question are skipped; callers use
+    a short result to detect a stale bank.
+
+    Args:
+        db: Database session
+        question_ids: Question IDs in the desired order
+
+    Returns:
+        List of Question objects
+    """
+    question_ids = list(question_ids)
+    if not question_ids:
+        return []
+
+    questions = db.query(Question).filter(
+        Question.question_id.in_(question_ids),
+        Question.is_active == True
+    ).all()
+    by_id = {str(q.question_id): q for q in questions}
+    return [by_id[qid] for qid in question_ids if qid in by_id]
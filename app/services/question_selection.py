@@ -4,20 +4,29 @@ Question selection service for adaptive learning and diagnostics.
 Decision #32: Diagnostic assessment with 4 questions per KA.
 Decision #3: Adaptive learning - select questions based on competency.
 """
-from typing import List, Set
+from typing import List, Optional, Sequence, Set
 from decimal import Decimal
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert
 from app.models.question import Question
-from app.models.course import KnowledgeArea
-from app.models.learning import QuestionAttempt, UserCompetency
+from app.services.catalog import get_knowledge_area
+from app.models.learning import Session as LearningSession, SessionQuestion, QuestionAttempt, UserCompetency
+from app.services.question_bank import (
+    CourseQuestionBank,
+    get_question_bank,
+    invalidate_question_bank,
+    load_active_questions,
+    sample_question_ids,
+)
 import uuid
 
 
 def select_diagnostic_questions(
     db: Session,
     course_id: uuid.UUID,
-    questions_per_ka: int = 4
+    questions_per_ka: int = 4,
+    _retried: bool = False
 ) -> List[Question]:
     """
     Select questions for diagnostic assessment.
@@ -30,6 +39,9 @@ def select_diagnostic_questions(
     - Random selection within difficulty bands
     - Ensures balanced assessment across all knowledge areas
 
+    Bands are sampled from the in-memory question bank index; only the
+    selected questions are loaded from the database.
+
     Args:
         db: Database session
         course_id: Course ID
@@ -38,64 +50,121 @@ def select_diagnostic_questions(
     Returns:
         List of Question objects (typically 24 for CBAP with 6 KAs)
     """
-    # Get all KAs for the course
-    knowledge_areas = db.query(KnowledgeArea).filter(
-        KnowledgeArea.course_id == course_id
-    ).all()
+    bank = get_question_bank(db, course_id)
+
+    selected_ids = []
 
-    diagnostic_questions = []
-
-    for ka in knowledge_areas:
-        # Select 1 easy question (difficulty 0.0-0.4)
-        easy = db.query(Question).filter(
-            Question.course_id == course_id,
-            Question.ka_id == ka.ka_id,
-            Question.is_active == True,
-            Question.difficulty >= 0.0,
-            Question.difficulty < 0.4
-        ).order_by(func.random()).limit(1).all()
-
-        # Select 2 medium questions (difficulty 0.4-0.7)
-        medium = db.query(Question).filter(
-            Question.course_id == course_id,
-            Question.ka_id == ka.ka_id,
-            Question.is_active == True,
-            Question.difficulty >= 0.4,
-            Question.difficulty < 0.7
-        ).order_by(func.random()).limit(2).all()
-
-        # Select 1 hard question (difficulty 0.7-1.0)
-        hard = db.query(Question).filter(
-            Question.course_id == course_id,
-            Question.ka_id == ka.ka_id,
-            Question.is_active == True,
-            Question.difficulty >= 0.7,
-            Question.difficulty <= 1.0
-        ).order_by(func.random()).limit(1).all()
-
-        # Combine all difficulty levels
-        ka_questions = easy + medium + hard
+    for ka_id in bank.ka_ids:
+        ka_bank = bank.ka(ka_id)
+
+        # 1 easy, 2 medium, 1 hard
+        ka_question_ids = (
+            sample_question_ids(ka_bank.ids_in_range(0.0, 0.4, upper_inclusive=False), count=1)
+            + sample_question_ids(ka_bank.ids_in_range(0.4, 0.7, upper_inclusive=False), count=2)
+            + sample_question_ids(ka_bank.ids_in_range(0.7, 1.0), count=1)
+        )
 
         # If we don't have enough questions in specific difficulty bands,
         # fill remaining slots with random questions from this KA
-        remaining = questions_per_ka - len(ka_questions)
+        remaining = questions_per_ka - len(ka_question_ids)
         if remaining > 0:
-            # Get IDs of already selected questions
-            selected_ids = [q.question_id for q in ka_questions]
+            ka_question_ids.extend(
+                sample_question_ids(ka_bank.question_ids, set(ka_question_ids), remaining)
+            )
 
-            # Select additional random questions
-            additional = db.query(Question).filter(
-                Question.course_id == course_id,
-                Question.ka_id == ka.ka_id,
-                Question.is_active == True,
-                ~Question.question_id.in_(selected_ids) if selected_ids else True
-            ).order_by(func.random()).limit(remaining).all()
+        selected_ids.extend(ka_question_ids)
 
-            ka_questions.extend(additional)
+    questions = load_active_questions(db, selected_ids)
 
-        diagnostic_questions.extend(ka_questions)
+    if len(questions) < len(selected_ids) and not _retried:
+        # Bank is stale (question deactivated or deleted elsewhere) - rebuild once
+        invalidate_question_bank(course_id)
+        return select_diagnostic_questions(db, course_id, questions_per_ka, _retried=True)
 
-    return diagnostic_questions
+    return questions
+
+
+def assign_session_questions(
+    db: Session,
+    session_id: str,
+    questions: List[Question]
+) -> None:
+    """
+    Persist the question set and order for a session.
+
+    Inserts SessionQuestion rows (positions 1..n) in the current
+    transaction; the caller commits. Rows whose position or question is
+    already stored for the session are skipped, so two requests assigning
+    a set to the same session concurrently keep the first set instead of
+    failing on the unique indexes.
+
+    Args:
+        db: Database session
+        session_id: Learning session ID
+        questions: Questions in presentation order
+    """
+    if not questions:
+        return
+
+    stmt = insert(SessionQuestion).values([
+        {
+            'session_question_id': str(uuid.uuid4()),
+            'session_id': str(session_id),
+            'question_id': str(question.question_id),
+            'position': position
+        }
+        for position, question in enumerate(questions, start=1)
+    ])
+    db.execute(stmt.on_conflict_do_nothing())
+
+
+def get_next_session_question(db: Session, session: LearningSession) -> Optional[Question]:
+    """
+    Get the first question of a session's stored set that has no attempt yet.
+
+    Decision #32: The diagnostic set is fixed at /diagnostic/start. Sessions
+    created without a stored set (e.g. before session_questions existed) get
+    one selected and persisted on first access.
+
+    Args:
+        db: Database session
+        session: Learning session
+
+    Returns:
+        Next unanswered Question, or None if every stored question is answered
+    """
+    next_question = db.query(Question).join(
+        SessionQuestion, SessionQuestion.question_id == Question.question_id
+    ).outerjoin(
+        QuestionAttempt,
+        and_(
+            QuestionAttempt.session_id == SessionQuestion.session_id,
+            QuestionAttempt.question_id == SessionQuestion.question_id
+        )
+    ).filter(
+        SessionQuestion.session_id == session.session_id,
+        QuestionAttempt.attempt_id.is_(None)
+    ).order_by(SessionQuestion.position.asc()).first()
+
+    if next_question is not None:
+        return next_question
+
+    has_stored_set = db.query(SessionQuestion.session_question_id).filter(
+        SessionQuestion.session_id == session.session_id
+    ).first() is not None
+    if has_stored_set:
+        return None
+
+    from app.services.diagnostic_forms import get_diagnostic_form
+
+    questions = get_diagnostic_form(db, session.course_id)
+    if not questions:
+        return None
+
+    assign_session_questions(db, session.session_id, questions)
+    db.commit()
+
+    return get_next_session_question(db, session)
 
 
 def get_already_attempted_question_ids(
@@ -140,6 +209,9 @@ def select_adaptive_question(
     2. Select question with difficulty matching user's competency (±0.1)
     3. Exclude recently answered questions
 
+    Candidates come from the in-memory question bank index (sorted by
+    difficulty), so no ORDER BY random() scans are issued.
+
     Args:
         db: Database session
         user_id: User ID
@@ -152,53 +224,97 @@ def select_adaptive_question(
     if exclude_question_ids is None:
         exclude_question_ids = set()
 
+    bank = get_question_bank(db, course_id)
+
+    return _pick_question(
+        db,
+        course_id,
+        _adaptive_candidate_pools(db, bank, user_id),
+        exclude_question_ids
+    )
+
+
+def _adaptive_candidate_pools(
+    db: Session,
+    bank: CourseQuestionBank,
+    user_id: uuid.UUID
+) -> List[Sequence[str]]:
+    """
+    Build the adaptive candidate pools for a user, in fallback order.
+
+    Reads the user's weakest competency once. Pools are: questions within
+    ±0.1 of that competency in the weakest KA, any question from the
+    weakest KA, then any question from the course. With no competency data
+    only the course-wide pool is returned.
+
+    Args:
+        db: Database session
+        bank: Course question bank
+        user_id: User ID
+
+    Returns:
+        List of question ID pools
+    """
     # Get user's weakest KA
     weakest_competency = db.query(UserCompetency).filter(
         UserCompetency.user_id == user_id
     ).order_by(UserCompetency.competency_score.asc()).first()
 
     if not weakest_competency:
-        # No competency data - return random question
-        question = db.query(Question).filter(
-            Question.course_id == course_id,
-            Question.is_active == True,
-            ~Question.question_id.in_(exclude_question_ids) if exclude_question_ids else True
-        ).order_by(func.random()).first()
-        return question
+        # No competency data - any question from the course
+        return [bank.all_question_ids]
 
     # Target difficulty = user's competency score ± 0.1
     target_difficulty = float(weakest_competency.competency_score)
     difficulty_range_lower = max(0.0, target_difficulty - 0.1)
     difficulty_range_upper = min(1.0, target_difficulty + 0.1)
 
-    # Select question matching difficulty for weakest KA
-    question = db.query(Question).filter(
-        Question.course_id == course_id,
-        Question.ka_id == weakest_competency.ka_id,
-        Question.is_active == True,
-        Question.difficulty >= difficulty_range_lower,
-        Question.difficulty <= difficulty_range_upper,
-        ~Question.question_id.in_(exclude_question_ids) if exclude_question_ids else True
-    ).order_by(func.random()).first()
-
-    # Fallback: if no matching question found, select any from weakest KA
-    if not question:
-        question = db.query(Question).filter(
-            Question.course_id == course_id,
-            Question.ka_id == weakest_competency.ka_id,
-            Question.is_active == True,
-            ~Question.question_id.in_(exclude_question_ids) if exclude_question_ids else True
-        ).order_by(func.random()).first()
-
-    # Final fallback: if still no question, return any question from course
-    if not question:
-        question = db.query(Question).filter(
-            Question.course_id == course_id,
-            Question.is_active == True,
-            ~Question.question_id.in_(exclude_question_ids) if exclude_question_ids else True
-        ).order_by(func.random()).first()
-
-    return question
+    ka_bank = bank.ka(weakest_competency.ka_id)
+
+    return [
+        ka_bank.ids_in_range(difficulty_range_lower, difficulty_range_upper),
+        ka_bank.question_ids,
+        bank.all_question_ids
+    ]
+
+
+def _pick_question(
+    db: Session,
+    course_id: uuid.UUID,
+    candidate_pools: List[Sequence[str]],
+    exclude_question_ids: Set[str]
+) -> Optional[Question]:
+    """
+    Pick a random active question from the first pool that has one.
+
+    Args:
+        db: Database session
+        course_id: Course ID (for invalidating a stale bank)
+        candidate_pools: Question ID pools in fallback order
+        exclude_question_ids: Question IDs to skip
+
+    Returns:
+        Question object, or None if every pool is exhausted
+    """
+    for pool in candidate_pools:
+        skip = set(exclude_question_ids)
+        while True:
+            picked = sample_question_ids(pool, skip)
+            if not picked:
+                break
+
+            question = db.query(Question).filter(
+                Question.question_id == picked[0],
+                Question.is_active == True
+            ).first()
+            if question:
+                return question
+
+            # Stale bank entry - rebuild on next access and try another ID
+            invalidate_question_bank(course_id)
+            skip.add(picked[0])
+
+    return None
 
 
 def select_practice_questions(
@@ -206,13 +322,17 @@ def select_practice_questions(
     user_id: uuid.UUID,
     course_id: uuid.UUID,
     count: int = 10,
-    ka_id: uuid.UUID = None
+    ka_id: uuid.UUID = None,
+    _retried: bool = False
 ) -> List[Question]:
     """
     Select questions for practice session.
 
     Uses adaptive algorithm to focus on weak areas.
 
+    Batched: competencies are read once and the whole set is drawn from the
+    question bank index, then loaded with a single query.
+
     Args:
         db: Database session
         user_id: User ID
@@ -223,27 +343,30 @@ def select_practice_questions(
     Returns:
         List of Question objects
     """
-    questions = []
-    exclude_ids = set()
-
-    for _ in range(count):
-        # If ka_id specified, override adaptive selection
-        if ka_id:
-            question = db.query(Question).filter(
-                Question.course_id == course_id,
-                Question.ka_id == ka_id,
-                Question.is_active == True,
-                ~Question.question_id.in_(exclude_ids) if exclude_ids else True
-            ).order_by(func.random()).first()
-        else:
-            question = select_adaptive_question(db, user_id, course_id, exclude_ids)
-
-        if question:
-            questions.append(question)
-            exclude_ids.add(str(question.question_id))
-        else:
-            # No more questions available
+    bank = get_question_bank(db, course_id)
+
+    # If ka_id specified, override adaptive selection
+    if ka_id:
+        candidate_pools = [bank.ka(ka_id).question_ids]
+    else:
+        candidate_pools = _adaptive_candidate_pools(db, bank, user_id)
+
+    # Fill from each pool in fallback order without repeats - same result as
+    # picking one adaptive question at a time, since competencies don't
+    # change during selection
+    selected_ids = []
+    for pool in candidate_pools:
+        remaining = count - len(selected_ids)
+        if remaining <= 0:
             break
+        selected_ids.extend(sample_question_ids(pool, set(selected_ids), remaining))
+
+    questions = load_active_questions(db, selected_ids)
+
+    if len(questions) < len(selected_ids) and not _retried:
+        # Bank is stale - rebuild once
+        invalidate_question_bank(course_id)
+        return select_practice_questions(db, user_id, course_id, count, ka_id, _retried=True)
 
     return questions
 
@@ -279,9 +402,7 @@ def select_next_question(
         return None
 
     # Get course_id from KA
-    ka = db.query(KnowledgeArea).filter(
-        KnowledgeArea.ka_id == competency.ka_id
-    ).first()
+    ka = get_knowledge_area(db, competency.ka_id)
 
     if not ka:
         return None
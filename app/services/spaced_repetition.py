@@ -6,14 +6,17 @@ Decision #32: SM-2 (SuperMemo-2) algorithm selected
 
 Implements the classic SM-2 algorithm for optimal review scheduling.
 """
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from typing import List, Optional, Dict
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy import Date, Integer, and_, case, cast, event, func, select
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+import threading
+import time
 import uuid
 
-from app.models.spaced_repetition import SpacedRepetitionCard
+from app.core.config import settings
+from app.models.spaced_repetition import SpacedRepetitionCard, ReviewEvent
 from app.models.question import Question
 from app.models.learning import QuestionAttempt
 
@@ -23,7 +26,8 @@ def create_or_update_sr_card(
     user_id: uuid.UUID,
     question_id: uuid.UUID,
     is_correct: bool,
-    quality: Optional[int] = None
+    quality: Optional[int] = None,
+    commit: bool = True
 ) -> SpacedRepetitionCard:
     """
     Create new spaced repetition card or update existing one.
@@ -36,6 +40,7 @@ def create_or_update_sr_card(
         question_id: Question ID
         is_correct: Whether answer was correct
         quality: Optional SM-2 quality rating (0-5). If None, inferred from is_correct.
+        commit: Commit and refresh (False: only flush, caller commits the unit of work)
 
     Returns:
         Created or updated SpacedRepetitionCard
@@ -55,8 +60,8 @@ def create_or_update_sr_card(
 
         # Update existing card with SM-2 algorithm
         updated_card = update_card_sm2(existing_card, quality)
-        db.commit()
-        db.refresh(updated_card)
+        record_review_event(db, updated_card)
+        _flush_or_commit(db, updated_card, commit)
         return updated_card
     else:
         # Create new card
@@ -76,11 +81,45 @@ def create_or_update_sr_card(
         )
 
         db.add(new_card)
-        db.commit()
-        db.refresh(new_card)
+        _flush_or_commit(db, new_card, commit)
         return new_card
 
 
+def _flush_or_commit(db: Session, card: SpacedRepetitionCard, commit: bool) -> None:
+    """Commit and refresh the card, or only flush it into the caller's transaction."""
+    if commit:
+        db.commit()
+        db.refresh(card)
+    else:
+        db.flush()
+
+
+def record_review_event(db: Session, card: SpacedRepetitionCard) -> ReviewEvent:
+    """
+    Append the review just applied to a card to the review event log.
+
+    Call after update_card_sm2, before the caller commits.
+
+    Args:
+        db: Database session
+        card: Card updated by update_card_sm2
+
+    Returns:
+        Added ReviewEvent (not flushed)
+    """
+    review_event = ReviewEvent(
+        user_id=str(card.user_id),
+        card_id=str(card.card_id),
+        question_id=str(card.question_id),
+        quality_rating=card.last_quality_rating,
+        is_successful=card.last_quality_rating >= 3,
+        interval_days=card.interval_days,
+        reviewed_at=card.last_reviewed_at
+    )
+    db.add(review_event)
+    return review_event
+
+
 def update_card_sm2(
     card: SpacedRepetitionCard,
     quality: int
@@ -137,7 +176,7 @@ def update_card_sm2(
     card.next_review_at = datetime.now(timezone.utc) + timedelta(days=card.interval_days)
     card.last_reviewed_at = datetime.now(timezone.utc)
 
-    # Step 4: Mark as not due (will become due when next_review_at passes)
+    # Step 4: Mark as not due (queries read due-ness from next_review_at)
     card.is_due = False
 
     # Step 5: Record attempt statistics
@@ -179,9 +218,9 @@ def get_due_cards(
     """
     Get spaced repetition cards due for review.
 
-    A card is "due" if:
-    - next_review_at <= current time
-    - is_due flag is True (computed field)
+    A card is "due" if next_review_at <= current time. Due-ness is computed
+    at read time (no is_due write-back), so this is a single range scan on
+    idx_sr_cards_user_next_review.
 
     Cards are ordered by:
     1. Overdue cards first (oldest first)
@@ -197,26 +236,107 @@ def get_due_cards(
     """
     now = datetime.now(timezone.utc)
 
-    # Update is_due flags first
-    db.query(SpacedRepetitionCard).filter(
-        and_(
-            SpacedRepetitionCard.user_id == str(user_id),
-            SpacedRepetitionCard.next_review_at <= now
-        )
-    ).update({SpacedRepetitionCard.is_due: True}, synchronize_session=False)
-    db.commit()
-
-    # Get due cards ordered by priority
-    due_cards = db.query(SpacedRepetitionCard).filter(
-        and_(
-            SpacedRepetitionCard.user_id == str(user_id),
-            SpacedRepetitionCard.is_due == True
-        )
+    return db.query(SpacedRepetitionCard).filter(
+        SpacedRepetitionCard.user_id == str(user_id),
+        SpacedRepetitionCard.next_review_at <= now
     ).order_by(
         SpacedRepetitionCard.next_review_at.asc()  # Oldest overdue first
     ).limit(limit).all()
 
-    return due_cards
+
+class ReviewStatsCache:
+    """
+    Thread-safe, short-TTL cache of review statistics keyed by user_id.
+
+    A TTL of 0 disables caching. Expired entries are pruned once the cache
+    grows past max_entries.
+    """
+
+    def __init__(self, ttl_seconds: int, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id) -> Optional[Dict]:
+        """Get cached statistics for a user, or None if missing or expired."""
+        if self.ttl_seconds <= 0:
+            return None
+        entry = self._entries.get(str(user_id))
+        if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds:
+            return None
+        return entry[1]
+
+    def set(self, user_id, stats: Dict) -> None:
+        """Store statistics for a user."""
+        if self.ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {
+                    key: entry for key, entry in self._entries.items()
+                    if now - entry[0] < self.ttl_seconds
+                }
+            self._entries[str(user_id)] = (now, stats)
+
+    def invalidate(self, user_id=None) -> None:
+        """
+        Drop cached statistics.
+
+        Args:
+            user_id: User to invalidate, or None for all users
+        """
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(user_id), None)
+
+
+# Process-wide statistics cache
+review_stats_cache = ReviewStatsCache(ttl_seconds=settings.REVIEW_STATS_CACHE_TTL_SECONDS)
+
+
+def invalidate_review_statistics(user_id=None) -> None:
+    """
+    Invalidate cached review statistics after a user's cards change.
+
+    Args:
+        user_id: User whose cards changed, or None for all users
+    """
+    review_stats_cache.invalidate(user_id)
+
+
+_REVIEW_STATS_CHANGED = "changed_review_stats_user_ids"
+
+
+def _mark_review_statistics_changed(target) -> None:
+    """Remember a user whose cached statistics must be dropped when the transaction commits."""
+    session = object_session(target)
+    if session is not None and target.user_id is not None:
+        session.info.setdefault(_REVIEW_STATS_CHANGED, set()).add(str(target.user_id))
+
+
+# Invalidating before the commit would let a concurrent request re-cache the
+# pre-commit statistics for the whole TTL, so only committed writes invalidate.
+for _model, _events in ((SpacedRepetitionCard, ("after_insert", "after_update", "after_delete")),
+                        (ReviewEvent, ("after_insert",))):
+    for _event in _events:
+        event.listen(_model, _event, lambda mapper, connection, target: _mark_review_statistics_changed(target))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_review_statistics(session: Session) -> None:
+    """Drop cached statistics of users whose cards changed in the committed transaction."""
+    for user_id in session.info.pop(_REVIEW_STATS_CHANGED, ()):
+        review_stats_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_review_statistics(session: Session) -> None:
+    """Changes were rolled back, so cached statistics are still valid."""
+    session.info.pop(_REVIEW_STATS_CHANGED, None)
 
 
 def get_review_statistics(
@@ -226,123 +346,136 @@ def get_review_statistics(
     """
     Get overall spaced repetition statistics for user.
 
+    All card statistics come from one conditional-aggregation query
+    (COUNT(*) FILTER, AVG) over the user's cards. Results are cached per
+    user for REVIEW_STATS_CACHE_TTL_SECONDS; committed card or review
+    event writes invalidate the entry.
+
+    Args:
+        db: Database session
+        user_id: User ID
+
     Returns:
         Dictionary with review statistics
     """
-    # Total cards
-    total_cards = db.query(SpacedRepetitionCard).filter(
-        SpacedRepetitionCard.user_id == str(user_id)
-    ).count()
-
-    # Cards due today
-    today_end = datetime.now(timezone.utc).replace(hour=23, minute=59, second=59)
-    cards_due_today = db.query(SpacedRepetitionCard).filter(
-        and_(
-            SpacedRepetitionCard.user_id == str(user_id),
-            SpacedRepetitionCard.next_review_at <= today_end
-        )
-    ).count()
+    cached = review_stats_cache.get(user_id)
+    if cached is not None:
+        return dict(cached)
 
-    # Cards due this week
-    week_end = datetime.now(timezone.utc) + timedelta(days=7)
-    cards_due_this_week = db.query(SpacedRepetitionCard).filter(
-        and_(
-            SpacedRepetitionCard.user_id == str(user_id),
-            SpacedRepetitionCard.next_review_at <= week_end
-        )
-    ).count()
-
-    # Mastered cards (EF >= 2.5 and interval >= 30 days)
-    cards_mastered = db.query(SpacedRepetitionCard).filter(
-        and_(
-            SpacedRepetitionCard.user_id == str(user_id),
+    now = datetime.now(timezone.utc)
+    today_end = now.replace(hour=23, minute=59, second=59)
+    week_end = now + timedelta(days=7)
+
+    success_rate = case(
+        (
+            SpacedRepetitionCard.total_reviews > 0,
+            SpacedRepetitionCard.successful_reviews * 100.0 / SpacedRepetitionCard.total_reviews
+        ),
+        else_=0
+    )
+
+    row = db.query(
+        func.count().label('total_cards'),
+        func.count().filter(SpacedRepetitionCard.next_review_at <= today_end).label('cards_due_today'),
+        func.count().filter(SpacedRepetitionCard.next_review_at <= week_end).label('cards_due_this_week'),
+        # Mastered cards (EF >= 2.5 and interval >= 30 days)
+        func.count().filter(
             SpacedRepetitionCard.easiness_factor >= 2.5,
             SpacedRepetitionCard.interval_days >= 30
-        )
-    ).count()
-
-    # Total reviews completed
-    total_reviews = db.query(
-        func.sum(SpacedRepetitionCard.total_reviews)
+        ).label('cards_mastered'),
+        func.coalesce(func.sum(SpacedRepetitionCard.total_reviews), 0).label('total_reviews'),
+        func.avg(success_rate).label('avg_success_rate')
     ).filter(
         SpacedRepetitionCard.user_id == str(user_id)
-    ).scalar() or 0
-
-    # Average success rate
-    cards = db.query(SpacedRepetitionCard).filter(
-        SpacedRepetitionCard.user_id == str(user_id)
-    ).all()
+    ).one()
 
-    if cards:
-        success_rates = [
-            (card.successful_reviews / card.total_reviews * 100) if card.total_reviews > 0 else 0
-            for card in cards
-        ]
-        avg_success_rate = sum(success_rates) / len(success_rates) if success_rates else 0.0
-    else:
-        avg_success_rate = 0.0
-
-    # Calculate streak (simplified - consecutive days with reviews)
-    # For MVP, we'll use a simple heuristic
-    current_streak = calculate_review_streak(db, user_id)
+    # Streaks from the review event log
+    activity = get_review_activity(db, user_id)
 
     # Daily review target (aim for all due cards)
-    daily_review_target = min(cards_due_today, 20)  # Cap at 20 per day
+    daily_review_target = min(row.cards_due_today, 20)  # Cap at 20 per day
 
     # Estimated daily minutes (2 min per card average)
     estimated_daily_minutes = daily_review_target * 2
 
-    return {
-        'total_cards': total_cards,
-        'cards_due_today': cards_due_today,
-        'cards_due_this_week': cards_due_this_week,
-        'cards_mastered': cards_mastered,
-        'total_reviews_completed': int(total_reviews),
-        'average_success_rate': round(avg_success_rate, 1),
-        'current_streak_days': current_streak,
+    stats = {
+        'total_cards': row.total_cards,
+        'cards_due_today': row.cards_due_today,
+        'cards_due_this_week': row.cards_due_this_week,
+        'cards_mastered': row.cards_mastered,
+        'total_reviews_completed': int(row.total_reviews),
+        'average_success_rate': round(float(row.avg_success_rate or 0.0), 1),
+        'current_streak_days': activity['current_streak_days'],
+        'longest_streak_days': activity['longest_streak_days'],
         'daily_review_target': daily_review_target,
         'estimated_daily_minutes': estimated_daily_minutes
     }
+    review_stats_cache.set(user_id, stats)
+    return dict(stats)
 
 
-def calculate_review_streak(db: Session, user_id: uuid.UUID) -> int:
+def get_review_activity(db: Session, user_id: uuid.UUID) -> Dict:
     """
-    Calculate consecutive days with reviews.
+    Get review streaks and per-day review counts from the review event log.
+
+    One gaps-and-islands window query: reviews are grouped by UTC day, and
+    consecutive days share the same (day - row_number) island key, so each
+    day row carries the length of the run it belongs to.
 
-    Simplified for MVP: Count backwards from today to find consecutive days
-    with at least one review.
+    The current streak is the run ending today (0 if nothing was reviewed
+    today).
 
     Args:
         db: Database session
         user_id: User ID
 
     Returns:
-        Number of consecutive days with reviews
+        Dict with current_streak_days, longest_streak_days and
+        daily_counts ({date: reviews}, most recent day first)
     """
-    streak = 0
-    check_date = datetime.now(timezone.utc).date()
-
-    # Check up to 365 days back
-    for _ in range(365):
-        # Check if any card was reviewed on this date
-        day_start = datetime.combine(check_date, datetime.min.time())
-        day_end = datetime.combine(check_date, datetime.max.time())
-
-        reviewed_today = db.query(SpacedRepetitionCard).filter(
-            and_(
-                SpacedRepetitionCard.user_id == str(user_id),
-                SpacedRepetitionCard.last_reviewed_at >= day_start,
-                SpacedRepetitionCard.last_reviewed_at <= day_end
-            )
-        ).first()
-
-        if reviewed_today:
-            streak += 1
-            check_date -= timedelta(days=1)
-        else:
-            break
+    day = cast(func.timezone('UTC', ReviewEvent.reviewed_at), Date).label('day')
+    days = select(
+        day,
+        func.count().label('reviews')
+    ).where(
+        ReviewEvent.user_id == str(user_id)
+    ).group_by(day).subquery()
+
+    islands = select(
+        days.c.day,
+        days.c.reviews,
+        (days.c.day - cast(func.row_number().over(order_by=days.c.day), Integer)).label('island')
+    ).subquery()
+
+    rows = db.execute(
+        select(
+            islands.c.day,
+            islands.c.reviews,
+            func.count().over(partition_by=islands.c.island).label('run_length')
+        ).order_by(islands.c.day.desc())
+    ).all()
+
+    today = datetime.now(timezone.utc).date()
+
+    return {
+        'current_streak_days': rows[0].run_length if rows and rows[0].day == today else 0,
+        'longest_streak_days': max((row.run_length for row in rows), default=0),
+        'daily_counts': {row.day: row.reviews for row in rows}
+    }
 
-    return streak
+
+def calculate_review_streak(db: Session, user_id: uuid.UUID) -> int:
+    """
+    Calculate consecutive days with reviews, ending today.
+
+    Args:
+        db: Database session
+        user_id: User ID
+
+    Returns:
+        Number of consecutive days with reviews
+    """
+    return get_review_activity(db, user_id)['current_streak_days']
 
 
 def get_feedback_message(quality: int, interval_days: int) -> str:
@@ -572,6 +705,7 @@ def process_card_review(
         db = card_data_or_db
         card = quality_or_card
         updated_card = update_card_sm2(card, review_date if isinstance(review_date, int) else 4)
+        record_review_event(db, updated_card)
         db.commit()
         db.refresh(updated_card)
         return updated_card
@@ -7,11 +7,13 @@ Decision #10: 7-question onboarding flow.
 from datetime import date, datetime
 from typing import Optional, List
 from sqlalchemy.orm import Session
+from sqlalchemy import func, exists
 from fastapi import HTTPException, status
-from app.models.user import User, UserProfile
+from app.models.user import User, UserProfile, UserSearchToken
 from app.models.course import Course
 from app.models.learning import UserCompetency
 from app.schemas.user import UserProfileCreate, UserProfileUpdate
+from app.utils.encryption import blind_index, decrypt_field, search_query_hashes
 import uuid
 
 
@@ -184,3 +186,143 @@ def get_user_with_profile(db: Session, user_id: uuid.UUID) -> User:
 
     # Profile will be loaded via relationship
     return user
+
+
+def get_user_by_email(db: Session, email: str) -> Optional[User]:
+    """
+    Look up a user by plaintext email.
+
+    Decision #59: Emails are Fernet-encrypted, so the lookup goes through the
+    email_hash blind index (single indexed query, no decryption).
+
+    Args:
+        db: Database session
+        email: Plaintext email (case-insensitive)
+
+    Returns:
+        User if found, None otherwise
+    """
+    if not email:
+        return None
+
+    return db.query(User).filter(User.email_hash == blind_index(email)).first()
+
+
+def backfill_email_hashes(db: Session, batch_size: int = 500) -> int:
+    """
+    Populate email_hash for users created before the blind index existed.
+
+    Walks users with a NULL email_hash in primary-key order, decrypting each
+    email once and committing per batch so the job can be stopped and re-run.
+
+    Args:
+        db: Database session
+        batch_size: Users per batch/commit
+
+    Returns:
+        Number of users updated
+    """
+    updated = 0
+    last_user_id = ""
+
+    while True:
+        batch = db.query(User).filter(
+            User.email_hash.is_(None),
+            User.user_id > last_user_id
+        ).order_by(User.user_id.asc()).limit(batch_size).all()
+
+        if not batch:
+            break
+
+        for user in batch:
+            try:
+                user.email_hash = blind_index(decrypt_field(user._email))
+                updated += 1
+            except ValueError:
+                # Undecryptable rows stay NULL and are reported by the script
+                continue
+
+        last_user_id = batch[-1].user_id
+        db.commit()
+
+    return updated
+
+
+# PII fields covered by admin search (see UserSearchToken)
+SEARCHABLE_USER_FIELDS = ('email', 'first_name', 'last_name')
+
+
+def user_search_subquery(db: Session, search: str):
+    """
+    Build a subquery of user_ids whose email or name contains the search term.
+
+    Decision #59: Matches blind search tokens instead of decrypting PII.
+    A user matches when one field holds every token of the term. Trigram
+    matching can, rarely, return a user whose field has all the trigrams
+    but not the exact substring.
+
+    Args:
+        db: Database session
+        search: Plaintext search term
+
+    Returns:
+        Subquery selecting matching user_id values, or None for a blank term
+    """
+    hashes_by_field = {field: search_query_hashes(field, search) for field in SEARCHABLE_USER_FIELDS}
+    required_tokens = len(hashes_by_field['email'])
+    if required_tokens == 0:
+        return None
+
+    all_hashes = set().union(*hashes_by_field.values())
+
+    return db.query(UserSearchToken.user_id).filter(
+        UserSearchToken.token_hash.in_(all_hashes)
+    ).group_by(
+        UserSearchToken.user_id,
+        UserSearchToken.field
+    ).having(
+        func.count(func.distinct(UserSearchToken.token_hash)) == required_tokens
+    ).subquery()
+
+
+def backfill_search_tokens(db: Session, batch_size: int = 500) -> int:
+    """
+    Create search tokens for users that predate the user_search_tokens table.
+
+    Re-assigns each decrypted PII field through the User hybrid setters,
+    which rewrites the ciphertext and its tokens. Re-runnable: only users
+    without any tokens are processed.
+
+    Args:
+        db: Database session
+        batch_size: Users per batch/commit
+
+    Returns:
+        Number of users updated
+    """
+    updated = 0
+    last_user_id = ""
+    has_tokens = exists().where(UserSearchToken.user_id == User.user_id)
+
+    while True:
+        batch = db.query(User).filter(
+            ~has_tokens,
+            User.user_id > last_user_id
+        ).order_by(User.user_id.asc()).limit(batch_size).all()
+
+        if not batch:
+            break
+
+        for user in batch:
+            try:
+                user.email = decrypt_field(user._email)
+                user.first_name = decrypt_field(user._first_name)
+                user.last_name = decrypt_field(user._last_name)
+                updated += 1
+            except ValueError:
+                continue
+
+        last_user_id = batch[-1].user_id
+        db.commit()
+
+    return updated
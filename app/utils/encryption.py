@@ -1,16 +1,174 @@
 """
 Field-level encryption utilities for PII (Personally Identifiable Information).
-Uses Fernet (AES-128-CBC) for symmetric encryption.
 
 Decision #59: All PII fields (email, names) are encrypted at rest.
+
+Ciphertexts are versioned text envelopes:
+- v2 (current): "v2:" + urlsafe-base64(nonce || AES-256-GCM ciphertext+tag)
+- v1 (legacy): bare Fernet token (AES-128-CBC + HMAC-SHA256), "gAAAA..."
+
+New values are written as v2 unless PII_ENCRYPTION_FORMAT is 'fernet'
+(e.g. while older workers that only read Fernet are still running). Both
+formats always decrypt, so existing rows migrate lazily as they are
+rewritten. encrypt_many/decrypt_many are list conveniences for exports and
+bulk jobs; they cost the same per value as encrypt_field/decrypt_field.
+
+Encrypted values are non-deterministic, so encrypted columns cannot be
+queried directly. Lookups go through a blind index instead: a keyed
+HMAC-SHA256 of the normalized plaintext, stored next to the ciphertext.
+
+Decrypted values read through the User model go through a bounded,
+process-local ciphertext -> plaintext cache (decrypt_field_cached), so
+serializing the same users repeatedly doesn't pay for decryption each
+time. Call wipe_decryption_cache when rotating ENCRYPTION_KEY.
+
+Key rotation (MultiFernet-style): new values are encrypted with
+ENCRYPTION_KEY, and values under any key in ENCRYPTION_OLD_KEYS still
+decrypt. app/services/pii_rotation.py rewrites stored values under the
+new key so old keys can be retired.
 """
-from cryptography.fernet import Fernet
+from collections import OrderedDict
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from app.core.config import settings
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import base64
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+
+# v2 envelope
+AESGCM_PREFIX = "v2:"
+_AESGCM_NONCE_BYTES = 12
+_AESGCM_AAD = b"learnr-pii"
+
+
+class _EncryptionKey:
+    """Fernet and AES-GCM ciphers for one configured ENCRYPTION_KEY."""
+
+    __slots__ = ("fernet", "aesgcm")
+
+    def __init__(self, key: str):
+        self.fernet = Fernet(key.encode())
+        # The AES-256-GCM key is derived so the Fernet key bytes are never
+        # reused directly by another cipher.
+        self.aesgcm = AESGCM(hmac.new(key.encode(), b"learnr-aes-gcm-v2", hashlib.sha256).digest())
+
+
+def configured_encryption_keys() -> List[str]:
+    """
+    Get the encryption keys in use, primary first.
+
+    ENCRYPTION_KEY encrypts new values; ENCRYPTION_OLD_KEYS (comma-separated,
+    newest first) only decrypt values written before a rotation.
+    """
+    old_keys = [key.strip() for key in settings.ENCRYPTION_OLD_KEYS.split(",") if key.strip()]
+    return [settings.ENCRYPTION_KEY] + old_keys
+
+
+def _build_key_ring(keys: List[str]) -> Tuple[List[_EncryptionKey], MultiFernet]:
+    """Ciphers for each key, plus a MultiFernet over all of them (primary first)."""
+    ring = [_EncryptionKey(key) for key in keys]
+    return ring, MultiFernet([key.fernet for key in ring])
+
+
+def configure_encryption_keys(keys: List[str]) -> None:
+    """
+    Load the key ring (MultiFernet-style: encrypt with keys[0], decrypt with any).
+
+    Args:
+        keys: Fernet keys, primary first
+    """
+    global _keys, _cipher
+    _keys, _cipher = _build_key_ring(keys)
+
+
+_keys, _cipher = _build_key_ring(configured_encryption_keys())
+
+# Raw blind index keys can be given as BLIND_INDEX_KEY=hex:<64 hex chars>
+BLIND_INDEX_KEY_HEX_PREFIX = "hex:"
+
+
+def _derive_blind_index_key() -> bytes:
+    """
+    Get the HMAC key used for blind indexes.
+
+    Uses BLIND_INDEX_KEY when set. Otherwise derives a separate key from
+    ENCRYPTION_KEY so the raw Fernet key is never used as an HMAC key.
+
+    A derived key would change with ENCRYPTION_KEY and silently invalidate
+    every email_hash and search token, so once ENCRYPTION_OLD_KEYS is in use
+    (a rotation) BLIND_INDEX_KEY is required. Pin the current key before
+    rotating with export_blind_index_key().
+
+    Raises:
+        RuntimeError: If ENCRYPTION_OLD_KEYS is set without BLIND_INDEX_KEY
+    """
+    if settings.BLIND_INDEX_KEY:
+        if settings.BLIND_INDEX_KEY.startswith(BLIND_INDEX_KEY_HEX_PREFIX):
+            return bytes.fromhex(settings.BLIND_INDEX_KEY[len(BLIND_INDEX_KEY_HEX_PREFIX):])
+        return settings.BLIND_INDEX_KEY.encode()
+    if settings.ENCRYPTION_OLD_KEYS.strip():
+        raise RuntimeError(
+            "BLIND_INDEX_KEY must be set when ENCRYPTION_OLD_KEYS is used: the blind index key "
+            "is otherwise derived from ENCRYPTION_KEY and would change with the rotation. "
+            "Before rotating, set BLIND_INDEX_KEY to the output of "
+            "`python scripts/reencrypt_pii.py --print-blind-index-key`."
+        )
+    return hmac.new(settings.ENCRYPTION_KEY.encode(), b"learnr-blind-index-v1", hashlib.sha256).digest()
+
+
+_blind_index_key = _derive_blind_index_key()
+
+
+def export_blind_index_key() -> str:
+    """
+    Get the blind index key in use as a BLIND_INDEX_KEY value.
+
+    Returns:
+        "hex:" + hex-encoded key (reproduces derived keys exactly)
+    """
+    return BLIND_INDEX_KEY_HEX_PREFIX + _blind_index_key.hex()
+
+
+def _encrypt_aesgcm(plaintext: bytes, nonce: bytes) -> str:
+    """Seal one value into a v2 envelope with the primary key."""
+    sealed = _keys[0].aesgcm.encrypt(nonce, plaintext, _AESGCM_AAD)
+    return AESGCM_PREFIX + base64.urlsafe_b64encode(nonce + sealed).decode()
+
+
+def _open_value(value: str) -> Tuple[str, bool]:
+    """
+    Open a v2 envelope or a legacy Fernet token with any configured key.
+
+    Returns:
+        (plaintext, whether the value is already in the current format under the primary key)
+    """
+    if value.startswith(AESGCM_PREFIX):
+        raw = base64.urlsafe_b64decode(value[len(AESGCM_PREFIX):])
+        nonce, sealed = raw[:_AESGCM_NONCE_BYTES], raw[_AESGCM_NONCE_BYTES:]
+        for index, key in enumerate(_keys):
+            try:
+                plaintext = key.aesgcm.decrypt(nonce, sealed, _AESGCM_AAD).decode()
+            except InvalidTag:
+                continue
+            return plaintext, index == 0 and settings.PII_ENCRYPTION_FORMAT != 'fernet'
+        raise InvalidTag()
+
+    try:
+        plaintext = _keys[0].fernet.decrypt(value.encode()).decode()
+        return plaintext, settings.PII_ENCRYPTION_FORMAT == 'fernet'
+    except InvalidToken:
+        return _cipher.decrypt(value.encode()).decode(), False
 
 
-# Initialize Fernet cipher with key from environment
-_cipher = Fernet(settings.ENCRYPTION_KEY.encode())
+def _decrypt_value(value: str) -> str:
+    """Open a v2 envelope or a legacy Fernet token."""
+    return _open_value(value)[0]
 
 
 def encrypt_field(value: str) -> str:
@@ -21,13 +179,14 @@ def encrypt_field(value: str) -> str:
         value: Plaintext string to encrypt
 
     Returns:
-        Encrypted string (base64 encoded)
+        Encrypted string (v2 envelope, or Fernet token if PII_ENCRYPTION_FORMAT is 'fernet')
     """
     if not value:
         return value
 
-    encrypted = _cipher.encrypt(value.encode())
-    return encrypted.decode()
+    if settings.PII_ENCRYPTION_FORMAT == 'fernet':
+        return _cipher.encrypt(value.encode()).decode()
+    return _encrypt_aesgcm(value.encode(), os.urandom(_AESGCM_NONCE_BYTES))
 
 
 def decrypt_field(value: Optional[str]) -> str:
@@ -35,7 +194,7 @@ def decrypt_field(value: Optional[str]) -> str:
     Decrypt a string field.
 
     Args:
-        value: Encrypted string (base64 encoded)
+        value: Encrypted string (v2 envelope or legacy Fernet token)
 
     Returns:
         Decrypted plaintext string
@@ -44,13 +203,276 @@ def decrypt_field(value: Optional[str]) -> str:
         return value
 
     try:
-        decrypted = _cipher.decrypt(value.encode())
-        return decrypted.decode()
+        return _decrypt_value(value)
     except Exception as e:
         # Log error but don't expose encryption details
         raise ValueError("Failed to decrypt field") from e
 
 
+def encrypt_many(values: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """
+    Encrypt a list of string fields (one encrypt_field call per value).
+
+    Args:
+        values: Plaintext strings (empty values pass through)
+
+    Returns:
+        Encrypted strings, in input order
+    """
+    return [encrypt_field(value) for value in values]
+
+
+def decrypt_many(values: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """
+    Decrypt a list of string fields (any mix of v2 and Fernet values).
+
+    Unlike decrypt_field per value, the whole list fails if one value does.
+
+    Args:
+        values: Encrypted strings (empty values pass through)
+
+    Returns:
+        Plaintext strings, in input order
+
+    Raises:
+        ValueError: If any value fails to decrypt
+    """
+    try:
+        return [_decrypt_value(value) if value else value for value in values]
+    except Exception as e:
+        raise ValueError("Failed to decrypt field") from e
+
+
+def reencrypt_field(value: Optional[str]) -> Optional[str]:
+    """
+    Re-encrypt a value with the primary key and current format (key rotation).
+
+    Args:
+        value: Encrypted string under any configured key
+
+    Returns:
+        New ciphertext, or None if the value is empty or already current
+
+    Raises:
+        ValueError: If no configured key decrypts the value
+    """
+    if not value:
+        return None
+    try:
+        plaintext, current = _open_value(value)
+    except Exception as e:
+        raise ValueError("Failed to decrypt field") from e
+    return None if current else encrypt_field(plaintext)
+
+
+def is_legacy_ciphertext(value: Optional[str]) -> bool:
+    """Whether a stored value is still a Fernet token (not yet migrated to v2)."""
+    return bool(value) and not value.startswith(AESGCM_PREFIX)
+
+
+class DecryptionCache:
+    """
+    Thread-safe LRU of ciphertext -> plaintext with a TTL.
+
+    Ciphertexts are unique per encryption, so an entry can only be
+    hit by the exact value stored in the database; a changed field gets a
+    new ciphertext and a new entry.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are kept at all (size and TTL both non-zero)."""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, ciphertext: str) -> Optional[str]:
+        """
+        Get the cached plaintext for a ciphertext, counting a hit or miss.
+
+        Args:
+            ciphertext: Encrypted value
+
+        Returns:
+            Plaintext, or None on miss or expiry
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(ciphertext)
+            if entry is not None and now - entry[0] < self.ttl_seconds:
+                self._entries.move_to_end(ciphertext)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[ciphertext]
+            self.misses += 1
+            return None
+
+    def set(self, ciphertext: str, plaintext: str) -> None:
+        """Store a decrypted value, evicting the least recently used entries when full."""
+        with self._lock:
+            self._entries[ciphertext] = (time.monotonic(), plaintext)
+            self._entries.move_to_end(ciphertext)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def wipe(self) -> None:
+        """Drop all plaintext entries (key rotation, tests)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters and current size, for sizing the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries
+            }
+
+
+# Process-wide cache instance
+decryption_cache = DecryptionCache(
+    max_entries=settings.PII_DECRYPT_CACHE_SIZE,
+    ttl_seconds=settings.PII_DECRYPT_CACHE_TTL_SECONDS
+)
+
+
+def decrypt_field_cached(value: Optional[str]) -> str:
+    """
+    Decrypt a string field through the process-wide decryption cache.
+
+    Failed decryptions are not cached.
+
+    Args:
+        value: Encrypted string (base64 encoded)
+
+    Returns:
+        Decrypted plaintext string
+    """
+    if not value or not decryption_cache.enabled:
+        return decrypt_field(value)
+
+    plaintext = decryption_cache.get(value)
+    if plaintext is None:
+        plaintext = decrypt_field(value)
+        decryption_cache.set(value, plaintext)
+    return plaintext
+
+
+def wipe_decryption_cache() -> None:
+    """
+    Drop all cached plaintext.
+
+    Call after rotating ENCRYPTION_KEY so no value decrypted under the old
+    key outlives the rotation in memory.
+    """
+    decryption_cache.wipe()
+
+
+def decryption_cache_stats() -> Dict[str, float]:
+    """Get hits, misses, hit rate and size of the decryption cache."""
+    return decryption_cache.stats()
+
+
+def normalize_for_index(value: str) -> str:
+    """
+    Normalize a value before blind indexing.
+
+    Lookups are case-insensitive and ignore surrounding whitespace,
+    matching how emails were compared before the index existed.
+    """
+    return value.strip().lower()
+
+
+def blind_index(value: Optional[str]) -> Optional[str]:
+    """
+    Compute a deterministic blind index for a PII value.
+
+    Args:
+        value: Plaintext value (e.g., email)
+
+    Returns:
+        Hex-encoded HMAC-SHA256 of the normalized value (64 chars)
+    """
+    if not value:
+        return value
+
+    digest = hmac.new(_blind_index_key, normalize_for_index(value).encode(), hashlib.sha256)
+    return digest.hexdigest()
+
+
+# Searchable encryption (admin user search)
+# Substring search runs over keyed hashes of character trigrams. Values also
+# get 1- and 2-character prefix tokens so short search terms still match the
+# start of a field.
+SEARCH_GRAM_SIZE = 3
+
+
+def _search_token(field: str, gram: str) -> str:
+    """Keyed hash of one gram, namespaced by field so fields don't correlate."""
+    return hmac.new(_blind_index_key, f"{field}:{gram}".encode(), hashlib.sha256).hexdigest()
+
+
+def search_token_hashes(field: str, value: Optional[str]) -> Set[str]:
+    """
+    Build the blind search tokens stored for a PII field.
+
+    Args:
+        field: Field name ('email', 'first_name', 'last_name')
+        value: Plaintext value
+
+    Returns:
+        Set of hex-encoded token hashes (trigrams plus short prefixes)
+    """
+    if not value:
+        return set()
+
+    normalized = normalize_for_index(value)
+    grams = {normalized[:size] for size in range(1, SEARCH_GRAM_SIZE) if len(normalized) >= size}
+    grams.update(
+        normalized[i:i + SEARCH_GRAM_SIZE]
+        for i in range(len(normalized) - SEARCH_GRAM_SIZE + 1)
+    )
+    return {_search_token(field, gram) for gram in grams}
+
+
+def search_query_hashes(field: str, term: str) -> Set[str]:
+    """
+    Build the token hashes a field must contain to match a search term.
+
+    Terms of 3+ characters match anywhere in the value (all trigrams present).
+    Shorter terms match the start of the value.
+
+    Args:
+        field: Field name
+        term: Plaintext search term
+
+    Returns:
+        Set of hex-encoded token hashes (empty if term is blank)
+    """
+    normalized = normalize_for_index(term or "")
+    if not normalized:
+        return set()
+
+    if len(normalized) < SEARCH_GRAM_SIZE:
+        return {_search_token(field, normalized)}
+
+    return {
+        _search_token(field, normalized[i:i + SEARCH_GRAM_SIZE])
+        for i in range(len(normalized) - SEARCH_GRAM_SIZE + 1)
+    }
+
+
 def generate_encryption_key() -> str:
     """
     Generate a new encryption key for ENCRYPTION_KEY environment variable.
@@ -3,12 +3,21 @@ Security utilities for authentication and authorization.
 Includes password hashing (Argon2id) and JWT token management.
 
 Decision #53: Argon2id for password hashing (memory-hard, GPU-resistant)
+
+Request handlers hash through password_hash_pool, which caps concurrent
+Argon2 hashes per worker (each one allocates 64 MB) and sheds excess load:
+429 when too many requests are already queued, 503 when a queued request
+waits longer than PASSWORD_HASH_WAIT_TIMEOUT_SECONDS.
 """
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict
+from typing import Any, Callable, Dict, Optional
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from app.core.config import settings
+import math
+import threading
+import time
 
 # Password hashing context (Argon2id)
 pwd_context = CryptContext(
@@ -47,6 +56,157 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class PasswordHashPool:
+    """
+    Semaphore-gated admission control for password hashing.
+
+    Hashes run on the calling (threadpool) thread once a slot is free;
+    argon2 releases the GIL, so up to max_concurrent hashes run in
+    parallel. Callers beyond that wait for a slot, up to max_waiting of
+    them for at most wait_timeout_seconds.
+    """
+
+    def __init__(self, max_concurrent: int, max_waiting: int, wait_timeout_seconds: float):
+        self.max_concurrent = max_concurrent
+        self.max_waiting = max_waiting
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._latency: Dict[str, Dict[str, float]] = {}
+
+    def run(self, operation: str, fn: Callable[..., Any], *args) -> Any:
+        """
+        Run a hash function once a slot is free.
+
+        Args:
+            operation: Metrics label ('login', 'register', 'change_password')
+            fn: Hash or verify function
+            *args: Arguments for fn
+
+        Returns:
+            fn's return value
+
+        Raises:
+            HTTPException: 429 if the wait queue is full, 503 if no slot
+                freed up within wait_timeout_seconds
+        """
+        started = time.monotonic()
+
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.max_waiting:
+                    self.rejected += 1
+                    raise HTTPException(
+                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                        detail="Too many authentication requests. Please retry shortly.",
+                        headers={"Retry-After": "1"}
+                    )
+                self.waiting += 1
+
+            acquired = self._slots.acquire(timeout=self.wait_timeout_seconds)
+
+            with self._lock:
+                self.waiting -= 1
+                if not acquired:
+                    self.timed_out += 1
+            if not acquired:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is temporarily overloaded. Please retry shortly.",
+                    headers={"Retry-After": str(max(1, math.ceil(self.wait_timeout_seconds)))}
+                )
+
+        with self._lock:
+            self.in_flight += 1
+        hash_started = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.monotonic()
+            self._slots.release()
+            with self._lock:
+                self.in_flight -= 1
+                self._record(operation, hash_started - started, finished - hash_started)
+
+    def _record(self, operation: str, wait_seconds: float, hash_seconds: float) -> None:
+        """Accumulate latency for one operation (caller holds the lock)."""
+        latency = self._latency.setdefault(
+            operation, {'count': 0, 'wait_seconds': 0.0, 'hash_seconds': 0.0, 'max_hash_seconds': 0.0}
+        )
+        latency['count'] += 1
+        latency['wait_seconds'] += wait_seconds
+        latency['hash_seconds'] += hash_seconds
+        latency['max_hash_seconds'] = max(latency['max_hash_seconds'], hash_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, shed counts and per-operation latency."""
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'in_flight': self.in_flight,
+                'waiting': self.waiting,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out,
+                'operations': {
+                    operation: {
+                        'count': latency['count'],
+                        'avg_wait_ms': round(latency['wait_seconds'] / latency['count'] * 1000, 2),
+                        'avg_hash_ms': round(latency['hash_seconds'] / latency['count'] * 1000, 2),
+                        'max_hash_ms': round(latency['max_hash_seconds'] * 1000, 2)
+                    }
+                    for operation, latency in self._latency.items()
+                }
+            }
+
+
+# Process-wide pool instance
+password_hash_pool = PasswordHashPool(
+    max_concurrent=settings.PASSWORD_HASH_MAX_CONCURRENT,
+    max_waiting=settings.PASSWORD_HASH_MAX_WAITING,
+    wait_timeout_seconds=settings.PASSWORD_HASH_WAIT_TIMEOUT_SECONDS
+)
+
+
+def hash_password_limited(password: str, operation: str) -> str:
+    """
+    Hash a password through the admission-controlled pool.
+
+    Use from request handlers; scripts and bootstrap call get_password_hash.
+
+    Args:
+        password: Plain text password
+        operation: Metrics label of the calling endpoint
+
+    Returns:
+        Hashed password string
+    """
+    return password_hash_pool.run(operation, get_password_hash, password)
+
+
+def verify_password_limited(plain_password: str, hashed_password: str, operation: str) -> bool:
+    """
+    Verify a password through the admission-controlled pool.
+
+    Args:
+        plain_password: Plain text password
+        hashed_password: Hashed password from database
+        operation: Metrics label of the calling endpoint
+
+    Returns:
+        True if password matches, False otherwise
+    """
+    return password_hash_pool.run(operation, verify_password, plain_password, hashed_password)
+
+
+def password_hash_pool_stats() -> Dict[str, Any]:
+    """Get queue depth, shed counts and hash latency of the password hash pool."""
+    return password_hash_pool.stats()
+
+
 def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token.
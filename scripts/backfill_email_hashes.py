@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Backfill Email Blind Index Script
+
+Populates users.email_hash (migration a7c4e1f92b3d) and the admin search
+tokens in user_search_tokens (migration b91d3f6a2c58) for accounts created
+before those columns existed. Safe to re-run: only rows missing an index
+are touched, and each batch is committed separately.
+
+Usage:
+    python scripts/backfill_email_hashes.py
+    python scripts/backfill_email_hashes.py --batch-size 1000
+
+Environment:
+    DATABASE_URL: PostgreSQL connection string (required)
+    ENCRYPTION_KEY: Fernet encryption key for PII (required)
+    BLIND_INDEX_KEY: HMAC key for blind indexes (optional, must match the API)
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.database import SessionLocal
+from app.models.user import User
+from app.services.user import backfill_email_hashes, backfill_search_tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill users.email_hash and user search tokens")
+    parser.add_argument("--batch-size", type=int, default=500, help="Users per batch (default: 500)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        updated = backfill_email_hashes(db, batch_size=args.batch_size)
+        remaining = db.query(User).filter(User.email_hash.is_(None)).count()
+
+        print(f"✅ Backfilled email_hash for {updated} users")
+
+        tokenized = backfill_search_tokens(db, batch_size=args.batch_size)
+        print(f"✅ Backfilled search tokens for {tokenized} users")
+        if remaining:
+            print(f"⚠️  {remaining} users still have no email_hash (email could not be decrypted)")
+            sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+PII Encryption Microbenchmark
+
+Compares legacy Fernet tokens with the v2 AES-GCM envelope for encrypting
+and decrypting email-sized values, one field per call and through the
+encrypt_many/decrypt_many batch APIs. Runs in-process; no database needed.
+
+Usage:
+    python scripts/benchmark_encryption.py
+    python scripts/benchmark_encryption.py --count 20000 --repeat 5
+
+Environment:
+    ENCRYPTION_KEY: Fernet encryption key for PII (required)
+"""
+import sys
+import os
+import argparse
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import settings
+from app.utils import encryption
+
+
+def best_of(repeat, fn):
+    """Fastest wall time of `repeat` runs, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run_format(fmt, values, repeat):
+    """Time encrypt/decrypt of `values` with new ciphertexts in format `fmt`."""
+    settings.PII_ENCRYPTION_FORMAT = fmt
+    ciphertexts = encryption.encrypt_many(values)
+
+    return {
+        'encrypt_field': best_of(repeat, lambda: [encryption.encrypt_field(v) for v in values]),
+        'encrypt_many': best_of(repeat, lambda: encryption.encrypt_many(values)),
+        'decrypt_field': best_of(repeat, lambda: [encryption.decrypt_field(c) for c in ciphertexts]),
+        'decrypt_many': best_of(repeat, lambda: encryption.decrypt_many(ciphertexts)),
+        'avg_length': sum(len(c) for c in ciphertexts) / len(ciphertexts),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Fernet vs AES-GCM PII encryption")
+    parser.add_argument("--count", type=int, default=10000, help="Values per run (default: 10000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    values = [f"learner.{i:06d}@example.com" for i in range(args.count)]
+    original_format = settings.PII_ENCRYPTION_FORMAT
+    try:
+        results = {fmt: run_format(fmt, values, args.repeat) for fmt in ('fernet', 'aesgcm')}
+    finally:
+        settings.PII_ENCRYPTION_FORMAT = original_format
+
+    print(f"{args.count} email-sized values, best of {args.repeat} runs (µs per value)\n")
+    print(f"{'operation':<16}{'fernet':>12}{'aesgcm':>12}{'speedup':>10}")
+    for op in ('encrypt_field', 'encrypt_many', 'decrypt_field', 'decrypt_many'):
+        fernet_us = results['fernet'][op] / args.count * 1e6
+        aesgcm_us = results['aesgcm'][op] / args.count * 1e6
+        print(f"{op:<16}{fernet_us:>12.2f}{aesgcm_us:>12.2f}{fernet_us / aesgcm_us:>9.1f}x")
+    print(f"{'avg length':<16}{results['fernet']['avg_length']:>12.0f}{results['aesgcm']['avg_length']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
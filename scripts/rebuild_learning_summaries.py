@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Rebuild Learning Summaries Script
+
+Recomputes user_course_summaries (migration b3e9f1a6d284) from sessions and
+question attempts. The API keeps the table up to date incrementally; run
+this once after the migration to backfill existing learners, or for one
+user after manual data changes. Safe to re-run: rows are replaced.
+
+Usage:
+    python scripts/rebuild_learning_summaries.py
+    python scripts/rebuild_learning_summaries.py --user-id <user_id>
+
+Environment:
+    DATABASE_URL: PostgreSQL connection string (required)
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.models.database import SessionLocal
+from app.services.learning_summary import rebuild_learning_summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild per-user, per-course learning summaries")
+    parser.add_argument("--user-id", default=None, help="Only rebuild this user's rows (default: all users)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        rebuilt = rebuild_learning_summaries(db, user_id=args.user_id)
+        print(f"✅ Rebuilt {rebuilt} learning summary rows")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
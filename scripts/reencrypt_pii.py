@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Re-encrypt PII Script
+
+Rewrites users.email, first_name, last_name and two_factor_secret under the
+primary ENCRYPTION_KEY (and the v2 AES-GCM format) after a key rotation,
+while the API keeps running. Resumable: progress is checkpointed after each
+batch and a restarted run continues from the checkpoint.
+
+Rotation steps:
+    1. If BLIND_INDEX_KEY is not set, pin the current blind index key:
+       BLIND_INDEX_KEY=$(python scripts/reencrypt_pii.py --print-blind-index-key)
+       (the API refuses to start with ENCRYPTION_OLD_KEYS but no BLIND_INDEX_KEY)
+    2. Deploy with ENCRYPTION_KEY=<new key>, ENCRYPTION_OLD_KEYS=<old key>
+    3. Run this script until it reports 0 stale users
+    4. Remove the old key from ENCRYPTION_OLD_KEYS and redeploy
+
+Usage:
+    python scripts/reencrypt_pii.py
+    python scripts/reencrypt_pii.py --batch-size 1000 --workers 8 --max-rows-per-second 2000
+    python scripts/reencrypt_pii.py --print-blind-index-key
+
+Environment:
+    DATABASE_URL: PostgreSQL connection string (required)
+    ENCRYPTION_KEY: New (primary) Fernet encryption key (required)
+    ENCRYPTION_OLD_KEYS: Previous keys, comma-separated, newest first
+    BLIND_INDEX_KEY: HMAC key for blind indexes (must match the API)
+"""
+import sys
+import os
+import argparse
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from app.core.config import settings
+
+
+def print_progress(progress):
+    """One progress line per batch."""
+    percent = progress.scanned / progress.total * 100 if progress.total else 100.0
+    eta = f"{progress.eta_seconds:.0f}s" if progress.eta_seconds is not None else "?"
+    print(
+        f"  {progress.scanned}/{progress.total} users ({percent:.1f}%) | "
+        f"re-encrypted {progress.reencrypted} | conflicts {progress.conflicts} | failed {progress.failed} | "
+        f"{progress.rows_per_second:.0f} users/s | ETA {eta}",
+        flush=True
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-encrypt user PII under the primary ENCRYPTION_KEY")
+    parser.add_argument("--batch-size", type=int, default=500, help="Users per batch (default: 500)")
+    parser.add_argument("--workers", type=int, default=4, help="Re-encryption threads (default: 4)")
+    parser.add_argument("--max-rows-per-second", type=float, default=0, help="Throttle, 0 = unthrottled (default: 0)")
+    parser.add_argument(
+        "--checkpoint", default=".pii_reencryption_checkpoint.json",
+        help="Checkpoint file for resuming (default: .pii_reencryption_checkpoint.json)"
+    )
+    parser.add_argument(
+        "--print-blind-index-key", action="store_true",
+        help="Print the blind index key in use as a BLIND_INDEX_KEY value and exit (run before rotating)"
+    )
+    args = parser.parse_args()
+
+    # Checked before importing the app, which refuses to load in this state
+    if settings.ENCRYPTION_OLD_KEYS.strip() and not settings.BLIND_INDEX_KEY:
+        print("❌ Error: ENCRYPTION_OLD_KEYS is set but BLIND_INDEX_KEY is not.")
+        print("   Blind indexes would change with ENCRYPTION_KEY and logins/admin search would stop matching.")
+        print("   With the old key as ENCRYPTION_KEY and no ENCRYPTION_OLD_KEYS, run")
+        print("   `python scripts/reencrypt_pii.py --print-blind-index-key` and set BLIND_INDEX_KEY to its output.")
+        sys.exit(1)
+
+    from app.models.database import engine
+    from app.services.pii_rotation import reencrypt_user_pii
+    from app.utils.encryption import export_blind_index_key
+
+    if args.print_blind_index_key:
+        print(export_blind_index_key())
+        return
+
+    if os.path.exists(args.checkpoint):
+        print(f"↻ Resuming from {args.checkpoint}")
+
+    progress = reencrypt_user_pii(
+        engine,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        max_rows_per_second=args.max_rows_per_second,
+        checkpoint_path=args.checkpoint,
+        progress_callback=print_progress
+    )
+
+    print(f"✅ Re-encrypted {progress.reencrypted} of {progress.scanned} users")
+    if progress.conflicts:
+        print(f"⚠️  {progress.conflicts} users kept changing during the run and were not fully rewritten")
+    if progress.failed:
+        print(f"⚠️  {progress.failed} users have PII no configured key decrypts; they were left as is")
+    if progress.stale:
+        print(f"❌ Verification: {progress.stale} users still have values outside the primary key.")
+        print("   Run the script again; do NOT remove old keys from ENCRYPTION_OLD_KEYS yet.")
+        sys.exit(1)
+    print("✅ Verification: all users are under the primary key; old keys can be retired")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,7 @@ from app.models.database import SessionLocal, engine, Base
 from app.models.course import Course, KnowledgeArea, Domain
 from app.models.question import Question, AnswerChoice
 from app.models.user import User
+from app.services.catalog import bump_catalog_version
 from app.utils.security import get_password_hash
 from decimal import Decimal
 from datetime import datetime
@@ -111,6 +112,8 @@ def seed_database():
             db.add(ka)
             knowledge_areas.append(ka)
         
+        # Running API workers reload their cached course catalog on the bump
+        bump_catalog_version(db, cbap_course.course_id)
         db.commit()
         
         # Refresh all KAs to get their IDs
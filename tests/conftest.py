@@ -19,6 +19,9 @@ os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
 
 from app.models.database import Base, get_db
 from app.main import app
+from app.core.rate_limit import reset_rate_limits
+from app.services.audit_log import flush_security_logs
+from app.services.login_throttle import reset_login_throttle
 
 
 # Test database engine - use DATABASE_URL from environment
@@ -44,6 +47,10 @@ def db() -> Generator:
     finally:
         session.rollback()
         session.close()
+        # Write buffered audit events before their tables go away
+        flush_security_logs()
+        reset_rate_limits()
+        reset_login_throttle()
         # Drop all tables after test
         Base.metadata.drop_all(bind=engine)
 
@@ -97,6 +97,68 @@ class TestAdminUserManagement:
         emails = [user["email"] for user in data["users"]]
         assert "learner@test.com" in emails
 
+    def test_list_users_search_by_name_substring(self, admin_authenticated_client, test_learner_user):
+        """Test search matches a substring of an encrypted name."""
+        response = admin_authenticated_client.get("/v1/admin/users?search=EARN")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        emails = [user["email"] for user in data["users"]]
+        assert "learner@test.com" in emails
+        assert "admin@test.com" not in emails
+
+    def test_list_users_search_short_term_matches_prefix(self, admin_authenticated_client, test_learner_user):
+        """Test search terms shorter than a trigram match field prefixes."""
+        response = admin_authenticated_client.get("/v1/admin/users?search=le")
+
+        assert response.status_code == status.HTTP_200_OK
+        emails = [user["email"] for user in response.json()["users"]]
+        assert "learner@test.com" in emails
+
+    def test_list_users_search_no_match(self, admin_authenticated_client, test_learner_user):
+        """Test search with no matching users returns an empty page."""
+        response = admin_authenticated_client.get("/v1/admin/users?search=zzzqqq")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 0
+        assert data["users"] == []
+
+    def test_list_users_search_paginates_in_database(self, admin_authenticated_client, db):
+        """Test search results are counted and paginated by the database."""
+        from app.models.user import User
+        from app.utils.security import get_password_hash
+
+        for i in range(5):
+            db.add(User(
+                email=f"searchable{i}@test.com",
+                password_hash=get_password_hash("Test123"),
+                first_name=f"Searchable{i}",
+                last_name="Test",
+                role="learner"
+            ))
+        db.commit()
+
+        response = admin_authenticated_client.get("/v1/admin/users?search=searchable&page=2&per_page=2")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total"] == 5
+        assert data["total_pages"] == 3
+        assert len(data["users"]) == 2
+
+    def test_list_users_search_after_email_change(self, admin_authenticated_client, db, test_learner_user):
+        """Test search tokens follow updates made through the hybrid setters."""
+        test_learner_user.email = "renamed@test.com"
+        db.commit()
+
+        old = admin_authenticated_client.get("/v1/admin/users?search=learner@").json()
+        new = admin_authenticated_client.get("/v1/admin/users?search=renamed").json()
+
+        assert "renamed@test.com" not in [user["email"] for user in old["users"]]
+        assert "renamed@test.com" in [user["email"] for user in new["users"]]
+
     def test_list_users_filter_by_role(self, admin_authenticated_client, test_learner_user, test_admin_user):
         """Test filtering users by role."""
         response = admin_authenticated_client.get("/v1/admin/users?role=admin")
@@ -199,6 +261,35 @@ class TestAdminMetrics:
         # Should only count active users
         assert data["users"]["active"] >= 3
 
+    def test_get_runtime_metrics(self, admin_authenticated_client, test_learner_user):
+        """Test runtime metrics report password hashing and decryption cache load."""
+        login = admin_authenticated_client.post(
+            "/v1/auth/login",
+            json={"email": "learner@test.com", "password": "Test123Pass"}
+        )
+        assert login.status_code == status.HTTP_200_OK
+
+        response = admin_authenticated_client.get("/v1/admin/metrics/runtime")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        hashing = data["password_hashing"]
+        assert hashing["in_flight"] == 0
+        assert hashing["waiting"] == 0
+        assert hashing["operations"]["login"]["count"] >= 1
+        assert data["pii_decryption_cache"]["max_entries"] > 0
+        assert data["security_log_writer"]["max_queue_size"] > 0
+        assert data["security_log_writer"]["enqueued"] >= 1  # the login event
+        assert data["rate_limiter"]["backend"] in ("redis", "memory")
+        assert data["rate_limiter"]["allowed"] >= 1
+        assert data["login_throttle"]["blocked_sources"] == 0
+
+    def test_runtime_metrics_require_admin(self, authenticated_client):
+        """Test learners cannot read runtime metrics."""
+        response = authenticated_client.get("/v1/admin/metrics/runtime")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
 
 @pytest.mark.integration
 class TestAdminCourseManagement:
@@ -351,6 +442,40 @@ class TestAdminKnowledgeAreaManagement:
         assert "ka_name" in ka
         assert "weight_percentage" in ka
 
+    def test_create_knowledge_areas_refreshes_catalog(self, admin_authenticated_client, db):
+        """Test reconfiguring KAs replaces the cached catalog and bumps its version."""
+        from app.models.course import Course
+        from app.services.catalog import current_catalog_version, get_course_catalog
+
+        course = Course(
+            course_code="PSM1",
+            course_name="Professional Scrum Master I",
+            version="v2020",
+            status="draft",
+            wizard_completed=False,
+            passing_score_percentage=85
+        )
+        db.add(course)
+        db.commit()
+        db.refresh(course)
+
+        url = f"/v1/admin/courses/{course.course_id}/knowledge-areas"
+        first = admin_authenticated_client.post(url, json={"knowledge_areas": [
+            {"ka_code": "SCRUM_THEORY", "ka_name": "Scrum Theory", "ka_number": 1, "weight_percentage": 100.00}
+        ]})
+        assert first.status_code == status.HTTP_201_CREATED
+        assert [ka.ka_code for ka in get_course_catalog(db, course.course_id).knowledge_areas] == ["SCRUM_THEORY"]
+
+        second = admin_authenticated_client.post(url, json={"knowledge_areas": [
+            {"ka_code": "SCRUM_ROLES", "ka_name": "Scrum Roles", "ka_number": 1, "weight_percentage": 50.00},
+            {"ka_code": "SCRUM_EVENTS", "ka_name": "Scrum Events", "ka_number": 2, "weight_percentage": 50.00}
+        ]})
+        assert second.status_code == status.HTTP_201_CREATED
+
+        catalog = get_course_catalog(db, course.course_id)
+        assert [ka.ka_code for ka in catalog.knowledge_areas] == ["SCRUM_ROLES", "SCRUM_EVENTS"]
+        assert catalog.version == current_catalog_version(db, course.course_id) == 2
+
     def test_create_knowledge_areas_weights_must_sum_to_100(self, admin_authenticated_client, db):
         """Test that KA weights must sum to 100%."""
         from app.models.course import Course
@@ -693,6 +818,73 @@ class TestBulkQuestionImport:
         questions = db.query(Question).filter(Question.course_id == course.course_id).all()
         assert len(questions) == 3
 
+    def test_bulk_import_refreshes_diagnostic_forms(self, admin_authenticated_client, test_cbap_course, test_questions, db):
+        """Test imported questions reach the diagnostic form pool."""
+        from app.services.diagnostic_forms import get_form_pool
+
+        old_pool = get_form_pool(db, test_cbap_course.course_id)
+        ka = test_cbap_course.knowledge_areas[0]
+
+        response = admin_authenticated_client.post(
+            f"/v1/admin/courses/{test_cbap_course.course_id}/questions/bulk",
+            json={
+                "questions": [{
+                    "ka_code": ka.ka_code,
+                    "question_text": "Newly imported hard question",
+                    "question_type": "true_false",
+                    "difficulty": 0.95,
+                    "source": "custom",
+                    "answer_choices": [
+                        {"choice_text": "True", "is_correct": True, "choice_order": 1},
+                        {"choice_text": "False", "is_correct": False, "choice_order": 2}
+                    ]
+                }]
+            }
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+        from app.models.question import Question
+        new_question = db.query(Question).filter(
+            Question.question_text == "Newly imported hard question"
+        ).one()
+
+        pool = get_form_pool(db, test_cbap_course.course_id)
+        assert pool is not old_pool
+        assert any(new_question.question_id in form for form in pool.forms)
+
+    def test_bulk_import_sees_kas_added_without_version_bump(self, admin_authenticated_client, test_cbap_course, db):
+        """Test codes of KAs seeded outside the admin API are accepted despite a cached catalog."""
+        from decimal import Decimal
+        from app.models.course import KnowledgeArea
+        from app.services.catalog import get_course_catalog
+
+        get_course_catalog(db, test_cbap_course.course_id)  # cached before the seed
+        db.add(KnowledgeArea(
+            course_id=test_cbap_course.course_id, ka_code="BA-SEEDED", ka_name="Seeded KA",
+            ka_number=7, weight_percentage=Decimal("0.00")
+        ))
+        db.commit()
+
+        response = admin_authenticated_client.post(
+            f"/v1/admin/courses/{test_cbap_course.course_id}/questions/bulk",
+            json={
+                "questions": [{
+                    "ka_code": "BA-SEEDED",
+                    "question_text": "Question for a seeded KA?",
+                    "question_type": "true_false",
+                    "difficulty": 0.5,
+                    "source": "custom",
+                    "answer_choices": [
+                        {"choice_text": "True", "is_correct": True, "choice_order": 1},
+                        {"choice_text": "False", "is_correct": False, "choice_order": 2}
+                    ]
+                }]
+            }
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["questions_imported"] == 1
+
     def test_bulk_import_invalid_ka_code(self, admin_authenticated_client, test_cbap_course, db):
         """Test bulk import with invalid KA code."""
         response = admin_authenticated_client.post(
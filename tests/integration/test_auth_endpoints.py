@@ -53,6 +53,20 @@ class TestUserRegistration:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "already registered" in response.json()["detail"].lower()
 
+    def test_register_duplicate_email_different_case(self, client, test_learner_user):
+        """Test duplicate check ignores email case."""
+        response = client.post(
+            "/v1/auth/register",
+            json={
+                "email": "LEARNER@test.com",
+                "password": "SecurePass123!",
+                "first_name": "Duplicate",
+                "last_name": "User"
+            }
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_register_invalid_email(self, client):
         """Test registration with invalid email format."""
         response = client.post(
@@ -166,6 +180,38 @@ class TestUserLogin:
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def test_login_email_case_insensitive(self, client, test_learner_user):
+        """Test login matches email regardless of case (blind index normalization)."""
+        response = client.post(
+            "/v1/auth/login",
+            json={
+                "email": "Learner@TEST.com",
+                "password": "Test123Pass"
+            }
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_login_finds_backfilled_user(self, client, db, test_learner_user):
+        """Test users without email_hash can log in after backfill."""
+        from app.services.user import backfill_email_hashes
+
+        # Simulate a row created before the blind index existed
+        test_learner_user.email_hash = None
+        db.commit()
+
+        assert backfill_email_hashes(db) == 1
+
+        response = client.post(
+            "/v1/auth/login",
+            json={
+                "email": "learner@test.com",
+                "password": "Test123Pass"
+            }
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
     def test_login_invalid_email_format(self, client):
         """Test login with invalid email format."""
         response = client.post(
@@ -327,6 +373,108 @@ class TestGetCurrentUser:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+@pytest.mark.integration
+class TestPrincipalResolution:
+    """Test cached principals on learner endpoints."""
+
+    def test_deactivated_user_rejected_on_next_request(self, authenticated_client, db, test_learner_user):
+        """Test deactivation takes effect immediately despite the principal cache."""
+        assert authenticated_client.get("/v1/reviews/stats").status_code == status.HTTP_200_OK
+
+        test_learner_user.is_active = False
+        db.commit()
+
+        response = authenticated_client.get("/v1/reviews/stats")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_deleted_user_rejected_on_next_request(self, authenticated_client, db, test_learner_user):
+        """Test a cached principal does not outlive its user."""
+        assert authenticated_client.get("/v1/reviews/stats").status_code == status.HTTP_200_OK
+
+        db.delete(test_learner_user)
+        db.commit()
+
+        response = authenticated_client.get("/v1/reviews/stats")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.integration
+class TestRateLimiting:
+    """Test request rate limits (Decision #52)."""
+
+    def test_login_blocked_after_limit(self, client, db, test_learner_user):
+        """Test login attempts beyond the per-IP limit get 429 and one block record."""
+        from app.core.config import settings
+        from app.models.security import RateLimitEntry
+
+        for i in range(settings.RATE_LIMIT_LOGIN_PER_MINUTE):
+            response = client.post("/v1/auth/login", json={"email": f"user{i}@test.com", "password": "WrongPass123"})
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        credentials = {"email": "learner@test.com", "password": "WrongPass123"}
+        blocked = client.post("/v1/auth/login", json=credentials)
+        client.post("/v1/auth/login", json=credentials)
+
+        assert blocked.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(blocked.headers["Retry-After"]) >= 1
+        assert blocked.headers["X-RateLimit-Remaining"] == "0"
+
+        entries = db.query(RateLimitEntry).all()
+        assert len(entries) == 1
+        assert entries[0].is_blocked
+        assert entries[0].endpoint == "POST /v1/auth/login"
+        assert entries[0].user_id is None
+
+    def test_spoofed_forwarded_for_does_not_reset_login_budget(self, client, test_learner_user):
+        """Test a new X-Forwarded-For per request still counts against the connecting IP."""
+        from app.core.config import settings
+
+        for i in range(settings.RATE_LIMIT_LOGIN_PER_MINUTE):
+            response = client.post(
+                "/v1/auth/login",
+                json={"email": f"user{i}@test.com", "password": "WrongPass123"},
+                headers={"X-Forwarded-For": f"203.0.113.{i}"}
+            )
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        blocked = client.post(
+            "/v1/auth/login",
+            json={"email": "learner@test.com", "password": "WrongPass123"},
+            headers={"X-Forwarded-For": "198.51.100.7"}
+        )
+
+        assert blocked.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_failed_logins_back_off_before_password_check(self, client, test_learner_user, monkeypatch):
+        """Test an account past its free attempts is refused without verifying the password."""
+        from app.core.config import settings
+        from app.services import auth as auth_service
+
+        for _ in range(settings.LOGIN_ACCOUNT_FREE_ATTEMPTS):
+            response = client.post("/v1/auth/login", json={"email": "learner@test.com", "password": "WrongPass123"})
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        def fail_verify(*args, **kwargs):
+            raise AssertionError("password verified while throttled")
+
+        monkeypatch.setattr(auth_service, "verify_password_limited", fail_verify)
+        response = client.post("/v1/auth/login", json={"email": "learner@test.com", "password": "Test123Pass"})
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "failed login attempts" in response.json()["detail"]
+        assert int(response.headers["Retry-After"]) >= 1
+
+    def test_allowed_requests_carry_limit_headers(self, authenticated_client):
+        """Test learner requests report their per-user budget."""
+        from app.core.config import settings
+
+        response = authenticated_client.get("/v1/reviews/stats")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-RateLimit-Limit"] == str(settings.RATE_LIMIT_LEARNER_PER_MINUTE)
+        assert int(response.headers["X-RateLimit-Remaining"]) < settings.RATE_LIMIT_LEARNER_PER_MINUTE
+
+
 @pytest.mark.integration
 class TestLogout:
     """Test user logout endpoint."""
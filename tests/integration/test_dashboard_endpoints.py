@@ -6,6 +6,7 @@ Tests:
 - GET /v1/dashboard/competencies - Get detailed competencies
 - GET /v1/dashboard/recent - Get recent activity
 - GET /v1/dashboard/exam-readiness - Get exam readiness
+- GET /v1/dashboard/bundle - Get several dashboard payloads at once
 """
 import pytest
 from fastapi import status
@@ -53,6 +54,48 @@ class TestGetDashboardOverview:
         assert isinstance(data["competencies"], list)
         assert len(data["competencies"]) == 6  # CBAP has 6 KAs
 
+    def test_get_dashboard_totals_from_summary(self, authenticated_client, test_user_competencies, test_questions, db):
+        """Test overview totals follow answers and completions made through the API."""
+        from app.models.question import AnswerChoice
+
+        session_id = authenticated_client.post(
+            "/v1/sessions",
+            json={"session_type": "practice"}
+        ).json()["session_id"]
+
+        for answer_correctly in (True, False):
+            question_id = authenticated_client.get(
+                f"/v1/sessions/{session_id}/next-question"
+            ).json()["question_id"]
+            choice = db.query(AnswerChoice).filter(
+                AnswerChoice.question_id == question_id,
+                AnswerChoice.is_correct == answer_correctly
+            ).first()
+            authenticated_client.post(
+                f"/v1/sessions/{session_id}/attempt",
+                json={
+                    "question_id": question_id,
+                    "selected_choice_id": choice.choice_id,
+                    "time_spent_seconds": 30
+                }
+            )
+
+        authenticated_client.post(
+            f"/v1/sessions/{session_id}/complete",
+            json={"duration_minutes": 10}
+        )
+
+        response = authenticated_client.get("/v1/dashboard")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["total_questions_attempted"] == 2
+        assert data["total_correct"] == 1
+        assert data["overall_accuracy"] == 50.0
+        assert data["total_sessions_completed"] == 1
+        assert data["diagnostic_completed"] is False
+        assert data["last_practice_date"] is not None
+
     def test_get_dashboard_requires_auth(self, client):
         """Test that endpoint requires authentication."""
         response = client.get("/v1/dashboard")
@@ -115,6 +158,56 @@ class TestGetCompetenciesDetail:
         assert "correct_count" in comp
         assert "accuracy_percentage" in comp
 
+    def test_get_competencies_detail_trend_from_snapshots(self, authenticated_client, test_user_competencies, test_questions, db):
+        """Test trend points come from daily competency snapshots."""
+        from app.models.learning import Session as LearningSession
+        from app.services.competency import update_competency_after_attempt
+
+        db.add(LearningSession(
+            user_id=test_user_competencies[0].user_id,
+            course_id=test_questions[0].course_id,
+            session_type="practice",
+            is_completed=True
+        ))
+        db.commit()
+
+        comp = test_user_competencies[0]
+        updated = update_competency_after_attempt(
+            db, comp.user_id, comp.ka_id, is_correct=True, question_difficulty=Decimal("0.70")
+        )
+
+        response = authenticated_client.get("/v1/dashboard/competencies?trend_days=90")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["trend_days"] == 90
+
+        by_ka = {c["ka_id"]: c for c in data["competencies"]}
+        trend = by_ka[str(comp.ka_id)]["trend"]
+        assert len(trend) == 1
+        assert Decimal(str(trend[0]["competency_score"])) == updated.competency_score
+        assert trend[0]["attempts_count"] == 1
+
+        # KAs without updates have no trend points
+        other = [c for ka_id, c in by_ka.items() if ka_id != str(comp.ka_id)]
+        assert all(c["trend"] == [] for c in other)
+
+    def test_get_competencies_detail_rejects_unknown_trend_window(self, authenticated_client, test_user_competencies, test_questions, db):
+        """Test only 30/90/365-day trend windows are accepted."""
+        from app.models.learning import Session as LearningSession
+
+        db.add(LearningSession(
+            user_id=test_user_competencies[0].user_id,
+            course_id=test_questions[0].course_id,
+            session_type="practice",
+            is_completed=True
+        ))
+        db.commit()
+
+        response = authenticated_client.get("/v1/dashboard/competencies?trend_days=45")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_get_competencies_detail_requires_auth(self, client):
         """Test that endpoint requires authentication."""
         response = client.get("/v1/dashboard/competencies")
@@ -221,6 +314,28 @@ class TestGetRecentActivity:
         assert data["recent_sessions"] == [] or len(data["recent_sessions"]) == 0
         assert data["current_streak_days"] == 0
 
+    def test_get_recent_activity_reads_activity_calendar(self, authenticated_client, test_user_competencies):
+        """Test streak and study time come from completed sessions, counted once."""
+        session_id = authenticated_client.post(
+            "/v1/sessions",
+            json={"session_type": "practice"}
+        ).json()["session_id"]
+
+        # Completing twice must not double count the day
+        for _ in range(2):
+            authenticated_client.post(
+                f"/v1/sessions/{session_id}/complete",
+                json={"duration_minutes": 25}
+            )
+
+        response = authenticated_client.get("/v1/dashboard/recent")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["current_streak_days"] == 1
+        assert data["longest_streak_days"] == 1
+        assert data["total_study_minutes"] == 25
+
 
 @pytest.mark.integration
 class TestGetExamReadiness:
@@ -348,3 +463,72 @@ class TestGetExamReadiness:
         assert data["kas_not_ready"] == 6
         assert data["readiness_percentage"] == 0.0
         assert data["exam_ready"] is False
+
+
+@pytest.mark.integration
+class TestGetDashboardBundle:
+    """Test GET /v1/dashboard/bundle endpoint."""
+
+    def _add_session(self, db, test_user_competencies, test_questions):
+        from app.models.learning import Session as LearningSession
+
+        db.add(LearningSession(
+            user_id=test_user_competencies[0].user_id,
+            course_id=test_questions[0].course_id,
+            session_type="practice",
+            total_questions=4,
+            correct_answers=3,
+            is_completed=True
+        ))
+        db.commit()
+
+    def test_get_bundle_matches_individual_endpoints(self, authenticated_client, test_user_competencies, test_questions, db):
+        """Test all sections are returned and match the individual endpoints."""
+        self._add_session(db, test_user_competencies, test_questions)
+
+        response = authenticated_client.get("/v1/dashboard/bundle")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+
+        overview = authenticated_client.get("/v1/dashboard").json()
+        readiness = authenticated_client.get("/v1/dashboard/exam-readiness").json()
+        recent = authenticated_client.get("/v1/dashboard/recent").json()
+        competencies = authenticated_client.get("/v1/dashboard/competencies").json()
+
+        assert data["overview"] == overview
+        assert data["exam_readiness"] == readiness
+        assert data["recent"] == recent
+        assert data["competencies"]["competencies"] == competencies["competencies"]
+        assert data["competencies"]["overall_competency"] == competencies["overall_competency"]
+
+    def test_get_bundle_selected_sections(self, authenticated_client, test_user_competencies, test_questions, db):
+        """Test only requested sections are computed."""
+        self._add_session(db, test_user_competencies, test_questions)
+
+        response = authenticated_client.get("/v1/dashboard/bundle?sections=recent,exam_readiness")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert data["overview"] is None
+        assert data["competencies"] is None
+        assert data["recent"] is not None
+        assert data["exam_readiness"]["kas_not_ready"] == 6
+
+    def test_get_bundle_recent_without_activity(self, authenticated_client):
+        """Test sections that need no course work for new users."""
+        response = authenticated_client.get("/v1/dashboard/bundle?sections=recent")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["recent"]["current_streak_days"] == 0
+
+    def test_get_bundle_unknown_section(self, authenticated_client):
+        """Test unknown section names are rejected."""
+        response = authenticated_client.get("/v1/dashboard/bundle?sections=overview,leaderboard")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_get_bundle_requires_auth(self, client):
+        """Test that endpoint requires authentication."""
+        response = client.get("/v1/dashboard/bundle")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -49,6 +49,45 @@ class TestStartDiagnostic:
         assert data["status"] == "in_progress"
         assert "started_at" in data
 
+    def test_start_diagnostic_persists_question_set(self, authenticated_client, test_cbap_course, test_questions, db):
+        """Test start stores the question set and next-question serves it in order."""
+        from app.models.learning import SessionQuestion
+
+        response = authenticated_client.post(
+            "/v1/diagnostic/start",
+            json={"course_id": test_cbap_course.course_id}
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        session_id = response.json()["session_id"]
+
+        stored = db.query(SessionQuestion).filter(
+            SessionQuestion.session_id == session_id
+        ).order_by(SessionQuestion.position).all()
+        assert len(stored) == len(test_questions)  # 3 per KA in fixtures
+
+        # Repeated calls return the same first question (set is not re-randomized)
+        first = authenticated_client.get(f"/v1/diagnostic/next-question?session_id={session_id}").json()
+        again = authenticated_client.get(f"/v1/diagnostic/next-question?session_id={session_id}").json()
+        assert first["question_id"] == stored[0].question_id
+        assert again["question_id"] == stored[0].question_id
+
+        # Answering moves to the next stored position
+        choice_id = first["answer_choices"][0]["choice_id"]
+        submit = authenticated_client.post(
+            "/v1/diagnostic/submit-answer",
+            json={
+                "session_id": session_id,
+                "question_id": first["question_id"],
+                "selected_choice_id": choice_id,
+                "time_spent_seconds": 30
+            }
+        )
+        assert submit.status_code == status.HTTP_200_OK
+
+        second = authenticated_client.get(f"/v1/diagnostic/next-question?session_id={session_id}").json()
+        assert second["question_id"] == stored[1].question_id
+        assert second["question_number"] == 2
+
     def test_start_diagnostic_invalid_course(self, authenticated_client):
         """Test starting diagnostic with invalid course."""
         response = authenticated_client.post(
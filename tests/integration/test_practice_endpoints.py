@@ -296,6 +296,135 @@ class TestSubmitPracticeAnswer:
         assert "session_accuracy" in data
         assert "attempted_at" in data
 
+    def test_submit_answer_with_next_question(self, authenticated_client, test_learner_user, test_cbap_course, test_questions, test_user_competencies, db):
+        """Test include_next_question returns the next adaptive question inline."""
+        from app.models.learning import Session as LearningSession
+        from app.models.question import AnswerChoice
+
+        session = LearningSession(
+            user_id=test_learner_user.user_id,
+            course_id=test_cbap_course.course_id,
+            session_type="practice",
+            total_questions=2,
+            correct_answers=0,
+            is_completed=False
+        )
+        db.add(session)
+        db.commit()
+        db.refresh(session)
+
+        def submit(question):
+            choice = db.query(AnswerChoice).filter(
+                AnswerChoice.question_id == question.question_id,
+                AnswerChoice.is_correct == True
+            ).first()
+            return authenticated_client.post(
+                "/v1/practice/submit-answer",
+                json={
+                    "session_id": session.session_id,
+                    "question_id": question.question_id,
+                    "selected_choice_id": choice.choice_id,
+                    "include_next_question": True
+                }
+            )
+
+        response = submit(test_questions[0])
+        assert response.status_code == status.HTTP_200_OK
+        next_question = response.json()["next_question"]
+
+        assert next_question is not None
+        assert next_question["question_id"] != test_questions[0].question_id
+        assert next_question["question_number"] == 2
+        assert next_question["total_questions"] == 2
+        assert all("is_correct" not in choice for choice in next_question["answer_choices"])
+
+        # Last question answered - nothing more to return
+        question = next(q for q in test_questions if q.question_id == next_question["question_id"])
+        response = submit(question)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["next_question"] is None
+
+    def test_submit_answer_without_next_question(self, authenticated_client, test_learner_user, test_cbap_course, test_questions, test_user_competencies, db):
+        """Test next_question is omitted unless requested."""
+        from app.models.learning import Session as LearningSession
+        from app.models.question import AnswerChoice
+
+        session = LearningSession(
+            user_id=test_learner_user.user_id,
+            course_id=test_cbap_course.course_id,
+            session_type="practice",
+            total_questions=5,
+            correct_answers=0,
+            is_completed=False
+        )
+        db.add(session)
+        db.commit()
+        db.refresh(session)
+
+        choice = db.query(AnswerChoice).filter(
+            AnswerChoice.question_id == test_questions[0].question_id
+        ).first()
+        response = authenticated_client.post(
+            "/v1/practice/submit-answer",
+            json={
+                "session_id": session.session_id,
+                "question_id": test_questions[0].question_id,
+                "selected_choice_id": choice.choice_id
+            }
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["next_question"] is None
+
+    def test_submit_answer_is_atomic(self, authenticated_client, test_learner_user, test_cbap_course, test_questions, test_user_competencies, db, monkeypatch):
+        """Test a failure late in submission leaves no half-applied state."""
+        from app.api.v1 import practice
+        from app.models.learning import Session as LearningSession, QuestionAttempt, UserCompetency
+        from app.models.question import AnswerChoice
+
+        session = LearningSession(
+            user_id=test_learner_user.user_id,
+            course_id=test_cbap_course.course_id,
+            session_type="practice",
+            total_questions=5,
+            correct_answers=0,
+            is_completed=False
+        )
+        db.add(session)
+        db.commit()
+        db.refresh(session)
+
+        question = test_questions[0]
+        correct_choice = db.query(AnswerChoice).filter(
+            AnswerChoice.question_id == question.question_id,
+            AnswerChoice.is_correct == True
+        ).first()
+
+        def failing_sr_card(*args, **kwargs):
+            raise RuntimeError("SR card write failed")
+
+        monkeypatch.setattr(practice, "create_or_update_sr_card", failing_sr_card)
+
+        with pytest.raises(RuntimeError):
+            authenticated_client.post(
+                "/v1/practice/submit-answer",
+                json={
+                    "session_id": session.session_id,
+                    "question_id": question.question_id,
+                    "selected_choice_id": correct_choice.choice_id
+                }
+            )
+
+        db.rollback()
+        assert db.query(QuestionAttempt).filter(QuestionAttempt.session_id == session.session_id).count() == 0
+        db.refresh(session)
+        assert session.correct_answers == 0
+        competency = db.query(UserCompetency).filter(
+            UserCompetency.user_id == test_learner_user.user_id,
+            UserCompetency.ka_id == question.ka_id
+        ).first()
+        assert competency.attempts_count == 0
+
     def test_submit_answer_incorrect(self, authenticated_client, test_learner_user, test_cbap_course, test_questions, test_user_competencies, db):
         """Test submitting incorrect answer."""
         from app.models.learning import Session as LearningSession
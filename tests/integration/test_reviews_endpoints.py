@@ -147,6 +147,38 @@ class TestGetDueReviews:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+    def test_due_computed_from_next_review_at(self, authenticated_client, test_user_competencies, test_questions, db):
+        """Test due-ness comes from next_review_at and the read writes nothing."""
+        from app.models.spaced_repetition import SpacedRepetitionCard
+
+        user_id = test_user_competencies[0].user_id
+
+        # Stored flag is stale (False) but the card is past its review time
+        card = SpacedRepetitionCard(
+            user_id=user_id,
+            question_id=test_questions[0].question_id,
+            easiness_factor=Decimal("2.5"),
+            interval_days=1,
+            repetition_count=1,
+            next_review_at=datetime.now(timezone.utc) - timedelta(minutes=5),
+            is_due=False,
+            total_reviews=1,
+            successful_reviews=1
+        )
+        db.add(card)
+        db.commit()
+
+        response = authenticated_client.get("/v1/reviews/due")
+
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert [c["card_id"] for c in data["cards"]] == [card.card_id]
+        assert data["cards"][0]["is_due"] is True
+
+        # GET did not write the flag back
+        db.refresh(card)
+        assert card.is_due is False
+
 @pytest.mark.integration
 class TestAnswerReviewCard:
     """Test POST /v1/reviews/{card_id}/answer endpoint."""
@@ -456,3 +488,34 @@ class TestGetReviewStats:
         assert data["total_reviews_completed"] == 9
         # API calculates average success rate per card: (60% + 100%) / 2 = 80%
         assert 70.0 <= data["average_success_rate"] <= 90.0
+
+    def test_get_review_stats_refreshed_after_review(self, authenticated_client, test_user_competencies, test_questions, db):
+        """Test that answering a card invalidates cached statistics."""
+        from app.models.spaced_repetition import SpacedRepetitionCard
+
+        card = SpacedRepetitionCard(
+            user_id=test_user_competencies[0].user_id,
+            question_id=test_questions[0].question_id,
+            easiness_factor=Decimal("2.5"),
+            interval_days=1,
+            repetition_count=1,
+            next_review_at=datetime.now(timezone.utc) - timedelta(hours=1),
+            is_due=True,
+            total_reviews=3,
+            successful_reviews=2
+        )
+        db.add(card)
+        db.commit()
+
+        first = authenticated_client.get("/v1/reviews/stats").json()
+        assert first["total_reviews_completed"] == 3
+
+        response = authenticated_client.post(
+            f"/v1/reviews/{card.card_id}/answer",
+            json={"quality": 5, "time_spent_seconds": 10}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        second = authenticated_client.get("/v1/reviews/stats").json()
+        assert second["total_reviews_completed"] == 4
+        assert second["current_streak_days"] == 1
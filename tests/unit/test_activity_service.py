@@ -0,0 +1,100 @@
+"""
+Unit tests for the activity calendar service.
+
+Tests:
+- Session completions upsert one row per day
+- Current and longest streaks across gaps
+- Total study time
+"""
+import pytest
+from datetime import date, datetime, timedelta, timezone
+
+from app.models.learning import Session as LearningSession, UserActivityDay
+from app.services.activity import get_activity_summary, record_session_completed
+
+
+def _add_day(db, user_id, activity_date, study_seconds=600):
+    db.add(UserActivityDay(
+        user_id=user_id,
+        activity_date=activity_date,
+        sessions_completed=1,
+        study_seconds=study_seconds
+    ))
+
+
+@pytest.mark.unit
+class TestRecordSessionCompleted:
+    """Test activity calendar upserts."""
+
+    def test_same_day_sessions_share_one_row(self, db, test_user_competencies, test_questions):
+        """Test two sessions completed on one day increment a single row."""
+        user_id = test_user_competencies[0].user_id
+        completed_at = datetime.now(timezone.utc)
+
+        for duration in (300, 900):
+            session = LearningSession(
+                user_id=user_id,
+                course_id=test_questions[0].course_id,
+                session_type="practice",
+                is_completed=True,
+                completed_at=completed_at,
+                duration_seconds=duration
+            )
+            db.add(session)
+            db.flush()
+            record_session_completed(db, session)
+        db.commit()
+
+        rows = db.query(UserActivityDay).filter(UserActivityDay.user_id == user_id).all()
+
+        assert len(rows) == 1
+        assert rows[0].activity_date == completed_at.date()
+        assert rows[0].sessions_completed == 2
+        assert rows[0].study_seconds == 1200
+
+
+@pytest.mark.unit
+class TestActivitySummary:
+    """Test streaks and study time derived from the calendar."""
+
+    def test_streaks_across_gap(self, db, test_user_competencies):
+        """Test current run ending today and a longer earlier run."""
+        user_id = test_user_competencies[0].user_id
+        today = date(2026, 3, 10)
+
+        # Current run: today, -1 | gap | earlier run: -5 .. -8
+        for days_ago in [0, 1, 5, 6, 7, 8]:
+            _add_day(db, user_id, today - timedelta(days=days_ago))
+        db.commit()
+
+        summary = get_activity_summary(db, user_id, today=today)
+
+        assert summary["current_streak_days"] == 2
+        assert summary["longest_streak_days"] == 4
+        assert summary["total_study_minutes"] == 60
+        assert summary["last_active_date"] == today
+
+    def test_streak_kept_until_day_after(self, db, test_user_competencies):
+        """Test a run ending yesterday is still current, older runs are not."""
+        user_id = test_user_competencies[0].user_id
+        today = date(2026, 3, 10)
+        _add_day(db, user_id, today - timedelta(days=1))
+        _add_day(db, user_id, today - timedelta(days=2))
+        db.commit()
+
+        assert get_activity_summary(db, user_id, today=today)["current_streak_days"] == 2
+
+        later = get_activity_summary(db, user_id, today=today + timedelta(days=1))
+        assert later["current_streak_days"] == 0
+        assert later["longest_streak_days"] == 2
+
+    def test_no_activity(self, db, test_user_competencies):
+        """Test empty calendar returns zeros."""
+        summary = get_activity_summary(db, test_user_competencies[0].user_id)
+
+        assert summary == {
+            'current_streak_days': 0,
+            'longest_streak_days': 0,
+            'total_study_minutes': 0,
+            'last_active_date': None
+        }
@@ -0,0 +1,135 @@
+"""
+Unit tests for the buffered security audit log writer.
+
+Tests:
+- Buffered events are written in batches on flush
+- Size-triggered background flush
+- Synchronous writes for admin actions and queue overflow
+- Failed flushes are counted, not raised
+- Failed batches are bisected so only bad rows are dropped
+"""
+import pytest
+import time
+
+from app.models.database import SessionLocal
+from app.models.security import SecurityLog
+from app.services import audit_log
+from app.services.audit_log import SecurityLogWriter, write_security_log
+from app.services.auth import log_security_event
+
+
+def _values(user_id=None, event_type="failed_login"):
+    return {
+        'user_id': user_id,
+        'admin_user_id': None,
+        'event_type': event_type,
+        'event_category': 'authentication',
+        'ip_address': '10.0.0.1',
+        'user_agent': None,
+        'success': False,
+        'failure_reason': 'Invalid password',
+        'event_metadata': None
+    }
+
+
+@pytest.fixture
+def writer(monkeypatch):
+    """Writer that only flushes when told to (or on a full batch)."""
+    writer = SecurityLogWriter(SessionLocal, max_queue_size=3, batch_size=2, flush_interval_seconds=3600)
+    monkeypatch.setattr(audit_log, "security_log_writer", writer)
+    yield writer
+    writer.close()
+
+
+@pytest.mark.unit
+class TestSecurityLogWriter:
+    """Test buffering, batching and durability modes."""
+
+    def test_buffered_events_written_on_flush(self, db, writer, test_learner_user):
+        """Test queued events reach the table in multi-row batches."""
+        writer.enqueue({'log_id': 'a' * 36, **_values(test_learner_user.user_id)})
+        assert db.query(SecurityLog).count() == 0
+
+        assert writer.flush() == 1
+        assert db.query(SecurityLog).filter_by(user_id=test_learner_user.user_id).count() == 1
+
+        stats = writer.stats()
+        assert (stats['enqueued'], stats['written'], stats['batches'], stats['queue_depth']) == (1, 1, 1, 0)
+
+    def test_full_batch_triggers_background_flush(self, db, writer, test_learner_user):
+        """Test reaching batch_size wakes the flusher without waiting for the interval."""
+        for _ in range(2):
+            write_security_log(db, _values(test_learner_user.user_id))
+
+        deadline = time.monotonic() + 5
+        while writer.stats()['written'] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert writer.stats()['written'] == 2
+        assert db.query(SecurityLog).count() == 2
+
+    def test_buffered_write_keeps_event_time(self, db, writer, test_learner_user):
+        """Test occurred_at is the time of the event, not of the flush."""
+        assert write_security_log(db, _values(test_learner_user.user_id)) is None
+        time.sleep(0.05)
+        flushed_after = time.time()
+        writer.flush()
+
+        log = db.query(SecurityLog).one()
+        assert log.occurred_at.timestamp() < flushed_after
+
+    def test_sync_write_commits_immediately(self, db, writer):
+        """Test sync events are committed by the caller and returned."""
+        log = write_security_log(db, _values(), sync=True)
+
+        assert log is not None and log.log_id
+        assert writer.stats()['sync_writes'] == 1
+        assert writer.stats()['enqueued'] == 0
+
+    def test_admin_actions_are_synchronous(self, db, writer, test_admin_user, test_learner_user):
+        """Test events with an admin actor are durable before returning."""
+        log = log_security_event(
+            db=db,
+            event_type="role_changed",
+            success=True,
+            user_id=test_learner_user.user_id,
+            admin_user_id=test_admin_user.user_id
+        )
+
+        assert log is not None
+        assert db.query(SecurityLog).filter_by(event_type="role_changed").count() == 1
+
+    def test_overflow_falls_back_to_sync_write(self, db, writer, monkeypatch):
+        """Test a full queue makes callers write synchronously instead of dropping."""
+        monkeypatch.setattr(writer, "batch_size", 100)  # no size-triggered flush
+        for _ in range(4):
+            write_security_log(db, _values())
+
+        stats = writer.stats()
+        assert stats['queue_depth'] == 3
+        assert stats['overflow_sync_writes'] == 1
+        assert stats['max_queue_depth'] == 3
+        assert db.query(SecurityLog).count() == 1
+
+    def test_failed_flush_counts_dropped_rows(self, db, writer):
+        """Test rows that can't be inserted are counted instead of raising."""
+        writer.enqueue({'log_id': 'b' * 36, **_values(user_id="00000000-0000-0000-0000-000000000000")})
+
+        assert writer.flush() == 0
+
+        stats = writer.stats()
+        assert (stats['flush_failures'], stats['dropped']) == (1, 1)
+
+    def test_failed_batch_drops_only_bad_rows(self, db, writer, test_learner_user, monkeypatch):
+        """Test a batch with one bad row is retried so the other rows are still written."""
+        monkeypatch.setattr(writer, "batch_size", 100)  # one batch, no size-triggered flush
+        writer.enqueue({'log_id': 'c' * 36, **_values(test_learner_user.user_id)})
+        writer.enqueue({'log_id': 'd' * 36, **_values(user_id="00000000-0000-0000-0000-000000000000")})
+        writer.enqueue({'log_id': 'e' * 36, **_values(test_learner_user.user_id)})
+
+        assert writer.flush() == 2
+
+        written = db.query(SecurityLog.log_id).order_by(SecurityLog.log_id).all()
+        assert [log_id for log_id, in written] == ['c' * 36, 'e' * 36]
+        stats = writer.stats()
+        assert (stats['written'], stats['flush_failures'], stats['dropped']) == (2, 1, 1)
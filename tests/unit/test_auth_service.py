@@ -12,14 +12,16 @@ from datetime import datetime, timedelta
 from jose import jwt, JWTError
 
 from app.services.auth import (
-    verify_password,
-    get_password_hash,
     create_access_token,
     verify_token,
     decode_token,
-    create_refresh_token
+    create_refresh_token,
+    get_current_principal,
+    invalidate_principal,
+    principal_cache
 )
 from app.core.config import settings
+from app.utils.security import verify_password, get_password_hash
 
 
 @pytest.mark.unit
@@ -310,3 +312,94 @@ class TestPasswordSecurityRequirements:
         # Times should be roughly similar (within 50ms)
         # Argon2 is designed to have consistent timing
         assert abs(correct_time - incorrect_time) < 0.05
+
+
+@pytest.mark.unit
+class TestPrincipalCache:
+    """Test principal resolution for learner endpoints."""
+
+    @pytest.fixture(autouse=True)
+    def clear_principals(self):
+        invalidate_principal()
+        yield
+        invalidate_principal()
+
+    def _token(self, user):
+        return create_access_token({"sub": user.user_id, "role": user.role})
+
+    def test_principal_is_cached(self, db, test_learner_user):
+        """Test the second resolution is served from the cache."""
+        first = get_current_principal(db, self._token(test_learner_user))
+
+        assert first.role == "learner"
+        assert get_current_principal(db, self._token(test_learner_user)) is first
+
+    def test_role_change_invalidates_on_commit(self, db, test_learner_user):
+        """Test committed role changes drop the cached principal."""
+        get_current_principal(db, self._token(test_learner_user))
+
+        test_learner_user.role = "admin"
+        assert principal_cache.get(test_learner_user.user_id) is not None  # not yet committed
+        db.commit()
+
+        assert principal_cache.get(test_learner_user.user_id) is None
+        assert get_current_principal(db, self._token(test_learner_user)).role == "admin"
+
+    def test_password_change_invalidates_on_commit(self, db, test_learner_user):
+        """Test password changes drop the cached principal."""
+        get_current_principal(db, self._token(test_learner_user))
+
+        test_learner_user.password_hash = get_password_hash("NewPassword123!")
+        db.commit()
+
+        assert principal_cache.get(test_learner_user.user_id) is None
+
+    def test_rollback_keeps_cached_principal(self, db, test_learner_user):
+        """Test rolled-back changes leave the cache untouched."""
+        cached = get_current_principal(db, self._token(test_learner_user))
+
+        test_learner_user.is_active = False
+        db.rollback()
+        db.commit()
+
+        assert principal_cache.get(test_learner_user.user_id) is cached
+
+    def test_unknown_user_rejected(self, db):
+        """Test tokens for missing users are rejected with 401."""
+        from fastapi import HTTPException
+        import uuid
+
+        token = create_access_token({"sub": str(uuid.uuid4()), "role": "learner"})
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_principal(db, token)
+        assert exc_info.value.status_code == 401
+
+    def test_trust_token_claims_skips_database(self, db, monkeypatch):
+        """Test trusted-claims mode builds the principal from the token alone."""
+        import uuid
+
+        monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+        user_id = str(uuid.uuid4())  # No such user in the database
+
+        principal = get_current_principal(db, create_access_token({"sub": user_id, "role": "admin"}))
+
+        assert (principal.user_id, principal.role, principal.is_active) == (user_id, "admin", True)
+        assert principal_cache.get(user_id) is None
+
+    def test_trust_token_claims_not_extended_to_refresh_tokens(self, db, test_learner_user, monkeypatch):
+        """Test refresh tokens are checked against the database even in trusted-claims mode."""
+        from fastapi import HTTPException
+        import uuid
+
+        monkeypatch.setattr(settings, "AUTH_TRUST_TOKEN_CLAIMS", True)
+        test_learner_user.is_active = False
+        db.commit()
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_principal(db, create_refresh_token({"sub": str(test_learner_user.user_id), "role": "learner"}))
+        assert exc_info.value.status_code == 403
+
+        with pytest.raises(HTTPException) as exc_info:
+            get_current_principal(db, create_refresh_token({"sub": str(uuid.uuid4()), "role": "admin"}))
+        assert exc_info.value.status_code == 401
@@ -0,0 +1,135 @@
+"""
+Unit tests for the course catalog cache.
+
+Tests:
+- Snapshot contents (KA order, weights, codes, domains)
+- KA lookups across courses
+- Reload after a version bump from another worker
+- Local invalidation
+"""
+import pytest
+from decimal import Decimal
+
+from app.models.course import Domain, KnowledgeArea
+from app.services import catalog as catalog_service
+from app.services.catalog import (
+    CatalogCache,
+    bump_catalog_version,
+    current_catalog_version,
+    get_course_catalog,
+    get_knowledge_area,
+    get_knowledge_areas,
+    invalidate_catalog,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_catalog_cache():
+    """Start each test with an empty process-wide catalog cache."""
+    invalidate_catalog()
+    yield
+    invalidate_catalog()
+
+
+@pytest.mark.unit
+class TestCourseCatalog:
+    """Test catalog snapshots."""
+
+    def test_catalog_lists_kas_in_display_order(self, db, test_cbap_course):
+        """Test KAs are ordered by ka_number with codes and weights."""
+        catalog = get_course_catalog(db, test_cbap_course.course_id)
+
+        assert catalog.course_code == "CBAP"
+        assert [ka.ka_number for ka in catalog.knowledge_areas] == [1, 2, 3, 4, 5, 6]
+        assert catalog.ka_by_code("BA-ED").weight_percentage == Decimal("20.00")
+        assert sum(catalog.ka_weights.values()) == Decimal("100.00")
+
+    def test_catalog_includes_domains(self, db, test_cbap_course):
+        """Test domains are attached to their KA and found by code."""
+        ka = db.query(KnowledgeArea).filter_by(course_id=test_cbap_course.course_id, ka_number=1).first()
+        db.add(Domain(ka_id=ka.ka_id, domain_code="PA-1", domain_name="Plan Approach", domain_number=1))
+        db.commit()
+
+        catalog = get_course_catalog(db, test_cbap_course.course_id)
+
+        assert [d.domain_code for d in catalog.ka(ka.ka_id).domains] == ["PA-1"]
+        assert catalog.domain_by_code("PA-1").ka_id == ka.ka_id
+
+    def test_unknown_course_returns_none(self, db):
+        """Test a missing course is not cached."""
+        assert get_course_catalog(db, "00000000-0000-0000-0000-000000000000") is None
+
+    def test_get_knowledge_areas_resolves_by_id(self, db, test_cbap_course):
+        """Test KA lookups return catalog entries and skip unknown IDs."""
+        ka = db.query(KnowledgeArea).filter_by(course_id=test_cbap_course.course_id, ka_number=2).first()
+
+        kas = get_knowledge_areas(db, [ka.ka_id, "00000000-0000-0000-0000-000000000000"])
+
+        assert list(kas) == [ka.ka_id]
+        assert get_knowledge_area(db, ka.ka_id).ka_name == "Elicitation and Collaboration"
+
+
+@pytest.mark.unit
+class TestCatalogVersioning:
+    """Test cross-worker invalidation through the version counter."""
+
+    def test_bump_increments_version(self, db, test_cbap_course):
+        """Test the first bump creates the row and later bumps increment it."""
+        assert current_catalog_version(db, test_cbap_course.course_id) == 0
+
+        bump_catalog_version(db, test_cbap_course.course_id)
+        bump_catalog_version(db, test_cbap_course.course_id)
+        db.commit()
+
+        assert current_catalog_version(db, test_cbap_course.course_id) == 2
+
+    def test_other_worker_reloads_after_bump(self, db, test_cbap_course):
+        """Test a cached copy is kept until the version moves."""
+        worker = CatalogCache(check_seconds=0)
+        first = worker.get(db, test_cbap_course.course_id)
+        assert worker.get(db, test_cbap_course.course_id) is first
+
+        ka = db.query(KnowledgeArea).filter_by(course_id=test_cbap_course.course_id, ka_number=1).first()
+        ka.ka_name = "Planning"
+        bump_catalog_version(db, test_cbap_course.course_id)
+        db.commit()
+
+        reloaded = worker.get(db, test_cbap_course.course_id)
+        assert reloaded is not first
+        assert reloaded.ka(ka.ka_id).ka_name == "Planning"
+
+    def test_cached_copy_served_between_checks(self, db, test_cbap_course):
+        """Test no version check happens within the check interval."""
+        worker = CatalogCache(check_seconds=3600)
+        first = worker.get(db, test_cbap_course.course_id)
+
+        bump_catalog_version(db, test_cbap_course.course_id)
+        db.commit()
+
+        assert worker.get(db, test_cbap_course.course_id) is first
+
+    def test_max_age_reloads_without_version_bump(self, db, test_cbap_course, monkeypatch):
+        """Test KAs written without a bump (seed scripts, SQL) show up after max_age_seconds."""
+        now = [1000.0]
+        monkeypatch.setattr(catalog_service.time, "monotonic", lambda: now[0])
+        worker = CatalogCache(check_seconds=3600, max_age_seconds=300)
+        first = worker.get(db, test_cbap_course.course_id)
+
+        db.add(KnowledgeArea(
+            course_id=test_cbap_course.course_id, ka_code="BA-XX", ka_name="Seeded",
+            ka_number=7, weight_percentage=Decimal("0.00")
+        ))
+        db.commit()
+
+        now[0] += 299
+        assert worker.get(db, test_cbap_course.course_id) is first
+        now[0] += 1
+        assert worker.get(db, test_cbap_course.course_id).ka_by_code("BA-XX") is not None
+
+    def test_invalidate_drops_local_copy(self, db, test_cbap_course):
+        """Test invalidate_catalog forces a reload in this worker."""
+        first = get_course_catalog(db, test_cbap_course.course_id)
+
+        invalidate_catalog(test_cbap_course.course_id)
+
+        assert catalog_service.catalog_cache.get(db, test_cbap_course.course_id) is not first
@@ -388,3 +388,112 @@ class TestCompetencyEdgeCases:
         assert isinstance(result, Decimal)
         # Should have reasonable precision
         assert len(str(result).split('.')[-1]) >= 2
+
+
+@pytest.mark.unit
+class TestAtomicCompetencyUpdate:
+    """Test the single-statement UserCompetency update."""
+
+    def test_correct_answer_updates_counters_and_score(self, db, test_user_competencies):
+        """Test a correct answer increments counters and moves score toward difficulty."""
+        from app.services.competency import update_competency_after_attempt
+
+        comp = test_user_competencies[0]
+        updated = update_competency_after_attempt(
+            db, comp.user_id, comp.ka_id, is_correct=True, question_difficulty=Decimal("0.70")
+        )
+
+        assert updated.competency_score == Decimal("0.52")
+        assert updated.attempts_count == 1
+        assert updated.correct_count == 1
+        assert updated.incorrect_count == 0
+
+    def test_incorrect_answer_lowers_score(self, db, test_user_competencies):
+        """Test an incorrect answer on an easier question lowers the score."""
+        from app.services.competency import update_competency_after_attempt
+
+        comp = test_user_competencies[0]
+        updated = update_competency_after_attempt(
+            db, comp.user_id, comp.ka_id, is_correct=False, question_difficulty=Decimal("0.30"),
+            commit=False
+        )
+
+        assert updated.competency_score == Decimal("0.48")
+        assert updated.incorrect_count == 1
+
+    def test_updates_apply_to_current_row_not_stale_copy(self, db, test_user_competencies):
+        """Test the update builds on the stored row, not a stale in-memory value."""
+        from sqlalchemy import text
+        from app.services.competency import update_competency_after_attempt
+
+        comp = test_user_competencies[0]
+        # Another writer changes the row behind this session's back
+        db.execute(
+            text("UPDATE user_competency SET attempts_count = 5, competency_score = 0.90 WHERE competency_id = :id"),
+            {"id": comp.competency_id}
+        )
+
+        updated = update_competency_after_attempt(
+            db, comp.user_id, comp.ka_id, is_correct=True, question_difficulty=Decimal("0.90")
+        )
+
+        assert updated.attempts_count == 6
+        assert updated.competency_score == Decimal("0.90")
+
+    def test_creates_missing_competency(self, db, test_user_with_profile, test_cbap_course):
+        """Test the first attempt in a KA without a row creates it."""
+        from app.services.competency import update_competency_after_attempt
+
+        ka = test_cbap_course.knowledge_areas[0]
+        created = update_competency_after_attempt(
+            db, test_user_with_profile.user_id, ka.ka_id, is_correct=True, question_difficulty=Decimal("1.00")
+        )
+
+        assert created.competency_score == Decimal("0.55")
+        assert created.attempts_count == 1
+        assert created.correct_count == 1
+
+
+@pytest.mark.unit
+class TestCompetencySnapshots:
+    """Test the daily competency snapshot series."""
+
+    def test_updates_upsert_one_snapshot_per_day(self, db, test_user_competencies):
+        """Test same-day updates keep the latest score and count attempts."""
+        from app.services.competency import get_competency_trends, update_competency_after_attempt
+
+        comp = test_user_competencies[0]
+        update_competency_after_attempt(db, comp.user_id, comp.ka_id, True, Decimal("0.70"))
+        latest = update_competency_after_attempt(db, comp.user_id, comp.ka_id, True, Decimal("0.70"))
+
+        trends = get_competency_trends(db, comp.user_id, days=30)
+        snapshots = trends[str(comp.ka_id)]
+
+        assert len(snapshots) == 1
+        assert snapshots[0].competency_score == latest.competency_score
+        assert snapshots[0].attempts_count == 2
+
+    def test_trend_window_filters_old_snapshots(self, db, test_user_competencies):
+        """Test only snapshots inside the requested window are returned, in date order."""
+        from datetime import datetime, timedelta, timezone
+        from app.models.learning import CompetencySnapshot
+        from app.services.competency import get_competency_trends
+
+        comp = test_user_competencies[0]
+        today = datetime.now(timezone.utc).date()
+        for days_ago, score in [(200, "0.40"), (60, "0.45"), (5, "0.55")]:
+            db.add(CompetencySnapshot(
+                user_id=comp.user_id,
+                ka_id=comp.ka_id,
+                snapshot_date=today - timedelta(days=days_ago),
+                competency_score=Decimal(score),
+                attempts_count=1
+            ))
+        db.commit()
+
+        def scores(days):
+            return [s.competency_score for s in get_competency_trends(db, comp.user_id, days=days)[str(comp.ka_id)]]
+
+        assert scores(30) == [Decimal("0.55")]
+        assert scores(90) == [Decimal("0.45"), Decimal("0.55")]
+        assert scores(365) == [Decimal("0.40"), Decimal("0.45"), Decimal("0.55")]
@@ -0,0 +1,99 @@
+"""
+Unit tests for the diagnostic form pool.
+
+Tests:
+- Blueprint balance (1 easy, 2 medium, 1 hard per KA)
+- Exposure spreading across generated forms
+- Form rotation
+- Pool regeneration after question bank invalidation
+"""
+import pytest
+from array import array
+from collections import Counter
+
+from app.services.question_bank import CourseQuestionBank, KAQuestionBank
+from app.services.diagnostic_forms import DiagnosticFormPool, generate_forms
+
+
+def _make_bank(difficulties_by_ka):
+    """Build an in-memory bank: {ka_id: [difficulty, ...]} -> CourseQuestionBank."""
+    by_ka = {}
+    for ka_id, difficulties in difficulties_by_ka.items():
+        difficulties = sorted(difficulties)
+        ids = tuple(f"{ka_id}-q{i}" for i in range(len(difficulties)))
+        by_ka[ka_id] = KAQuestionBank(array("d", difficulties), ids)
+    return CourseQuestionBank("course-1", tuple(difficulties_by_ka), by_ka, 0.0)
+
+
+@pytest.mark.unit
+class TestGenerateForms:
+    """Test diagnostic form generation."""
+
+    def test_forms_follow_blueprint(self):
+        """Test each form has 1 easy, 2 medium, 1 hard question per KA."""
+        bank = _make_bank({
+            "ka1": [0.1, 0.2, 0.45, 0.5, 0.55, 0.6, 0.8, 0.9],
+            "ka2": [0.3, 0.35, 0.4, 0.65, 0.75, 1.0],
+        })
+        difficulty = {
+            qid: d
+            for ka_id in bank.ka_ids
+            for qid, d in zip(bank.ka(ka_id).question_ids, bank.ka(ka_id).difficulties)
+        }
+
+        for form in generate_forms(bank, pool_size=5):
+            assert len(form) == 8
+            assert len(set(form)) == 8
+            for ka_id, ka_form in (("ka1", form[:4]), ("ka2", form[4:])):
+                bands = [difficulty[qid] for qid in ka_form]
+                assert all(qid.startswith(ka_id) for qid in ka_form)
+                assert bands[0] < 0.4
+                assert all(0.4 <= d < 0.7 for d in bands[1:3])
+                assert bands[3] >= 0.7
+
+    def test_forms_spread_exposure(self):
+        """Test questions in a band are used evenly across the pool."""
+        bank = _make_bank({"ka1": [0.1, 0.2, 0.3, 0.5, 0.5, 0.5, 0.5, 0.8, 0.9]})
+
+        forms = generate_forms(bank, pool_size=6)
+        exposure = Counter(qid for form in forms for qid in form)
+
+        # 3 easy questions over 6 forms -> each used exactly twice
+        easy_ids = bank.ka("ka1").ids_in_range(0.0, 0.4, upper_inclusive=False)
+        assert [exposure[qid] for qid in easy_ids] == [2, 2, 2]
+
+    def test_short_band_filled_from_same_ka(self):
+        """Test missing bands are filled with other questions from the KA."""
+        bank = _make_bank({"ka1": [0.5, 0.55, 0.6, 0.65, 0.5]})
+
+        form = generate_forms(bank, pool_size=1)[0]
+
+        assert len(form) == 4
+        assert len(set(form)) == 4
+
+
+@pytest.mark.unit
+class TestFormRotation:
+    """Test form hand-out."""
+
+    def test_forms_rotate(self):
+        """Test next_form cycles through the pool."""
+        pool = DiagnosticFormPool(_make_bank({}), [("a",), ("b",), ("c",)])
+
+        assert [pool.next_form() for _ in range(4)] == [("a",), ("b",), ("c",), ("a",)]
+
+    def test_empty_pool(self):
+        """Test an empty pool hands out an empty form."""
+        assert DiagnosticFormPool(_make_bank({}), []).next_form() == ()
+
+    def test_pool_regenerated_after_invalidation(self, db, test_cbap_course, test_questions):
+        """Test invalidating the question bank yields a fresh pool."""
+        from app.services.diagnostic_forms import get_form_pool
+        from app.services.question_bank import invalidate_question_bank
+
+        pool = get_form_pool(db, test_cbap_course.course_id)
+        assert get_form_pool(db, test_cbap_course.course_id) is pool
+
+        invalidate_question_bank(test_cbap_course.course_id)
+
+        assert get_form_pool(db, test_cbap_course.course_id) is not pool
@@ -4,7 +4,13 @@ Unit tests for encryption utilities.
 Tests field-level encryption for PII data.
 """
 import pytest
-from app.utils.encryption import encrypt_field, decrypt_field, generate_encryption_key
+from app.utils import encryption
+from app.utils.encryption import (
+    encrypt_field, decrypt_field, generate_encryption_key, blind_index,
+    search_token_hashes, search_query_hashes, DecryptionCache, decrypt_field_cached,
+    encrypt_many, decrypt_many, is_legacy_ciphertext, AESGCM_PREFIX,
+    configure_encryption_keys, configured_encryption_keys, reencrypt_field
+)
 
 
 def test_encrypt_decrypt_field():
@@ -48,3 +54,223 @@ def test_decrypt_invalid_data():
     """Test decryption of invalid encrypted data."""
     with pytest.raises(ValueError):
         decrypt_field("invalid-encrypted-data")
+
+
+def test_blind_index_deterministic():
+    """Test blind index is stable for the same value."""
+    assert blind_index("test@example.com") == blind_index("test@example.com")
+    assert len(blind_index("test@example.com")) == 64
+
+
+def test_blind_index_normalizes_case_and_whitespace():
+    """Test blind index ignores case and surrounding whitespace."""
+    assert blind_index("  Test@Example.COM ") == blind_index("test@example.com")
+
+
+def test_blind_index_differs_per_value():
+    """Test blind index does not collide for different values."""
+    assert blind_index("a@example.com") != blind_index("b@example.com")
+
+
+def test_blind_index_does_not_leak_plaintext():
+    """Test blind index is keyed, not a plain hash of the value."""
+    import hashlib
+
+    assert blind_index("test@example.com") != hashlib.sha256(b"test@example.com").hexdigest()
+
+
+def test_blind_index_none():
+    """Test blind index of None value."""
+    assert blind_index(None) is None
+
+
+def test_search_query_tokens_subset_of_value_tokens():
+    """Test a substring's query tokens are all present in the value's tokens."""
+    value_tokens = search_token_hashes("email", "learner@test.com")
+
+    assert search_query_hashes("email", "rner@te") <= value_tokens
+    assert search_query_hashes("email", "LE") <= value_tokens  # short prefix
+
+
+def test_search_tokens_namespaced_by_field():
+    """Test the same text hashes differently per field."""
+    assert search_token_hashes("email", "test").isdisjoint(search_token_hashes("first_name", "test"))
+
+
+def test_search_query_blank_term():
+    """Test blank search terms produce no tokens."""
+    assert search_query_hashes("email", "   ") == set()
+    assert search_token_hashes("email", None) == set()
+
+
+def test_decryption_cache_counts_hits_and_misses():
+    """Test repeated decryption of one ciphertext is served from the cache."""
+    cache = DecryptionCache(max_entries=10, ttl_seconds=60)
+    ciphertext = encrypt_field("test@example.com")
+
+    assert cache.get(ciphertext) is None
+    cache.set(ciphertext, "test@example.com")
+    assert cache.get(ciphertext) == "test@example.com"
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_decryption_cache_evicts_least_recently_used():
+    """Test the cache stays within max_entries, dropping the oldest unused entry."""
+    cache = DecryptionCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_decryption_cache_expires_entries(monkeypatch):
+    """Test entries older than the TTL are treated as misses."""
+    cache = DecryptionCache(max_entries=10, ttl_seconds=60)
+    now = [1000.0]
+    monkeypatch.setattr(encryption.time, "monotonic", lambda: now[0])
+
+    cache.set("a", "1")
+    now[0] += 61
+
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_decryption_cache_wipe():
+    """Test wipe drops all plaintext (key rotation hook)."""
+    cache = DecryptionCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", "1")
+
+    cache.wipe()
+
+    assert cache.get("a") is None
+
+
+def test_decrypt_field_cached(monkeypatch):
+    """Test cached decryption matches decrypt_field and skips Fernet on a hit."""
+    monkeypatch.setattr(encryption, "decryption_cache", DecryptionCache(max_entries=10, ttl_seconds=60))
+    ciphertext = encrypt_field("learner@test.com")
+
+    assert decrypt_field_cached(ciphertext) == "learner@test.com"
+    assert decrypt_field_cached(ciphertext) == "learner@test.com"
+    assert encryption.decryption_cache.stats()["hits"] == 1
+    assert decrypt_field_cached(None) is None
+
+
+def test_decrypt_field_cached_does_not_cache_failures(monkeypatch):
+    """Test undecryptable values raise every time and are never stored."""
+    monkeypatch.setattr(encryption, "decryption_cache", DecryptionCache(max_entries=10, ttl_seconds=60))
+
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            decrypt_field_cached("invalid-encrypted-data")
+    assert encryption.decryption_cache.stats()["size"] == 0
+
+
+def test_new_values_use_aesgcm_envelope():
+    """Test new ciphertexts are versioned v2 envelopes."""
+    encrypted = encrypt_field("test@example.com")
+
+    assert encrypted.startswith(AESGCM_PREFIX)
+    assert not is_legacy_ciphertext(encrypted)
+    assert decrypt_field(encrypted) == "test@example.com"
+
+
+def test_legacy_fernet_values_still_decrypt():
+    """Test rows written as Fernet tokens read back (lazy migration)."""
+    legacy = encryption._cipher.encrypt("legacy@example.com".encode()).decode()
+
+    assert is_legacy_ciphertext(legacy)
+    assert decrypt_field(legacy) == "legacy@example.com"
+    assert decrypt_many([legacy, encrypt_field("new@example.com")]) == ["legacy@example.com", "new@example.com"]
+
+
+def test_fernet_format_setting(monkeypatch):
+    """Test PII_ENCRYPTION_FORMAT=fernet keeps writing legacy tokens."""
+    monkeypatch.setattr(encryption.settings, "PII_ENCRYPTION_FORMAT", "fernet")
+
+    assert all(is_legacy_ciphertext(value) for value in encrypt_many(["a@example.com", "b@example.com"]))
+    assert is_legacy_ciphertext(encrypt_field("c@example.com"))
+
+
+def test_tampered_envelope_fails():
+    """Test the GCM tag rejects modified ciphertexts."""
+    encrypted = encrypt_field("test@example.com")
+    tampered = encrypted[:-4] + ("AAAA" if encrypted[-4:] != "AAAA" else "BBBB")
+
+    with pytest.raises(ValueError):
+        decrypt_field(tampered)
+
+
+def test_encrypt_many_decrypt_many_round_trip():
+    """Test batch APIs keep order, pass empty values through and use fresh nonces."""
+    values = ["a@example.com", None, "", "a@example.com"]
+
+    encrypted = encrypt_many(values)
+
+    assert encrypted[1] is None and encrypted[2] == ""
+    assert encrypted[0] != encrypted[3]
+    assert decrypt_many(encrypted) == values
+
+
+def test_decrypt_many_raises_on_invalid_value():
+    """Test a bad value in a batch raises like decrypt_field."""
+    with pytest.raises(ValueError):
+        decrypt_many([encrypt_field("ok@example.com"), "not-encrypted"])
+
+
+def test_old_keys_still_decrypt_after_rotation():
+    """Test values under a previous key decrypt and are re-encrypted under the new one."""
+    old_key = configured_encryption_keys()[0]
+    new_key = generate_encryption_key()
+    old_values = [encrypt_field("a@example.com"), encryption._cipher.encrypt(b"b@example.com").decode()]
+    configure_encryption_keys([new_key, old_key])
+    try:
+        assert decrypt_many(old_values) == ["a@example.com", "b@example.com"]
+
+        rotated = [reencrypt_field(value) for value in old_values]
+        assert all(value.startswith(AESGCM_PREFIX) for value in rotated)
+        assert reencrypt_field(rotated[0]) is None  # already current
+        assert reencrypt_field(None) is None
+
+        configure_encryption_keys([new_key])  # old key retired
+        assert decrypt_many(rotated) == ["a@example.com", "b@example.com"]
+    finally:
+        configure_encryption_keys(configured_encryption_keys())
+
+
+def test_reencrypt_field_rejects_unknown_key():
+    """Test values under a key that is no longer configured fail loudly."""
+    value = encrypt_field("a@example.com")
+    configure_encryption_keys([generate_encryption_key()])
+    try:
+        with pytest.raises(ValueError):
+            reencrypt_field(value)
+    finally:
+        configure_encryption_keys(configured_encryption_keys())
+
+
+def test_blind_index_key_required_during_rotation(monkeypatch):
+    """Test old keys without a pinned BLIND_INDEX_KEY refuse to load."""
+    monkeypatch.setattr(encryption.settings, "ENCRYPTION_OLD_KEYS", generate_encryption_key())
+    monkeypatch.setattr(encryption.settings, "BLIND_INDEX_KEY", "")
+
+    with pytest.raises(RuntimeError):
+        encryption._derive_blind_index_key()
+
+
+def test_exported_blind_index_key_reproduces_index(monkeypatch):
+    """Test pinning the exported key keeps every blind index unchanged across a rotation."""
+    exported = encryption.export_blind_index_key()
+    monkeypatch.setattr(encryption.settings, "BLIND_INDEX_KEY", exported)
+    monkeypatch.setattr(encryption.settings, "ENCRYPTION_OLD_KEYS", encryption.settings.ENCRYPTION_KEY)
+    monkeypatch.setattr(encryption.settings, "ENCRYPTION_KEY", generate_encryption_key())
+
+    assert encryption._derive_blind_index_key() == encryption._blind_index_key
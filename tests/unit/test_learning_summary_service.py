@@ -0,0 +1,108 @@
+"""
+Unit tests for the learning summary service.
+
+Tests:
+- Incremental attempt and completion upserts
+- Rebuild from sessions and attempts matches incremental totals
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+
+from app.models.learning import Session as LearningSession, QuestionAttempt, UserCourseSummary
+from app.services.learning_summary import (
+    get_learning_summary,
+    rebuild_learning_summaries,
+    record_attempt_summary,
+    record_session_summary,
+)
+
+
+def _completed_session(db, user_id, course_id, session_type, completed_at, duration_seconds):
+    session = LearningSession(
+        user_id=user_id,
+        course_id=course_id,
+        session_type=session_type,
+        is_completed=True,
+        completed_at=completed_at,
+        duration_seconds=duration_seconds
+    )
+    db.add(session)
+    db.flush()
+    return session
+
+
+@pytest.mark.unit
+class TestIncrementalSummary:
+    """Test summary rows maintained by the submit and complete paths."""
+
+    def test_attempts_and_completions_accumulate(self, db, test_user_competencies, test_questions):
+        """Test counters, diagnostic flag and latest completion are merged."""
+        user_id = test_user_competencies[0].user_id
+        course_id = test_questions[0].course_id
+        now = datetime.now(timezone.utc)
+
+        record_attempt_summary(db, user_id, course_id, True)
+        record_attempt_summary(db, user_id, course_id, False)
+        record_attempt_summary(db, user_id, course_id, True)
+
+        diagnostic = _completed_session(db, user_id, course_id, "diagnostic", now, 600)
+        record_session_summary(db, diagnostic)
+        older = _completed_session(db, user_id, course_id, "practice", now - timedelta(days=2), 300)
+        record_session_summary(db, older)
+        db.commit()
+
+        summary = get_learning_summary(db, user_id, course_id)
+
+        assert summary.total_attempts == 3
+        assert summary.correct_attempts == 2
+        assert summary.sessions_completed == 2
+        assert summary.diagnostic_completed is True
+        assert summary.last_session_completed_at == now
+        assert summary.study_seconds == 900
+
+    def test_no_summary_without_activity(self, db, test_user_competencies, test_questions):
+        """Test users without activity have no summary row."""
+        assert get_learning_summary(
+            db, test_user_competencies[0].user_id, test_questions[0].course_id
+        ) is None
+
+
+@pytest.mark.unit
+class TestRebuildSummary:
+    """Test rebuilding summaries from source tables."""
+
+    def test_rebuild_matches_source_rows(self, db, test_user_competencies, test_questions):
+        """Test rebuild counts attempts and only completed sessions."""
+        user_id = test_user_competencies[0].user_id
+        course_id = test_questions[0].course_id
+        completed_at = datetime.now(timezone.utc)
+
+        session = _completed_session(db, user_id, course_id, "practice", completed_at, 1200)
+        for question, is_correct in zip(test_questions[:3], (True, True, False)):
+            db.add(QuestionAttempt(
+                user_id=user_id,
+                question_id=question.question_id,
+                session_id=session.session_id,
+                is_correct=is_correct
+            ))
+        db.add(LearningSession(
+            user_id=user_id,
+            course_id=course_id,
+            session_type="diagnostic",
+            is_completed=False
+        ))
+        # Stale row is replaced, not added to
+        db.add(UserCourseSummary(user_id=user_id, course_id=course_id, total_attempts=99))
+        db.commit()
+
+        assert rebuild_learning_summaries(db, user_id=user_id) == 1
+
+        db.expire_all()
+        summary = get_learning_summary(db, user_id, course_id)
+
+        assert summary.total_attempts == 3
+        assert summary.correct_attempts == 2
+        assert summary.sessions_completed == 1
+        assert summary.diagnostic_completed is False
+        assert summary.last_session_completed_at == completed_at
+        assert summary.study_seconds == 1200
@@ -0,0 +1,111 @@
+"""
+Unit tests for failed-login backoff and lockout.
+
+Tests:
+- Free attempts, then exponential backoff
+- Lockout threshold
+- Decay of failure counts
+- Success clears the account, not the IP
+- Bounded key table
+"""
+import pytest
+
+from app.services import login_throttle as throttle_module
+from app.services.login_throttle import FailurePolicy, LoginThrottle, login_account_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock."""
+    now = [1000.0]
+    monkeypatch.setattr(throttle_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _throttle(max_keys=1000):
+    return LoginThrottle(
+        account_policy=FailurePolicy('account', free_attempts=3, lockout_failures=6),
+        ip_policy=FailurePolicy('ip', free_attempts=10, lockout_failures=20),
+        half_life_seconds=900,
+        backoff_base_seconds=1,
+        backoff_max_seconds=60,
+        lockout_seconds=900,
+        max_keys=max_keys
+    )
+
+
+@pytest.mark.unit
+class TestLoginThrottle:
+    """Test throttle decisions."""
+
+    def test_free_attempts_then_backoff(self, clock):
+        """Test using up the free attempts blocks for a doubling delay."""
+        throttle = _throttle()
+        for _ in range(2):
+            throttle.record_failure("acct", "10.0.0.1")
+            assert throttle.retry_after("acct", "10.0.0.1") == 0
+
+        throttle.record_failure("acct", "10.0.0.1")
+        assert throttle.retry_after("acct", "10.0.0.1") == 1
+        clock[0] += 1
+        assert throttle.retry_after("acct", "10.0.0.1") == 0
+
+        throttle.record_failure("acct", "10.0.0.1")
+        assert throttle.retry_after("acct", None) == 2
+
+    def test_other_account_same_ip_not_blocked(self, clock):
+        """Test an account's backoff doesn't block other accounts behind the same IP."""
+        throttle = _throttle()
+        for _ in range(3):
+            throttle.record_failure("acct", "10.0.0.1")
+
+        assert throttle.retry_after("acct", "10.0.0.1") > 0
+        assert throttle.retry_after("other", "10.0.0.1") == 0
+
+    def test_lockout_threshold(self, clock):
+        """Test reaching lockout_failures blocks for lockout_seconds."""
+        throttle = _throttle()
+        for _ in range(6):
+            throttle.record_failure("acct", None)
+
+        assert 890 < throttle.retry_after("acct", None) <= 901
+        assert throttle.stats()['lockouts'] == 1
+
+    def test_counts_decay(self, clock):
+        """Test old failures stop counting toward backoff."""
+        throttle = _throttle()
+        for _ in range(3):
+            throttle.record_failure("acct", None)
+
+        clock[0] += 900 * 4  # score 3 -> ~0.19
+        throttle.record_failure("acct", None)
+
+        assert throttle.retry_after("acct", None) == 0
+
+    def test_success_clears_account_only(self, clock):
+        """Test a correct password resets the account but not the IP count."""
+        throttle = _throttle()
+        for _ in range(12):
+            throttle.record_failure(None, "10.0.0.1")
+        throttle.record_failure("acct", None)
+
+        throttle.record_success("acct")
+
+        assert throttle.retry_after("acct", None) == 0
+        assert throttle.retry_after(None, "10.0.0.1") > 0
+        assert throttle.stats()['tracked_sources'] == 1
+
+    def test_key_table_is_bounded(self, clock):
+        """Test the least recently failed sources are evicted."""
+        throttle = _throttle(max_keys=3)
+        for i in range(5):
+            throttle.record_failure(f"acct-{i}", None)
+
+        assert throttle.stats()['tracked_sources'] == 3
+
+    def test_account_key_is_email_blind_index(self):
+        """Test accounts are keyed case-insensitively without plaintext email."""
+        key = login_account_key("Learner@Test.com ")
+
+        assert key == login_account_key("learner@test.com")
+        assert "learner" not in key
@@ -0,0 +1,152 @@
+"""
+Unit tests for the PII re-encryption job.
+
+Tests:
+- Values under an old key are rewritten under the primary key
+- Blind index lookups survive the rotation
+- Resume from a checkpoint
+- Columns changed concurrently are not overwritten, and are retried
+- Final verification pass
+- Progress reporting
+"""
+import json
+import pytest
+from cryptography.fernet import Fernet
+
+from app.models.user import User
+from app.services import pii_rotation
+from app.services.pii_rotation import ReencryptionProgress, _write_batch, count_stale_user_pii, reencrypt_user_pii
+from app.services.user import get_user_by_email
+from app.utils import encryption
+from app.utils.encryption import configure_encryption_keys, configured_encryption_keys, decrypt_field, encrypt_field
+
+NEW_KEY = Fernet.generate_key().decode()
+
+
+@pytest.fixture
+def rotated_keys():
+    """Rotate to NEW_KEY, keeping the test key as the old key."""
+    old_key = configured_encryption_keys()[0]
+    configure_encryption_keys([NEW_KEY, old_key])
+    yield old_key
+    configure_encryption_keys(configured_encryption_keys())
+    encryption.wipe_decryption_cache()
+
+
+def _raw_columns(db, user_id):
+    table = User.__table__
+    return db.execute(
+        table.select().with_only_columns(table.c.email, table.c.first_name, table.c.last_name, table.c.two_factor_secret)
+        .where(table.c.user_id == user_id)
+    ).one()
+
+
+@pytest.mark.unit
+class TestReencryptUserPii:
+    """Test the rotation job end to end against the users table."""
+
+    def test_rewrites_values_under_primary_key(self, db, test_learner_user, test_admin_user, tmp_path):
+        """Test every encrypted column moves to the new key and still reads the same."""
+        test_learner_user.two_factor_secret = encrypt_field("JBSWY3DPEHPK3PXP")
+        db.commit()
+
+        old_key = configured_encryption_keys()[0]
+        configure_encryption_keys([NEW_KEY, old_key])
+        try:
+            progress = reencrypt_user_pii(
+                db.get_bind(), batch_size=1, workers=2, checkpoint_path=str(tmp_path / "rotation.json")
+            )
+            configure_encryption_keys([NEW_KEY])  # old key retired
+            encryption.wipe_decryption_cache()
+
+            raw = _raw_columns(db, test_learner_user.user_id)
+            assert decrypt_field(raw.email) == "learner@test.com"
+            assert decrypt_field(raw.two_factor_secret) == "JBSWY3DPEHPK3PXP"
+            assert get_user_by_email(db, "learner@test.com").user_id == test_learner_user.user_id
+        finally:
+            configure_encryption_keys(configured_encryption_keys())
+            encryption.wipe_decryption_cache()
+
+        assert (progress.scanned, progress.reencrypted, progress.failed, progress.conflicts) == (2, 2, 0, 0)
+        assert progress.stale == 0
+        assert not (tmp_path / "rotation.json").exists()
+
+    def test_second_run_rewrites_nothing(self, db, test_learner_user, rotated_keys):
+        """Test values already under the primary key are left alone."""
+        reencrypt_user_pii(db.get_bind())
+        before = _raw_columns(db, test_learner_user.user_id)
+
+        progress = reencrypt_user_pii(db.get_bind())
+
+        assert progress.reencrypted == 0
+        assert _raw_columns(db, test_learner_user.user_id) == before
+
+    def test_resumes_from_checkpoint(self, db, test_learner_user, test_admin_user, rotated_keys, tmp_path):
+        """Test a restarted job skips users before the checkpoint."""
+        first_id, second_id = sorted([test_learner_user.user_id, test_admin_user.user_id])
+        checkpoint = tmp_path / "rotation.json"
+        checkpoint.write_text(json.dumps(ReencryptionProgress(last_user_id=first_id, scanned=1).to_dict()))
+        reports = []
+
+        progress = reencrypt_user_pii(db.get_bind(), checkpoint_path=str(checkpoint), progress_callback=reports.append)
+
+        assert (progress.scanned, progress.total, progress.reencrypted) == (2, 2, 1)
+        assert progress.stale == 1  # the user before the checkpoint is reported, not silently skipped
+        assert reports and reports[-1].last_user_id == second_id
+
+        configure_encryption_keys([NEW_KEY])
+        assert decrypt_field(_raw_columns(db, second_id).email)
+        with pytest.raises(ValueError):
+            decrypt_field(_raw_columns(db, first_id).email)  # before the checkpoint: untouched
+
+    def test_concurrently_changed_column_not_overwritten(self, db, test_learner_user, rotated_keys):
+        """Test a column the app changed keeps its value while the others are rewritten."""
+        read = _raw_columns(db, test_learner_user.user_id)
+        test_learner_user.first_name = "Renamed"
+        db.commit()
+
+        params = {'user_id': test_learner_user.user_id}
+        for name in ('email', 'first_name', 'last_name', 'two_factor_secret'):
+            params[f'old_{name}'] = getattr(read, name)
+            params[f'new_{name}'] = encrypt_field("overwritten") if getattr(read, name) else None
+
+        assert _write_batch(db.get_bind(), [params]) == [test_learner_user.user_id]
+        db.expire_all()
+        encryption.wipe_decryption_cache()
+        assert test_learner_user.first_name == "Renamed"
+        assert test_learner_user.email == "overwritten"
+
+    def test_conflicted_rows_retried_before_checkpoint(self, db, test_learner_user, rotated_keys, monkeypatch):
+        """Test a value written under the old key mid-run is re-read and rewritten."""
+        old_fernet = Fernet(rotated_keys.encode())
+        reencrypt_rows = pii_rotation._reencrypt_rows
+        calls = []
+
+        def reencrypt_then_concurrent_write(rows):
+            result = reencrypt_rows(rows)
+            if not calls:  # an old worker renames the user between our read and write
+                db.execute(
+                    User.__table__.update()
+                    .where(User.__table__.c.user_id == test_learner_user.user_id)
+                    .values(first_name=old_fernet.encrypt(b"Old Worker").decode())
+                )
+                db.commit()
+            calls.append(len(rows))
+            return result
+
+        monkeypatch.setattr(pii_rotation, "_reencrypt_rows", reencrypt_then_concurrent_write)
+
+        progress = reencrypt_user_pii(db.get_bind(), workers=1)
+
+        assert len(calls) == 2  # the batch, then the re-read conflicted row
+        assert (progress.conflicts, progress.stale) == (0, 0)
+        configure_encryption_keys([NEW_KEY])
+        assert decrypt_field(_raw_columns(db, test_learner_user.user_id).first_name) == "Old Worker"
+
+    def test_count_stale_user_pii(self, db, test_learner_user, test_admin_user, rotated_keys):
+        """Test the verification pass finds users still under the old key."""
+        assert count_stale_user_pii(db.get_bind()) == 2
+
+        reencrypt_user_pii(db.get_bind())
+
+        assert count_stale_user_pii(db.get_bind()) == 0
@@ -430,3 +430,139 @@ class TestQuestionSelectionEdgeCases:
         # Should return None or expand search
         # Depending on implementation, this might return None or use a fallback
         assert question is None or question.question_id not in all_question_ids
+
+
+@pytest.mark.unit
+class TestQuestionBankIndex:
+    """Test the in-memory question bank used by selection."""
+
+    def test_ids_in_range_bounds(self):
+        """Test difficulty range lookup honours inclusive/exclusive upper bound."""
+        from array import array
+        from app.services.question_bank import KAQuestionBank
+
+        ka_bank = KAQuestionBank(array("d", [0.3, 0.4, 0.5, 0.7]), ("q1", "q2", "q3", "q4"))
+
+        assert ka_bank.ids_in_range(0.4, 0.7) == ("q2", "q3", "q4")
+        assert ka_bank.ids_in_range(0.4, 0.7, upper_inclusive=False) == ("q2", "q3")
+        assert ka_bank.ids_in_range(0.8, 1.0) == ()
+
+    def test_sample_question_ids_skips_excluded(self):
+        """Test sampling never returns excluded IDs and caps at available."""
+        from app.services.question_bank import sample_question_ids
+
+        picked = sample_question_ids(("q1", "q2", "q3"), {"q1", "q3"}, count=2)
+
+        assert picked == ["q2"]
+
+    def test_diagnostic_selection_covers_every_ka(self, db, test_cbap_course, test_questions):
+        """Test diagnostic selection returns each KA's questions from the index."""
+        from app.services.question_selection import select_diagnostic_questions
+
+        questions = select_diagnostic_questions(db, test_cbap_course.course_id)
+
+        # 3 questions per KA in fixtures, all selected
+        assert len(questions) == len(test_questions)
+        assert len({q.question_id for q in questions}) == len(test_questions)
+
+    def test_deactivated_question_not_selected(self, db, test_user_competencies, test_questions):
+        """Test a question deactivated after the bank was built is never returned."""
+        user_id = test_user_competencies[0].user_id
+        select_next_question(db, user_id)  # builds the bank
+
+        for question in test_questions[1:]:
+            question.is_active = False
+        db.commit()
+
+        for _ in range(5):
+            question = select_next_question(db, user_id)
+            assert question.question_id == test_questions[0].question_id
+
+    def test_invalidate_picks_up_new_questions(self, db, test_cbap_course, test_questions):
+        """Test invalidation makes newly added questions selectable."""
+        from app.models.question import Question
+        from app.services.question_bank import get_question_bank, invalidate_question_bank
+
+        bank = get_question_bank(db, test_cbap_course.course_id)
+        ka_id = bank.ka_ids[0]
+
+        new_question = Question(
+            course_id=test_cbap_course.course_id,
+            ka_id=ka_id,
+            question_text="Newly imported question",
+            question_type="multiple_choice",
+            difficulty=Decimal("0.95"),
+            source="custom",
+            is_active=True
+        )
+        db.add(new_question)
+        db.commit()
+
+        assert new_question.question_id not in get_question_bank(db, test_cbap_course.course_id).ka(ka_id).question_ids
+
+        invalidate_question_bank(test_cbap_course.course_id)
+
+        assert get_question_bank(db, test_cbap_course.course_id).ka(ka_id).ids_in_range(0.9, 1.0) == (
+            new_question.question_id,
+        )
+
+
+@pytest.mark.unit
+class TestPracticeQuestionBatch:
+    """Test batched practice question selection."""
+
+    def test_practice_batch_unique_and_weakest_first(self, db, test_user_competencies, test_questions):
+        """Test batch has no repeats and starts from the weakest KA's band."""
+        from app.services.question_selection import select_practice_questions
+
+        user_id = test_user_competencies[0].user_id
+        weakest = test_user_competencies[0]
+        weakest.competency_score = Decimal("0.30")
+        db.commit()
+
+        questions = select_practice_questions(db, user_id, test_questions[0].course_id, count=5)
+
+        assert len(questions) == 5
+        assert len({q.question_id for q in questions}) == 5
+        # Band (0.2-0.4) first, then the rest of the weakest KA
+        assert questions[0].ka_id == weakest.ka_id
+        assert float(questions[0].difficulty) == 0.3
+        assert all(q.ka_id == weakest.ka_id for q in questions[:3])
+
+    def test_practice_batch_capped_by_available(self, db, test_user_competencies, test_questions):
+        """Test a KA-focused batch returns only that KA's questions."""
+        from app.services.question_selection import select_practice_questions
+
+        user_id = test_user_competencies[0].user_id
+        ka_id = test_questions[0].ka_id
+
+        questions = select_practice_questions(
+            db, user_id, test_questions[0].course_id, count=10, ka_id=ka_id
+        )
+
+        assert len(questions) == 3
+        assert all(q.ka_id == ka_id for q in questions)
+
+    def test_concurrent_session_assignment_keeps_first_set(self, db, test_user_competencies, test_questions):
+        """Test assigning a set to a session that already has one skips the conflicting rows."""
+        from app.models.learning import Session as LearningSession, SessionQuestion
+        from app.services.question_selection import assign_session_questions, get_next_session_question
+
+        session = LearningSession(
+            user_id=test_user_competencies[0].user_id,
+            course_id=test_questions[0].course_id,
+            session_type='diagnostic'
+        )
+        db.add(session)
+        db.flush()
+
+        first, second = test_questions[:3], list(reversed(test_questions[:3]))
+        assign_session_questions(db, session.session_id, first)
+        assign_session_questions(db, session.session_id, second)  # lost the race
+        db.commit()
+
+        stored = db.query(SessionQuestion.question_id).filter(
+            SessionQuestion.session_id == session.session_id
+        ).order_by(SessionQuestion.position).all()
+        assert [question_id for question_id, in stored] == [q.question_id for q in first]
+        assert get_next_session_question(db, session).question_id == first[0].question_id
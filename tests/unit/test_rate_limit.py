@@ -0,0 +1,179 @@
+"""
+Unit tests for request rate limiting.
+
+Tests:
+- Token bucket fallback (budget, refill, key isolation)
+- Policy resolution (login route, roles, anonymous)
+- Client IP only taken from X-Forwarded-For hops added by trusted proxies
+- Fallback when Redis is unreachable
+- Redis clients of previous event loops are closed
+- Block events recorded once per block period
+"""
+import asyncio
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import (
+    ADMIN_POLICY,
+    ANONYMOUS_POLICY,
+    LEARNER_POLICY,
+    RateLimiter,
+    RateLimitPolicy,
+    RedisSlidingWindowLimiter,
+    TokenBucketLimiter,
+    resolve_policy,
+)
+from app.utils.security import create_access_token
+
+
+@pytest.mark.unit
+class TestTokenBucketLimiter:
+    """Test the in-process fallback."""
+
+    def test_blocks_after_budget_spent(self):
+        """Test a full bucket allows exactly `limit` requests."""
+        limiter = TokenBucketLimiter()
+        policy = RateLimitPolicy("test", limit=3)
+
+        results = [limiter.hit("ip:1", policy) for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[2].remaining == 0
+        assert results[3].reset_seconds >= 1
+
+    def test_refills_over_time(self, monkeypatch):
+        """Test tokens come back at limit / window per second."""
+        now = [1000.0]
+        monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+        limiter = TokenBucketLimiter()
+        policy = RateLimitPolicy("test", limit=2, window_seconds=60)
+
+        limiter.hit("ip:1", policy)
+        limiter.hit("ip:1", policy)
+        assert not limiter.hit("ip:1", policy).allowed
+
+        now[0] += 30  # one token
+        assert limiter.hit("ip:1", policy).allowed
+        assert not limiter.hit("ip:1", policy).allowed
+
+    def test_keys_are_isolated_and_bounded(self):
+        """Test identities have separate buckets and old ones are evicted."""
+        limiter = TokenBucketLimiter(max_keys=2)
+        policy = RateLimitPolicy("test", limit=1)
+
+        assert limiter.hit("ip:1", policy).allowed
+        assert limiter.hit("ip:2", policy).allowed
+        assert not limiter.hit("ip:1", policy).allowed
+        limiter.hit("ip:3", policy)
+
+        assert len(limiter._buckets) == 2
+
+
+@pytest.mark.unit
+class TestPolicyResolution:
+    """Test which budget a request is counted against."""
+
+    def test_login_route_policy_is_per_ip(self):
+        """Test the login route uses its own stricter per-IP policy."""
+        policy, user_id = resolve_policy("POST", "/v1/auth/login", None)
+
+        assert policy.name == "auth_login"
+        assert policy.scope == "ip"
+        assert policy.limit < LEARNER_POLICY.limit
+
+    def test_roles_map_to_policies(self):
+        """Test learners and admins get their role's budget per user."""
+        learner = create_access_token({"sub": "user-1", "role": "learner"})
+        admin = create_access_token({"sub": "user-2", "role": "admin"})
+
+        assert resolve_policy("GET", "/v1/dashboard", f"Bearer {learner}") == (LEARNER_POLICY, "user-1")
+        assert resolve_policy("GET", "/v1/admin/users", f"Bearer {admin}") == (ADMIN_POLICY, "user-2")
+
+    def test_invalid_token_is_anonymous(self):
+        """Test unverifiable tokens are counted per IP."""
+        assert resolve_policy("GET", "/v1/dashboard", "Bearer not-a-jwt") == (ANONYMOUS_POLICY, None)
+        assert resolve_policy("GET", "/v1/dashboard", None) == (ANONYMOUS_POLICY, None)
+
+
+def _request(forwarded_for=None, client_host="10.0.0.9"):
+    from starlette.requests import Request
+
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": (client_host, 50000)})
+
+
+@pytest.mark.unit
+class TestClientIp:
+    """Test which address per-IP budgets are keyed on."""
+
+    def test_forwarded_for_ignored_without_trusted_proxies(self, monkeypatch):
+        """Test a client-supplied X-Forwarded-For can't choose the IP bucket."""
+        from app.api.dependencies import get_client_ip
+
+        monkeypatch.setattr(rate_limit.settings, "TRUSTED_PROXY_COUNT", 0)
+
+        assert get_client_ip(_request("203.0.113.5")) == "10.0.0.9"
+
+    def test_rightmost_untrusted_hop_behind_proxies(self, monkeypatch):
+        """Test hops prepended by the client are skipped behind trusted proxies."""
+        from app.api.dependencies import get_client_ip
+
+        monkeypatch.setattr(rate_limit.settings, "TRUSTED_PROXY_COUNT", 2)
+
+        # spoofed by the client, client as seen by the edge proxy, edge proxy as seen by the inner one
+        assert get_client_ip(_request("198.51.100.1, 203.0.113.5, 10.0.0.2")) == "203.0.113.5"
+        assert get_client_ip(_request("203.0.113.5")) == "203.0.113.5"
+
+
+@pytest.mark.unit
+class TestRateLimiter:
+    """Test backend selection and block bookkeeping."""
+
+    def test_unreachable_redis_falls_back_to_memory(self):
+        """Test a Redis error switches to token buckets until the retry delay passes."""
+        limiter = RateLimiter("redis://127.0.0.1:1/0", redis_retry_seconds=30)
+        policy = RateLimitPolicy("test", limit=1)
+        assert limiter.backend == "redis"
+
+        first = asyncio.run(limiter.hit("ip:1", policy))
+        second = asyncio.run(limiter.hit("ip:1", policy))
+
+        assert (first.allowed, second.allowed) == (True, False)
+        assert limiter.backend == "memory"
+        stats = limiter.stats()
+        assert (stats['redis_errors'], stats['allowed'], stats['blocked']) == (1, 1, 1)
+
+    def test_client_of_previous_event_loop_closed(self, monkeypatch):
+        """Test a new event loop gets its own Redis client and the previous pool is closed."""
+        closed = []
+
+        class FakeRedis:
+            async def aclose(self):
+                closed.append(self)
+
+        monkeypatch.setattr(rate_limit.aioredis, "from_url", lambda *args, **kwargs: FakeRedis())
+        limiter = RedisSlidingWindowLimiter("redis://127.0.0.1:1/0")
+
+        async def client_twice():
+            return await limiter._client(), await limiter._client()
+
+        first, same = asyncio.run(client_twice())
+        second = asyncio.run(limiter._client())
+
+        assert first is same and second is not first
+        assert closed == [first]
+
+        asyncio.run(limiter.aclose())
+        assert closed == [first, second]
+
+    def test_block_recorded_once_per_period(self):
+        """Test repeated 429s for one identity start a single block event."""
+        limiter = RateLimiter(None, redis_retry_seconds=30)
+
+        assert limiter.start_block("auth_login:ip:1", 60)
+        assert not limiter.start_block("auth_login:ip:1", 60)
+        assert limiter.start_block("auth_login:ip:2", 60)
+        assert limiter.stats()['block_events'] == 2
+
+        limiter.reset()
+        assert limiter.start_block("auth_login:ip:1", 60)
@@ -4,16 +4,34 @@ Unit tests for security utilities.
 Tests password hashing and JWT token management.
 """
 import pytest
+import threading
 from datetime import timedelta
+from fastapi import HTTPException
 from app.utils.security import (
     get_password_hash,
     verify_password,
     create_access_token,
     create_refresh_token,
-    decode_token
+    decode_token,
+    PasswordHashPool
 )
 
 
+def _hold_slot(pool):
+    """Occupy one pool slot until the returned event is set."""
+    started = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        started.set()
+        release.wait(5)
+
+    thread = threading.Thread(target=pool.run, args=("login", hold))
+    thread.start()
+    started.wait(5)
+    return release, thread
+
+
 def test_password_hashing():
     """Test password hashing with Argon2id."""
     password = "SecurePassword123!"
@@ -98,3 +116,61 @@ def test_hash_different_passwords():
     # But both should verify
     assert verify_password(password, hash1)
     assert verify_password(password, hash2)
+
+
+def test_password_hash_pool_runs_and_records_latency():
+    """Test the pool returns the hash result and records per-operation latency."""
+    pool = PasswordHashPool(max_concurrent=2, max_waiting=2, wait_timeout_seconds=1)
+    hashed = pool.run("register", get_password_hash, "SecurePassword123!")
+
+    assert pool.run("login", verify_password, "SecurePassword123!", hashed) is True
+
+    stats = pool.stats()
+    assert stats["in_flight"] == 0
+    assert set(stats["operations"]) == {"register", "login"}
+    assert stats["operations"]["login"]["count"] == 1
+    assert stats["operations"]["login"]["avg_hash_ms"] > 0
+
+
+def test_password_hash_pool_sheds_with_429_when_queue_full():
+    """Test requests beyond the wait queue are rejected immediately."""
+    pool = PasswordHashPool(max_concurrent=1, max_waiting=0, wait_timeout_seconds=1)
+    release, thread = _hold_slot(pool)
+    try:
+        assert pool.stats()["in_flight"] == 1
+        with pytest.raises(HTTPException) as exc_info:
+            pool.run("login", lambda: True)
+    finally:
+        release.set()
+        thread.join()
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "1"
+    assert pool.stats()["rejected"] == 1
+
+
+def test_password_hash_pool_sheds_with_503_after_wait_timeout():
+    """Test queued requests give up when no slot frees up in time."""
+    pool = PasswordHashPool(max_concurrent=1, max_waiting=1, wait_timeout_seconds=0.05)
+    release, thread = _hold_slot(pool)
+    try:
+        with pytest.raises(HTTPException) as exc_info:
+            pool.run("login", lambda: True)
+    finally:
+        release.set()
+        thread.join()
+
+    assert exc_info.value.status_code == 503
+    stats = pool.stats()
+    assert (stats["timed_out"], stats["waiting"]) == (1, 0)
+
+
+def test_password_hash_pool_queued_request_runs_when_slot_frees():
+    """Test a queued request proceeds once the running hash finishes."""
+    pool = PasswordHashPool(max_concurrent=1, max_waiting=1, wait_timeout_seconds=5)
+    release, thread = _hold_slot(pool)
+    threading.Timer(0.05, release.set).start()
+
+    assert pool.run("login", lambda: "done") == "done"
+    thread.join()
+    assert pool.stats()["operations"]["login"]["count"] == 2
@@ -17,7 +17,8 @@ from app.services.spaced_repetition import (
     update_easiness_factor,
     calculate_next_review_date,
     determine_card_status,
-    process_card_review
+    process_card_review,
+    ReviewStatsCache
 )
 
 
@@ -422,3 +423,176 @@ class TestSM2EdgeCases:
 
         # Should correctly handle year boundary
         assert next_date == date(2026, 1, 4)
+
+
+@pytest.mark.unit
+class TestReviewStatsCache:
+    """Test the per-user review statistics cache."""
+
+    def test_get_returns_stored_stats(self):
+        """Test stored statistics are returned within the TTL."""
+        cache = ReviewStatsCache(ttl_seconds=60)
+        cache.set("user-1", {"total_cards": 3})
+
+        assert cache.get("user-1") == {"total_cards": 3}
+        assert cache.get("user-2") is None
+
+    def test_invalidate_drops_user_entry(self):
+        """Test invalidating one user keeps other users cached."""
+        cache = ReviewStatsCache(ttl_seconds=60)
+        cache.set("user-1", {"total_cards": 3})
+        cache.set("user-2", {"total_cards": 5})
+
+        cache.invalidate("user-1")
+
+        assert cache.get("user-1") is None
+        assert cache.get("user-2") == {"total_cards": 5}
+
+    def test_zero_ttl_disables_cache(self):
+        """Test a TTL of 0 never serves cached statistics."""
+        cache = ReviewStatsCache(ttl_seconds=0)
+        cache.set("user-1", {"total_cards": 3})
+
+        assert cache.get("user-1") is None
+
+    def test_expired_entries_pruned_when_full(self, monkeypatch):
+        """Test expired entries are dropped once max_entries is reached."""
+        import app.services.spaced_repetition as sr
+
+        clock = [1000.0]
+        monkeypatch.setattr(sr.time, "monotonic", lambda: clock[0])
+
+        cache = ReviewStatsCache(ttl_seconds=30, max_entries=2)
+        cache.set("user-1", {"total_cards": 1})
+        cache.set("user-2", {"total_cards": 2})
+        clock[0] += 31
+        cache.set("user-3", {"total_cards": 3})
+
+        assert cache.get("user-1") is None
+        assert cache.get("user-3") == {"total_cards": 3}
+        assert len(cache._entries) == 1
+
+
+@pytest.mark.unit
+class TestReviewActivity:
+    """Test streaks and per-day counts from the review event log."""
+
+    def _card(self, db, user_id, question_id):
+        from datetime import timezone
+        from app.models.spaced_repetition import SpacedRepetitionCard
+
+        card = SpacedRepetitionCard(
+            user_id=user_id,
+            question_id=question_id,
+            next_review_at=datetime.now(timezone.utc)
+        )
+        db.add(card)
+        db.flush()
+        return card
+
+    def test_streaks_and_daily_counts(self, db, test_user_competencies, test_questions):
+        """Test current/longest streaks across a gap in review days."""
+        from datetime import timezone
+        from app.models.spaced_repetition import ReviewEvent
+        from app.services.spaced_repetition import get_review_activity
+
+        user_id = test_user_competencies[0].user_id
+        card = self._card(db, user_id, test_questions[0].question_id)
+        now = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+
+        # Days ago: 0 (x2), 1, 2 | gap at 3-4 | 5, 6, 7, 8
+        for days_ago in [0, 0, 1, 2, 5, 6, 7, 8]:
+            db.add(ReviewEvent(
+                user_id=user_id,
+                card_id=card.card_id,
+                question_id=card.question_id,
+                quality_rating=4,
+                is_successful=True,
+                interval_days=1,
+                reviewed_at=now - timedelta(days=days_ago)
+            ))
+        db.commit()
+
+        activity = get_review_activity(db, user_id)
+
+        assert activity["current_streak_days"] == 3
+        assert activity["longest_streak_days"] == 4
+        assert activity["daily_counts"][now.date()] == 2
+        assert len(activity["daily_counts"]) == 7
+
+    def test_no_review_today_breaks_current_streak(self, db, test_user_competencies, test_questions):
+        """Test the current streak is 0 when nothing was reviewed today."""
+        from datetime import timezone
+        from app.models.spaced_repetition import ReviewEvent
+        from app.services.spaced_repetition import get_review_activity
+
+        user_id = test_user_competencies[0].user_id
+        card = self._card(db, user_id, test_questions[0].question_id)
+        db.add(ReviewEvent(
+            user_id=user_id,
+            card_id=card.card_id,
+            question_id=card.question_id,
+            quality_rating=2,
+            is_successful=False,
+            interval_days=1,
+            reviewed_at=datetime.now(timezone.utc) - timedelta(days=2)
+        ))
+        db.commit()
+
+        activity = get_review_activity(db, user_id)
+
+        assert activity["current_streak_days"] == 0
+        assert activity["longest_streak_days"] == 1
+
+    def test_process_card_review_appends_event(self, db, test_user_competencies, test_questions):
+        """Test each DB-mode review appends one event."""
+        from app.models.spaced_repetition import ReviewEvent
+
+        user_id = test_user_competencies[0].user_id
+        card = self._card(db, user_id, test_questions[0].question_id)
+
+        process_card_review(db, card, 5)
+        process_card_review(db, card, 1)
+
+        events = db.query(ReviewEvent).filter(
+            ReviewEvent.card_id == card.card_id
+        ).order_by(ReviewEvent.reviewed_at).all()
+
+        assert [e.quality_rating for e in events] == [5, 1]
+        assert [e.is_successful for e in events] == [True, False]
+
+
+@pytest.mark.unit
+class TestReviewStatsInvalidation:
+    """Test cached statistics are dropped only when card writes commit."""
+
+    def test_invalidated_after_commit_not_flush(self, db, test_user_competencies, test_questions):
+        """Test a flushed review keeps the entry until its transaction commits."""
+        from app.services.spaced_repetition import create_or_update_sr_card, review_stats_cache
+
+        user_id = test_user_competencies[0].user_id
+        question_id = test_questions[0].question_id
+        create_or_update_sr_card(db, user_id, question_id, is_correct=True)
+        review_stats_cache.set(user_id, {"total_cards": 1})
+
+        create_or_update_sr_card(db, user_id, question_id, is_correct=False, commit=False)
+        assert review_stats_cache.get(user_id) == {"total_cards": 1}
+
+        db.commit()
+        assert review_stats_cache.get(user_id) is None
+
+    def test_rollback_keeps_cached_statistics(self, db, test_user_competencies, test_questions):
+        """Test a rolled-back review does not invalidate the entry."""
+        from app.services.spaced_repetition import create_or_update_sr_card, review_stats_cache
+
+        user_id = test_user_competencies[0].user_id
+        question_id = test_questions[0].question_id
+        create_or_update_sr_card(db, user_id, question_id, is_correct=True)
+        review_stats_cache.set(user_id, {"total_cards": 1})
+
+        create_or_update_sr_card(db, user_id, question_id, is_correct=False, commit=False)
+        db.rollback()
+        db.commit()
+
+        assert review_stats_cache.get(user_id) == {"total_cards": 1}
+        review_stats_cache.invalidate(user_id)